@@ -1,9 +1,10 @@
+import os
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config import Config
-from app.utils.db_utils import create_database_if_not_exists 
 
 db = SQLAlchemy()
 jwt = JWTManager()
@@ -23,13 +24,37 @@ def create_app():
 
     db.init_app(app)
     jwt.init_app(app)
+    # Migraciones de esquema (Alembic): flask db upgrade / flask db migrate, ver migrations/.
+    # Solo hacen falta en la CLI; importar alembic en cada worker alarga el arranque.
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db, directory=os.path.join(os.path.dirname(app.root_path), "migrations"))
+
+    # Usuario del JWT cargado bajo demanda y una sola vez por petición (ver app/utils/principal.py)
+    from app.utils.principal import register_principal_cache
+    register_principal_cache(app)
+
+    # Perfilado por petición (opcional, Config.PROFILING_ENABLED)
+    from app.utils.profiling import register_profiling
+    register_profiling(app, db)
+
+    # Métricas Prometheus en /admin/metrics (Config.METRICS_ENABLED)
+    from app.utils.metrics import register_metrics
+    register_metrics(app, db)
+
+    # Detector de N+1 y presupuestos de consultas (Config.QUERY_GUARD_MODE, solo desarrollo)
+    from app.utils.query_guard import register_query_guard
+    register_query_guard(app, db)
 
     # Importar TODOS los modelos para que SQLAlchemy los reconozca
     from app.models import (
         user, personal_data, role, skill, effect, gear,
         challenge_level, habit, inventory_item, journal, journal_entry,
         log_entry, material, notification, project, task, template, zone,
-        admin_log, incident, user_global_achievement, global_achievement
+        admin_log, incident, user_global_achievement, global_achievement,
+        user_energy_ledger, zone_energy_ledger, log_entry_rollup, user_progress_history,
+        user_achievement_counter, achievement_backfill_job, search_document,
+        user_resource_version, search_trigram, agenda_feed_token
     )
 
     # Registrar Blueprints de controladores
@@ -82,7 +107,10 @@ def create_app():
     app.register_blueprint(zone_bp, url_prefix="/zones")
     app.register_blueprint(admin_bp, url_prefix="/admin")
 
-    with app.app_context():
-        create_database_if_not_exists(app) 
-        db.create_all()
+    # Comandos CLI de mantenimiento (flask rebuild-energy-ledger, ...)
+    from app.commands import register_commands
+    register_commands(app)
+
+    # Sin DDL ni conexiones aquí: el esquema se prepara aparte con
+    # `flask init-db` (o `flask db upgrade`)
     return app
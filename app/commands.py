@@ -0,0 +1,222 @@
+# app/commands.py
+import click
+from flask.cli import with_appcontext
+
+def register_commands(app):
+    """
+    Registra los comandos de mantenimiento (`flask <comando>`).
+    """
+    app.cli.add_command(init_db)
+    app.cli.add_command(rebuild_energy_ledger)
+    app.cli.add_command(backfill_log_rollups)
+    app.cli.add_command(downsample_progress_history)
+    app.cli.add_command(recompute_achievement_counters)
+    app.cli.add_command(backfill_achievement)
+    app.cli.add_command(rebuild_search_index)
+
+@click.command("init-db")
+@click.option("--create-all", is_flag=True,
+              help="Crear las tablas con db.create_all() en vez de migraciones (solo desarrollo).")
+@with_appcontext
+def init_db(create_all):
+    """
+    Prepara la base de datos: la crea en el servidor MySQL si no existe y
+    aplica las migraciones pendientes (`flask db upgrade`).
+
+    Una base de datos creada con db.create_all() (sin alembic_version) se
+    marca antes de subir, solo si su esquema se reconoce:
+      - tiene todas las tablas, columnas e índices de la última revisión
+        (create_all con los modelos actuales) => se marca como head
+      - tiene todo lo de 0001 (esquema inicial) y nada de lo que crean las
+        revisiones posteriores => se marca como 0001 y se aplican las demás
+    Cualquier otro caso (p.ej. create_all de una versión intermedia) se
+    rechaza con lo que falta o sobra, sin tocar la base de datos.
+    """
+    from flask import current_app
+    from flask_migrate import stamp, upgrade
+    from sqlalchemy import inspect
+    from app import db
+    from app.utils.db_utils import create_database_if_not_exists
+
+    create_database_if_not_exists(current_app)
+    if create_all:
+        db.create_all()
+        click.echo("Tablas creadas con db.create_all().")
+        return
+
+    inspector = inspect(db.engine)
+    if inspector.has_table("user") and not inspector.has_table("alembic_version"):
+        actual = _schema(inspector)
+        head = _schema_at_revision("heads")
+        baseline = _schema_at_revision("0001")
+        if not _missing(head, actual):
+            click.echo("Esquema existente igual al de los modelos actuales: se marca como head.")
+            stamp(revision="head")
+        else:
+            missing = _missing(baseline, actual)
+            later = sorted(set(head["tables"]) - set(baseline["tables"]) & set(actual["tables"]))
+            if missing or later:
+                raise click.ClickException(
+                    "El esquema existente no coincide con 0001 ni con la última revisión; "
+                    "no se marca ni se migra.\n"
+                    + (f"  Falta de 0001: {', '.join(missing)}\n" if missing else "")
+                    + (f"  Tablas de revisiones posteriores ya presentes: {', '.join(later)}\n" if later else "")
+                    + "Ajustar el esquema a mano y marcar la revisión que corresponda (flask db stamp)."
+                )
+            click.echo("Esquema existente sin migraciones: se marca como 0001.")
+            stamp(revision="0001")
+    upgrade()
+    click.echo("Base de datos al día.")
+
+def _schema(inspector):
+    """
+    Tablas con sus columnas e índices (sin la tabla FTS5 de búsqueda ni alembic_version).
+    """
+    tables = {}
+    for table in inspector.get_table_names():
+        if table.startswith("search_document_fts") or table == "alembic_version":
+            continue
+        tables[table] = {
+            "columns": {c["name"] for c in inspector.get_columns(table)},
+            "indexes": {i["name"] for i in inspector.get_indexes(table)},
+        }
+    return {"tables": tables}
+
+def _schema_at_revision(revision):
+    """
+    Esquema que dejan las migraciones hasta 'revision', aplicadas sobre una
+    base de datos SQLite en memoria (no toca la base de datos real).
+    """
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from alembic.script import ScriptDirectory
+    from flask import current_app
+    from sqlalchemy import create_engine, inspect
+
+    config = current_app.extensions["migrate"].migrate.get_config()
+    script = ScriptDirectory.from_config(config)
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            for rev in reversed(list(script.iterate_revisions(revision, "base"))):
+                rev.module.upgrade()
+        return _schema(inspect(conn))
+
+def _missing(expected, actual):
+    """
+    Tablas, columnas e índices de 'expected' que no están en 'actual'.
+    """
+    missing = []
+    for table, spec in sorted(expected["tables"].items()):
+        found = actual["tables"].get(table)
+        if found is None:
+            missing.append(table)
+            continue
+        missing += [f"{table}.{column}" for column in sorted(spec["columns"] - found["columns"])]
+        missing += [f"{table}:{index}" for index in sorted(spec["indexes"] - found["indexes"])]
+    return missing
+
+@click.command("rebuild-energy-ledger")
+@click.option("--user-id", type=int, default=None, help="Reconstruir solo el libro de este usuario.")
+@with_appcontext
+def rebuild_energy_ledger(user_id):
+    """
+    Reconstruye user_energy_ledger / zone_energy_ledger desde log_entry.
+    """
+    from app.services.energy_ledger_service import EnergyLedgerService
+    result = EnergyLedgerService().rebuild(user_id=user_id)
+    click.echo(f"Libro de energía reconstruido: {result['user_rows']} filas de usuario, "
+               f"{result['zone_rows']} filas de zona.")
+
+@click.command("backfill-log-rollups")
+@click.option("--from", "start_date", default=None, help="Primer día (YYYY-MM-DD); por defecto el log más antiguo.")
+@click.option("--to", "end_date", default=None, help="Último día (YYYY-MM-DD); por defecto el log más reciente.")
+@click.option("--chunk-days", type=int, default=30, show_default=True, help="Días por transacción.")
+@click.option("--user-id", type=int, default=None, help="Recalcular solo este usuario.")
+@with_appcontext
+def backfill_log_rollups(start_date, end_date, chunk_days, user_id):
+    """
+    Recalcula log_entry_rollup desde log_entry por tramos. Si se interrumpe,
+    se puede reanudar con --from igual al último tramo mostrado.
+    """
+    from app.services.log_rollup_service import LogRollupService
+
+    def progress(chunk_start, chunk_end, rows):
+        click.echo(f"  {chunk_start} .. {chunk_end}: {rows} filas")
+
+    total = LogRollupService().backfill(
+        start_date=start_date,
+        end_date=end_date,
+        chunk_days=chunk_days,
+        user_id=user_id,
+        progress=progress
+    )
+    click.echo(f"Rollup de log_entry recalculado: {total} filas.")
+
+@click.command("downsample-progress-history")
+@click.option("--user-id", type=int, default=None, help="Compactar solo este usuario.")
+@with_appcontext
+def downsample_progress_history(user_id):
+    """
+    Compacta user_progress_history (diario > 30 días, semanal > 1 año).
+    El login ya lo hace una vez al día por usuario; esto sirve para lanzarlo en lote.
+    """
+    from app.services.progress_history_service import ProgressHistoryService
+    removed = ProgressHistoryService().downsample(user_id=user_id)
+    click.echo(f"Historial de progresión compactado: {removed} filas eliminadas.")
+
+@click.command("recompute-achievement-counters")
+@click.option("--user-id", type=int, default=None, help="Recalcular solo este usuario.")
+@with_appcontext
+def recompute_achievement_counters(user_id):
+    """
+    Reconstruye user_achievement_counter desde task / journal_entry / habit.
+    """
+    from app.services.achievement_counter_service import AchievementCounterService
+    written = AchievementCounterService().recompute(user_id=user_id)
+    click.echo(f"Contadores de logros recalculados: {written} filas.")
+
+@click.command("backfill-achievement")
+@click.argument("ach_id", type=int, required=False)
+@click.option("--job-id", type=int, default=None, help="Reanudar un trabajo existente en lugar de crear uno nuevo.")
+@click.option("--chunk-size", type=int, default=1000, show_default=True, help="Usuarios por transacción.")
+@with_appcontext
+def backfill_achievement(ach_id, job_id, chunk_size):
+    """
+    Otorga un logro global a los usuarios que ya cumplen su condición.
+    Si se interrumpe, se reanuda con --job-id desde el último usuario procesado.
+    """
+    from app.services.achievement_backfill_service import AchievementBackfillService
+    service = AchievementBackfillService()
+
+    if job_id is None:
+        if ach_id is None:
+            raise click.UsageError("Indica el id del logro o --job-id.")
+        job_id = service.create_job(ach_id, chunk_size=chunk_size).id
+        click.echo(f"Trabajo de backfill {job_id} creado.")
+
+    def progress(job):
+        click.echo(f"  hasta user.id={job.last_user_id}: {job.processed_users} usuarios, "
+                   f"{job.granted_count} otorgados")
+
+    job = service.run_job(job_id, progress=progress)
+    click.echo(f"Backfill terminado: {job.granted_count} logros otorgados a "
+               f"{job.processed_users} usuarios revisados.")
+
+@click.command("rebuild-search-index")
+@click.option("--user-id", type=int, default=None, help="Reindexar solo este usuario.")
+@click.option("--chunk-size", type=int, default=500, show_default=True, help="Filas por transacción.")
+@with_appcontext
+def rebuild_search_index(user_id, chunk_size):
+    """
+    Regenera search_document (índice de /search) desde tareas, hábitos,
+    proyectos y materiales. Necesario tras desplegar el índice o si se
+    cambia el normalizado de texto.
+    """
+    from app.services.search_index_service import SearchIndexService
+
+    def progress(entity_type, last_id, rows):
+        click.echo(f"  {entity_type} hasta id {last_id}: {rows} documentos")
+
+    total = SearchIndexService().rebuild(user_id=user_id, chunk_size=chunk_size, progress=progress)
+    click.echo(f"Índice de búsqueda reconstruido: {total} documentos.")
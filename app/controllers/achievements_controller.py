@@ -1,16 +1,21 @@
 # app/controllers/achievements_controller.py
 
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.global_achievement_service import GlobalAchievementService
 from app.services.user_global_achievement_service import UserGlobalAchievementService
+from app.services.achievement_backfill_service import AchievementBackfillService
 from app.schemas.global_achievement_schema import GlobalAchievementSchema
 from app.schemas.user_global_achievement_schema import UserGlobalAchievementSchema
+from app.schemas.achievement_backfill_job_schema import AchievementBackfillJobSchema
+from app.utils.query_guard import query_budget
 
 achievements_bp = Blueprint('achievements_bp', __name__)
 
 global_ach_service = GlobalAchievementService()
 user_ach_service = UserGlobalAchievementService()
+backfill_service = AchievementBackfillService()
 
 # ----------------------------------------------------------------------
 #                   GLOBAL ACHIEVEMENT CRUD
@@ -18,6 +23,7 @@ user_ach_service = UserGlobalAchievementService()
 
 @achievements_bp.route('/global', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def list_global_achievements():
     """
     GET /achievements/global
@@ -82,18 +88,49 @@ def delete_global_achievement(ach_id):
     except Exception as e:
         return {"error": str(e)}, 400
 
+@achievements_bp.route('/global/<int:ach_id>/backfill', methods=['POST'])
+@jwt_required()
+def backfill_global_achievement(ach_id):
+    """
+    POST /achievements/global/<ach_id>/backfill
+    Lanza en segundo plano el otorgamiento retroactivo del logro a los usuarios
+    que ya cumplen la condición. Body JSON opcional: { chunk_size }
+    Retorna 202 con el trabajo; el avance se consulta en /achievements/backfill/<job_id>.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        job = backfill_service.create_job(ach_id, chunk_size=int(data.get("chunk_size", 1000)))
+        backfill_service.start_job_async(current_app._get_current_object(), job.id)
+        return AchievementBackfillJobSchema().dump(job), 202
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+@achievements_bp.route('/backfill/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_backfill_job(job_id):
+    """
+    GET /achievements/backfill/<job_id>
+    Estado y avance de un trabajo de otorgamiento retroactivo.
+    """
+    try:
+        job = backfill_service.get_job(job_id)
+        return AchievementBackfillJobSchema().dump(job), 200
+    except Exception as e:
+        return {"error": str(e)}, 404
+
 # ----------------------------------------------------------------------
 #                  USER ACHIEVEMENTS
 # ----------------------------------------------------------------------
 
 @achievements_bp.route('/user', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def list_user_achievements():
     """
     GET /achievements/user
     Retorna la lista de logros que ha desbloqueado el usuario.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     user_achs = user_ach_service.get_user_achievements(user_id)
     schema = UserGlobalAchievementSchema(many=True)
     return jsonify(schema.dump(user_achs)), 200
@@ -105,7 +142,7 @@ def get_user_achievement(global_ach_id):
     GET /achievements/user/<global_ach_id>
     Verifica si el usuario tiene este logro (y retorna su detalle si es el caso).
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     record = user_ach_service.get_user_achievement(user_id, global_ach_id)
     if not record:
         return jsonify({"has_achievement": False}), 200
@@ -115,3 +152,16 @@ def get_user_achievement(global_ach_id):
     data = schema.dump(record)
     data["has_achievement"] = True
     return jsonify(data), 200
+
+@achievements_bp.route('/progress', methods=['GET'])
+@jwt_required()
+@query_budget(4)
+def get_user_progress():
+    """
+    GET /achievements/progress
+    Progreso del usuario en los logros de conteo (tareas completadas,
+    entradas de diario, checks de hábitos...), desbloqueados o no.
+    """
+    user_id = current_user_id()
+    progress = global_ach_service.get_user_progress(user_id)
+    return jsonify(progress), 200
@@ -1,9 +1,11 @@
-from flask import Blueprint, request, jsonify, make_response
+from flask import Blueprint, request, jsonify, make_response, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.admin_service import AdminService
 from app.schemas.user_schema import UserSchema
 from app.schemas.admin_log_schema import AdminLogSchema
 from app.schemas.incident_schema import IncidentSchema
+from app.utils.metrics import registry as metrics_registry, CONTENT_TYPE
+from app.utils.pagination import pagination_args
 
 admin_bp = Blueprint('admin_bp', __name__)
 admin_service = AdminService()
@@ -21,13 +23,16 @@ incidents_schema = IncidentSchema(many=True)
 @jwt_required()
 def list_all_users():
     """
-    GET /admin/users
-    Lista todos los usuarios no borrados.
+    GET /admin/users?cursor=&limit=&include_total=true
+    Lista todos los usuarios no borrados (paginación por cursor).
     """
     # Aquí podrías verificar si el usuario actual es ADMIN
     # ...
-    users = admin_service.list_all_users()
-    return jsonify(users_schema.dump(users)), 200
+    try:
+        page = admin_service.list_all_users(**pagination_args(request.args))
+    except Exception as e:
+        return {"error": str(e)}, 400
+    return jsonify(page.to_dict(users_schema.dump(page.items))), 200
 
 @admin_bp.route('/users/<int:user_id>/role', methods=['PUT'])
 @jwt_required()
@@ -52,12 +57,16 @@ def update_user_role(user_id):
 @jwt_required()
 def list_admin_logs():
     """
-    GET /admin/logs?level=INFO|WARN|ERROR
-    Lista los logs administrativos, opcional filtra por nivel.
+    GET /admin/logs?level=INFO|WARN|ERROR&cursor=&limit=&include_total=true
+    Lista los logs administrativos (los más recientes primero, paginación
+    por cursor), opcional filtra por nivel.
     """
     level = request.args.get('level')
-    logs = admin_service.list_admin_logs(level_filter=level)
-    return jsonify(logs_schema.dump(logs)), 200
+    try:
+        page = admin_service.list_admin_logs(level_filter=level, **pagination_args(request.args))
+    except Exception as e:
+        return {"error": str(e)}, 400
+    return jsonify(page.to_dict(logs_schema.dump(page.items))), 200
 
 @admin_bp.route('/logs/<int:log_id>', methods=['DELETE'])
 @jwt_required()
@@ -154,3 +163,19 @@ def generate_report_pdf():
     # response.headers["Content-Type"] = "application/pdf"
     # return response
     return {"pdf_content_mock": pdf_content}
+
+@admin_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+def metrics():
+    """
+    GET /admin/metrics
+    Métricas operativas en formato de texto de Prometheus: peticiones y
+    latencia por blueprint/ruta, errores, pool de conexiones y contadores de
+    dominio (ver app/utils/metrics.py). Con METRICS_MULTIPROC_DIR suma las de
+    todos los workers.
+    """
+    if not current_app.config.get("METRICS_ENABLED", True):
+        return {"error": "Las métricas están desactivadas (METRICS_ENABLED)"}, 404
+    response = make_response(metrics_registry.exposition())
+    response.headers["Content-Type"] = CONTENT_TYPE
+    return response
@@ -1,12 +1,19 @@
-from flask import Blueprint, request, jsonify, make_response
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import date
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
+from app.utils.http_cache import not_modified, set_cache_headers
 from app.services.agenda_service import AgendaService
+from app.services.resource_version_service import ResourceVersionService, AGENDA
+from app.utils.query_guard import query_budget
 
 agenda_bp = Blueprint('agenda_bp', __name__)
 agenda_service = AgendaService()
+resource_versions = ResourceVersionService()
 
 @agenda_bp.route('/view', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_agenda_view():
     """
     GET /agenda/view
@@ -24,8 +31,17 @@ def get_agenda_view():
       /agenda/view?period=weekly&date=2023-07-10&zone_id=3&types=task,habit
 
     Si "export=ics", la respuesta se devuelve como un archivo ICS generable en un calendar.
+
+    Con ETag según la versión de la agenda del usuario y el día actual (el
+    periodo por defecto es relativo a hoy); 304 si no ha cambiado.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
+    versions = resource_versions.versions(user_id, (AGENDA,))
+    etag = resource_versions.etag(user_id, (AGENDA,), f"{date.today()}?{request.query_string.decode()}", versions)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     period = request.args.get('period', 'daily')
     ref_date_str = request.args.get('date')  # YYYY-MM-DD
     zone_id = request.args.get('zone_id')
@@ -38,19 +54,63 @@ def get_agenda_view():
             period=period,
             ref_date_str=ref_date_str,
             zone_id=zone_id,
-            included_types=types.split(',')
+            included_types=types.split(','),
+            version=versions[AGENDA]
         )
 
         if export_format == 'ics':
-            # Generar contenido ICS:
-            ics_str = agenda_service.export_agenda_to_ics(agenda_data)
-            response = make_response(ics_str)
+            # Generar contenido ICS en streaming:
+            response = Response(agenda_service.stream_agenda_ics(agenda_data),
+                                content_type='text/calendar; charset=utf-8')
             response.headers['Content-Disposition'] = 'attachment; filename=agenda.ics'
-            response.headers['Content-Type'] = 'text/calendar; charset=utf-8'
-            return response
+            return set_cache_headers(response, etag)
 
         # Devolver JSON por defecto
-        return jsonify(agenda_data), 200
+        return set_cache_headers(jsonify(agenda_data), etag)
+
+    except Exception as e:
+        return {"error": str(e)}, 400
 
+@agenda_bp.route('/feed-token', methods=['GET', 'POST'])
+@jwt_required()
+def feed_token():
+    """
+    GET  /agenda/feed-token => URL de suscripción de calendario del usuario (la crea si no existe)
+    POST /agenda/feed-token => genera un token nuevo (la URL anterior deja de funcionar)
+
+    Respuesta: {"token": "...", "url": "https://.../agenda/feed.ics?token=..."}
+    """
+    user_id = current_user_id()
+    try:
+        token = agenda_service.get_feed_token(user_id, rotate=request.method == 'POST')
+        url = url_for('agenda_bp.agenda_feed', token=token, _external=True)
+        return jsonify({"token": token, "url": url}), 200
     except Exception as e:
         return {"error": str(e)}, 400
+
+@agenda_bp.route('/feed.ics', methods=['GET'])
+def agenda_feed():
+    """
+    GET /agenda/feed.ics?token=...
+    Feed iCalendar para suscribirse desde Google Calendar, Outlook, etc. (sin
+    JWT: autentica el token de /agenda/feed-token). Los hábitos y tareas
+    cíclicas van con RRULE.
+
+    Responde con ETag y Last-Modified según la versión de la agenda del
+    usuario; si el cliente ya la tiene (If-None-Match / If-Modified-Since)
+    devuelve 304 sin consultar la agenda.
+    """
+    try:
+        user_id = agenda_service.user_for_feed_token(request.args.get('token'))
+    except Exception as e:
+        return {"error": str(e)}, 404
+
+    etag, last_modified = agenda_service.feed_version(user_id)
+    cached = not_modified(etag, last_modified)
+    if cached is not None:
+        return cached
+
+    response = Response(stream_with_context(agenda_service.stream_feed_ics(user_id, dtstamp=last_modified)),
+                        content_type='text/calendar; charset=utf-8')
+    response.headers['Content-Disposition'] = 'inline; filename=agenda.ics'
+    return set_cache_headers(response, etag, last_modified)
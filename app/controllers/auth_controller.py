@@ -82,6 +82,8 @@ def _update_login_streak(user):
     """
     from datetime import date, timedelta
     from app.services.skill_service import SkillService
+    from app.services.progress_history_service import ProgressHistoryService
+    from app.services.resource_version_service import ResourceVersionService, STATS
 
     today = date.today()
 
@@ -90,6 +92,8 @@ def _update_login_streak(user):
         # Llama a skill_service para resetear el mana
         SkillService().reset_daily_mana(user.id)  
         user.last_mana_reset_date = today
+        # Una vez al día compactamos el historial de progresión del usuario
+        ProgressHistoryService().downsample(user.id)
         
     if user.last_login_date:
         if user.last_login_date == today:
@@ -100,7 +104,9 @@ def _update_login_streak(user):
             user.login_streak = 1
     else:
         user.login_streak = 1
-    
+
+    if user.last_login_date != today:
+        ResourceVersionService().bump(user.id, STATS)
     user.last_login_date = today
     db.session.commit()
 
@@ -1,16 +1,23 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.habit_service import HabitService
 from app.schemas.habit_schema import HabitSchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
+from app.utils.http_cache import not_modified, set_cache_headers
+from app.services.resource_version_service import ResourceVersionService, HABITS
 
 habit_bp = Blueprint('habit_bp', __name__)
 habit_service = HabitService()
+resource_versions = ResourceVersionService()
 
 habit_schema = HabitSchema()
 habits_schema = HabitSchema(many=True)
 
 @habit_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_all_habits():
     """
     GET /habits
@@ -19,11 +26,18 @@ def get_all_habits():
       - frequency=DAILY|WEEKLY|NONE
       - min_energy, max_energy (rango)
       - energy_type=positive|negative (NUEVO)
-      - page, limit (paginación)
+      - cursor, limit, include_total=true (paginación por cursor, ver app/utils/pagination.py)
+
+    Con ETag según la versión de los hábitos del usuario (304 si no han cambiado).
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query_params = request.args
 
+    etag = resource_versions.etag(user_id, (HABITS,), request.query_string.decode())
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     active = query_params.get('active')
     frequency = query_params.get('frequency')
     min_energy = query_params.get('min_energy')
@@ -31,37 +45,29 @@ def get_all_habits():
     start_date = query_params.get('start_date')
     end_date = query_params.get('end_date')
     energy_type = query_params.get('energy_type')
-    page = query_params.get('page')
-    limit = query_params.get('limit')
-
-    habits, total = habit_service.get_habits_with_filters(
-        user_id=user_id,
-        active=active,
-        frequency=frequency,
-        min_energy=min_energy,
-        max_energy=max_energy,
-        start_date=start_date,
-        end_date=end_date,
-        energy_type=energy_type,
-        page=page,
-        limit=limit
-    )
-
-    response = {
-        "items": habits_schema.dump(habits),
-        "total": total
-    }
 
-    if page and limit:
-        response["page"] = int(page)
-        response["limit"] = int(limit)
+    try:
+        page = habit_service.get_habits_with_filters(
+            user_id=user_id,
+            active=active,
+            frequency=frequency,
+            min_energy=min_energy,
+            max_energy=max_energy,
+            start_date=start_date,
+            end_date=end_date,
+            energy_type=energy_type,
+            **pagination_args(query_params)
+        )
+    except Exception as e:
+        return {"error": str(e)}, 400
 
-    return jsonify(response), 200
+    return set_cache_headers(jsonify(page.to_dict(habits_schema.dump(page.items))), etag)
 
 @habit_bp.route('/<int:habit_id>', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_habit_by_id(habit_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         h = habit_service.get_habit_by_id(habit_id, user_id)
         return habit_schema.dump(h), 200
@@ -71,7 +77,7 @@ def get_habit_by_id(habit_id):
 @habit_bp.route('', methods=['POST'])
 @jwt_required()
 def create_habit():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_h = habit_service.create_habit(data, user_id)
@@ -82,7 +88,7 @@ def create_habit():
 @habit_bp.route('/<int:habit_id>', methods=['PUT'])
 @jwt_required()
 def update_habit(habit_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = habit_service.update_habit(habit_id, data, user_id)
@@ -93,7 +99,7 @@ def update_habit(habit_id):
 @habit_bp.route('/<int:habit_id>', methods=['DELETE'])
 @jwt_required()
 def delete_habit(habit_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         habit_service.delete_habit(habit_id, user_id)
         return {}, 204
@@ -106,7 +112,7 @@ def complete_habit(habit_id):
     """
     Marca un hábito como completado, actualizando la racha (streak) y total_check.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         completed = habit_service.complete_habit(habit_id, user_id)
         return {"message": f"Hábito '{completed.name}' completado.", 
@@ -120,7 +126,7 @@ def get_habit_streak(habit_id):
     """
     Devuelve la racha actual (streak) y el total_check de un hábito.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         streak_info = habit_service.get_habit_streak(habit_id, user_id)
         return jsonify(streak_info), 200
@@ -135,7 +141,7 @@ def get_habit_stats(habit_id):
     Query Params (opcionales):
       from_date y to_date: rangos para contar cuántas veces se marcó en ese período.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     from_date = request.args.get('from_date')
     to_date = request.args.get('to_date')
     try:
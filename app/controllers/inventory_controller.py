@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.inventory_service import InventoryService
 from app.schemas.inventory_item_schema import InventoryItemSchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
 
 inventory_bp = Blueprint('inventory_bp', __name__)
 inventory_service = InventoryService()
@@ -11,6 +14,7 @@ items_schema = InventoryItemSchema(many=True)
 
 @inventory_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_user_inventory():
     """
     GET /inventory
@@ -18,9 +22,10 @@ def get_user_inventory():
       - gear_type (mental, physical, etc.)
       - min_uses, max_uses
       - acquired_from, acquired_to (rango de fechas de adquisición)
+      - cursor, limit, include_total=true (paginación por cursor, ver app/utils/pagination.py)
     Ejemplo: /inventory?gear_type=mental&min_uses=1&acquired_from=2023-06-01
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query_params = request.args
 
     gear_type = query_params.get('gear_type')
@@ -29,15 +34,19 @@ def get_user_inventory():
     acquired_from = query_params.get('acquired_from')
     acquired_to = query_params.get('acquired_to')
 
-    items = inventory_service.get_user_inventory_filtered(
-        user_id, gear_type, min_uses, max_uses, acquired_from, acquired_to
-    )
-    return jsonify(items_schema.dump(items)), 200
+    try:
+        page = inventory_service.get_user_inventory_filtered(
+            user_id, gear_type, min_uses, max_uses, acquired_from, acquired_to,
+            **pagination_args(query_params)
+        )
+    except Exception as e:
+        return {"error": str(e)}, 400
+    return jsonify(page.to_dict(items_schema.dump(page.items))), 200
 
 @inventory_bp.route('/<int:item_id>', methods=['GET'])
 @jwt_required()
 def get_item_by_id(item_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         item = inventory_service.get_item_by_id(item_id, user_id)
         return item_schema.dump(item), 200
@@ -55,7 +64,7 @@ def add_gear_to_user():
         "remaining_uses": ...
       }
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_item = inventory_service.add_gear_to_user(data, user_id)
@@ -70,7 +79,7 @@ def update_inventory_item(item_id):
     Permite actualizar remaining_uses y/o alguna otra información 
     de un item en el inventario.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = inventory_service.update_inventory_item(item_id, data, user_id)
@@ -84,7 +93,7 @@ def delete_inventory_item(item_id):
     """
     Borrado lógico de un item de inventario.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         inventory_service.delete_inventory_item(item_id, user_id)
         return {}, 204
@@ -97,7 +106,7 @@ def use_inventory_item(item_id):
     """
     Llama a inventory_service.use_item() para 'gastar' un uso del item.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         result = inventory_service.use_item(item_id, user_id)
         return jsonify(result), 200
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.journal_service import JournalService
 from app.schemas.journal_schema import JournalSchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
 
 journal_bp = Blueprint('journal_bp', __name__)
 journal_service = JournalService()
@@ -11,25 +14,31 @@ journals_schema = JournalSchema(many=True)
 
 @journal_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_all_journals():
     """
     Lista los diarios del usuario con posibilidad de filtrar por rango de fechas (fecha de creación)
     o tipo. Query params:
       from_date, to_date, type
+      cursor, limit, include_total=true (paginación por cursor, ver app/utils/pagination.py)
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     from_date = request.args.get('from_date')
     to_date = request.args.get('to_date')
     j_type = request.args.get('type')  # e.g. 'personal', 'work', etc.
-    items = journal_service.get_all_journals_filtered(user_id, from_date, to_date, j_type)
+    try:
+        page = journal_service.get_all_journals_filtered(user_id, from_date, to_date, j_type,
+                                                         **pagination_args(request.args))
+    except Exception as e:
+        return {"error": str(e)}, 400
 
     # Añadimos en la respuesta la lista de entries_ids si deseas
     result = []
-    for j in items:
+    for j in page.items:
         data = journal_schema.dump(j)
         data['entries_ids'] = [e.id for e in j.entries if not e.deleted]
         result.append(data)
-    return jsonify(result), 200
+    return jsonify(page.to_dict(result)), 200
 
 @journal_bp.route('/today', methods=['GET'])
 @jwt_required()
@@ -37,7 +46,7 @@ def get_journal_today():
     """
     Devuelve (o crea) el diario de hoy, si tu lógica lo contempla.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         j = journal_service.get_or_create_journal_today(user_id)
         data = journal_schema.dump(j)
@@ -49,7 +58,7 @@ def get_journal_today():
 @journal_bp.route('/<int:journal_id>', methods=['GET'])
 @jwt_required()
 def get_journal_by_id(journal_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         j = journal_service.get_journal_by_id(journal_id, user_id)
         data = journal_schema.dump(j)
@@ -61,7 +70,7 @@ def get_journal_by_id(journal_id):
 @journal_bp.route('', methods=['POST'])
 @jwt_required()
 def create_journal():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_j = journal_service.create_journal(data, user_id)
@@ -72,7 +81,7 @@ def create_journal():
 @journal_bp.route('/<int:journal_id>', methods=['PUT'])
 @jwt_required()
 def update_journal(journal_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = journal_service.update_journal(journal_id, data, user_id)
@@ -83,7 +92,7 @@ def update_journal(journal_id):
 @journal_bp.route('/<int:journal_id>', methods=['DELETE'])
 @jwt_required()
 def delete_journal(journal_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         journal_service.delete_journal(journal_id, user_id)
         return {}, 204
@@ -92,11 +101,12 @@ def delete_journal(journal_id):
 
 @journal_bp.route('/<int:journal_id>/stats', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_journal_stats(journal_id):
     """
     Ejemplo para obtener estadísticas como promedio de puntos diarios o evolución de la racha.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     from_date = request.args.get('from_date')
     to_date = request.args.get('to_date')
     try:
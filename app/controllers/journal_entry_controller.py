@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.journal_entry_service import JournalEntryService
 from app.schemas.journal_entry_schema import JournalEntrySchema
+from app.utils.query_guard import query_budget
 
 journal_entry_bp = Blueprint('journal_entry_bp', __name__)
 entry_service = JournalEntryService()
@@ -11,8 +13,9 @@ entries_schema = JournalEntrySchema(many=True)
 
 @journal_entry_bp.route('/<int:journal_id>/entries', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_entries_by_journal(journal_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         entries = entry_service.get_entries_by_journal(journal_id, user_id)
         return jsonify(entries_schema.dump(entries)), 200
@@ -22,7 +25,7 @@ def get_entries_by_journal(journal_id):
 @journal_entry_bp.route('/<int:journal_id>/entries', methods=['POST'])
 @jwt_required()
 def create_entry(journal_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_entry = entry_service.create_entry(journal_id, data, user_id)
@@ -33,7 +36,7 @@ def create_entry(journal_id):
 @journal_entry_bp.route('/<int:journal_id>/entries/<int:entry_id>', methods=['GET'])
 @jwt_required()
 def get_entry_by_id(journal_id, entry_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         entry = entry_service.get_entry_by_id(entry_id, user_id)
         return entry_schema.dump(entry), 200
@@ -43,7 +46,7 @@ def get_entry_by_id(journal_id, entry_id):
 @journal_entry_bp.route('/<int:journal_id>/entries/<int:entry_id>', methods=['PUT'])
 @jwt_required()
 def update_entry(journal_id, entry_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = entry_service.update_entry(entry_id, data, user_id)
@@ -54,7 +57,7 @@ def update_entry(journal_id, entry_id):
 @journal_entry_bp.route('/<int:journal_id>/entries/<int:entry_id>', methods=['DELETE'])
 @jwt_required()
 def delete_entry(journal_id, entry_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         entry_service.delete_entry(entry_id, user_id)
         return {}, 204
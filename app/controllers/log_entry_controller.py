@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.log_entry_service import LogEntryService
 from app.schemas.log_entry_schema import LogEntrySchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
 
 log_entry_bp = Blueprint('log_entry_bp', __name__)
 entry_service = LogEntryService()
@@ -11,6 +14,7 @@ entries_schema = LogEntrySchema(many=True)
 
 @log_entry_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_all_log_entries():
     """
     GET /log-entries
@@ -18,17 +22,22 @@ def get_all_log_entries():
       - type (TASK, HABIT, JOURNAL_ENTRY, etc.)
       - zone_id
       - from_date y to_date (rango de fechas en end_timestamp)
+      - cursor, limit, include_total=true (paginación por cursor, ver app/utils/pagination.py)
     Ejemplo: /log-entries?type=TASK&zone_id=2&from_date=2023-06-01&to_date=2023-06-30
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query_params = request.args
     log_type = query_params.get('type')
     zone_id = query_params.get('zone_id')
     from_date = query_params.get('from_date')
     to_date = query_params.get('to_date')
 
-    items = entry_service.get_log_entries_filtered(user_id, log_type, zone_id, from_date, to_date)
-    return jsonify(entries_schema.dump(items)), 200
+    try:
+        page = entry_service.get_log_entries_filtered(user_id, log_type, zone_id, from_date, to_date,
+                                                      **pagination_args(query_params))
+    except Exception as e:
+        return {"error": str(e)}, 400
+    return jsonify(page.to_dict(entries_schema.dump(page.items))), 200
 
 @log_entry_bp.route('', methods=['POST'])
 @jwt_required()
@@ -44,7 +53,7 @@ def create_log_entry():
         "zone_id": 2
       }
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_entry = entry_service.create_log_entry(data, user_id)
@@ -58,7 +67,7 @@ def delete_log_entry(log_id):
     """
     Borrado lógico de un log entry.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         entry_service.delete_log_entry(log_id, user_id)
         return {}, 204
@@ -67,18 +76,19 @@ def delete_log_entry(log_id):
 
 @log_entry_bp.route('/summary', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_log_summary():
     """
     GET /log-entries/summary
-    Permite obtener un resumen diario o semanal de energía total, etc.
+    Permite obtener un resumen diario, semanal o mensual de energía total, etc.
     Query params:
-      - range = 'daily' o 'weekly'
+      - range = 'daily', 'weekly' o 'monthly'
       - days_back = número de días hacia atrás (por defecto 7)
     Ejemplo:
       GET /log-entries/summary?range=daily&days_back=7
     """
-    user_id = get_jwt_identity()
-    range_type = request.args.get('range', 'daily')  # 'daily' o 'weekly'
+    user_id = current_user_id()
+    range_type = request.args.get('range', 'daily')  # 'daily', 'weekly' o 'monthly'
     days_back = request.args.get('days_back', '7')
 
     try:
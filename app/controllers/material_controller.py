@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.material_service import MaterialService
 from app.schemas.material_schema import MaterialSchema
 
@@ -17,11 +18,11 @@ def get_all_materials():
       - type (documento, link, video, etc.)
       - query (palabra clave en nombre o description)
       - project_id (listar materiales de un proyecto específico)
-      - user_id (implícito con get_jwt_identity)
+      - user_id (implícito, del JWT)
     Ejemplo:
       GET /materials?type=video&query=angular
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     mat_type = request.args.get('type')
     query = request.args.get('query')
     project_id = request.args.get('project_id')
@@ -31,7 +32,7 @@ def get_all_materials():
 @material_bp.route('/<int:material_id>', methods=['GET'])
 @jwt_required()
 def get_material_by_id(material_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         mat = material_service.get_material_by_id(material_id, user_id)
         return material_schema.dump(mat), 200
@@ -41,7 +42,7 @@ def get_material_by_id(material_id):
 @material_bp.route('', methods=['POST'])
 @jwt_required()
 def create_material():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_mat = material_service.create_material(data, user_id)
@@ -52,7 +53,7 @@ def create_material():
 @material_bp.route('/<int:material_id>', methods=['PUT'])
 @jwt_required()
 def update_material(material_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = material_service.update_material(material_id, data, user_id)
@@ -63,7 +64,7 @@ def update_material(material_id):
 @material_bp.route('/<int:material_id>', methods=['DELETE'])
 @jwt_required()
 def delete_material(material_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         material_service.delete_material(material_id, user_id)
         return {}, 204
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.notification_service import NotificationService
 from app.schemas.notification_schema import NotificationSchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
 
 notification_bp = Blueprint('notification_bp', __name__)
 notification_service = NotificationService()
@@ -11,16 +14,22 @@ notifications_schema = NotificationSchema(many=True)
 
 @notification_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_user_notifications():
     """
     GET /notifications
     Soporta filtros por tipo (reminder, achievement, alert, etc.) mediante query param ?type=XXX
     Ej: GET /notifications?type=reminder
+    Paginación por cursor: cursor, limit, include_total=true (ver app/utils/pagination.py)
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     notif_type = request.args.get('type')  # e.g. 'reminder'
-    items = notification_service.get_user_notifications_filtered(user_id, notif_type)
-    return jsonify(notifications_schema.dump(items)), 200
+    try:
+        page = notification_service.get_user_notifications_filtered(user_id, notif_type,
+                                                                    **pagination_args(request.args))
+    except Exception as e:
+        return {"error": str(e)}, 400
+    return jsonify(page.to_dict(notifications_schema.dump(page.items))), 200
 
 @notification_bp.route('', methods=['POST'])
 @jwt_required()
@@ -33,7 +42,7 @@ def create_notification():
         "type": "reminder" | "achievement" | "alert" | ...
       }
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_notif = notification_service.create_notification(data, user_id)
@@ -47,7 +56,7 @@ def mark_as_read(notification_id):
     """
     Marca como leída una notificación específica.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         notification_service.mark_as_read(notification_id, user_id)
         return {}, 204
@@ -61,7 +70,7 @@ def mark_all_as_read():
     Marca TODAS las notificaciones del usuario como leídas.
     PUT /notifications/read-all
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         count = notification_service.mark_all_as_read(user_id)
         return {"message": f"{count} notificaciones marcadas como leídas."}, 200
@@ -74,7 +83,7 @@ def delete_notification(notification_id):
     """
     Borrado lógico de una notificación específica.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         notification_service.delete_notification(notification_id, user_id)
         return {}, 204
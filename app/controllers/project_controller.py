@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.project_service import ProjectService
 from app.schemas.project_schema import ProjectSchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
 
 project_bp = Blueprint('project_bp', __name__)
 project_service = ProjectService()
@@ -11,6 +14,7 @@ projects_schema = ProjectSchema(many=True)
 
 @project_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_all_projects():
     """
     Soporta filtros:
@@ -18,10 +22,11 @@ def get_all_projects():
       - status (ACTIVE, COMPLETED, ARCHIVED, etc.)
       - priority (HIGH, MEDIUM, LOW)
       - start_date y end_date (rango, según start_date o end_date del proyecto)
+      - cursor, limit, include_total=true (paginación por cursor, ver app/utils/pagination.py)
     Ejemplo:
       GET /projects?zone_id=3&status=ACTIVE
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query_params = request.args
 
     zone_id = query_params.get('zone_id')
@@ -30,22 +35,26 @@ def get_all_projects():
     start_date = query_params.get('start_date')
     end_date = query_params.get('end_date')
 
-    items = project_service.get_projects_with_filters(
-        user_id=user_id,
-        zone_id=zone_id,
-        status=status,
-        priority=priority,
-        start_date=start_date,
-        end_date=end_date
-    )
+    try:
+        page = project_service.get_projects_with_filters(
+            user_id=user_id,
+            zone_id=zone_id,
+            status=status,
+            priority=priority,
+            start_date=start_date,
+            end_date=end_date,
+            **pagination_args(query_params)
+        )
+    except Exception as e:
+        return {"error": str(e)}, 400
 
-    # Retornamos la lista de proyectos
+    # Retornamos la página de proyectos
     results = []
-    for p in items:
+    for p in page.items:
         data = project_schema.dump(p)
         data['materials_ids'] = [m.id for m in p.materials if not m.deleted]
         results.append(data)
-    return jsonify(results), 200
+    return jsonify(page.to_dict(results)), 200
 
 @project_bp.route('/<int:project_id>', methods=['GET'])
 @jwt_required()
@@ -53,7 +62,7 @@ def get_project_by_id(project_id):
     """
     Devuelve el detalle ampliado del proyecto, incluyendo materiales, hábitos, etc.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         p = project_service.get_project_by_id(project_id, user_id)
         data = project_schema.dump(p)
@@ -68,7 +77,7 @@ def get_project_by_id(project_id):
 @project_bp.route('', methods=['POST'])
 @jwt_required()
 def create_project():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_proj = project_service.create_project(data, user_id)
@@ -79,7 +88,7 @@ def create_project():
 @project_bp.route('/<int:project_id>', methods=['PUT'])
 @jwt_required()
 def update_project(project_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = project_service.update_project(project_id, data, user_id)
@@ -93,7 +102,7 @@ def update_project(project_id):
 @project_bp.route('/<int:project_id>', methods=['DELETE'])
 @jwt_required()
 def delete_project(project_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         project_service.delete_project(project_id, user_id)
         return {}, 204
@@ -102,6 +111,7 @@ def delete_project(project_id):
 
 @project_bp.route('/<int:project_id>/progress', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_project_progress(project_id):
     """
     Endpoint que retorna un resumen del progreso global del proyecto:
@@ -110,7 +120,7 @@ def get_project_progress(project_id):
     - XP total (si aplica)
     etc.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         progress = project_service.get_project_progress(project_id, user_id)
         return jsonify(progress), 200
@@ -120,7 +130,7 @@ def get_project_progress(project_id):
 @project_bp.route('/<int:project_id>/complete', methods=['POST'])
 @jwt_required()
 def complete_project(project_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         p = project_service.complete_project(project_id, user_id)
         return {"message": f"Proyecto '{p.name}' completado."}, 200
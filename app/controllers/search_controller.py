@@ -1,12 +1,17 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.search_service import SearchService
+from app.services.suggest_service import SuggestService
+from app.utils.query_guard import query_budget
 
 search_bp = Blueprint('search_bp', __name__)
 search_service = SearchService()
+suggest_service = SuggestService()
 
 @search_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(8)
 def global_search():
     """
     GET /search
@@ -17,18 +22,55 @@ def global_search():
              por defecto, todos: 'task,habit,project,material'
       zone_id: filtra por zona si aplica (ej: tasks en un proyecto que pertenezca a esa zona,
                habits con zone_id = zone_id, etc.)
+      limit: resultados por página (por defecto 20, máx. 100)
+      cursor: 'next_cursor' de la respuesta anterior
+      per_type: máximo de resultados de cada tipo
+      fuzzy: 'true' => búsqueda aproximada en los nombres (tolera erratas y acentos)
+      include_totals: 'true' => añade "totals" (coincidencias de cada tipo)
+    Respuesta: {"results": [...por relevancia...], "next_cursor": ..., ["totals": {"task": N, ...}]}
     Ejemplo:
-      GET /search?q=estudio&types=task,habit&zone_id=3
+      GET /search?q=estudio&types=task,habit&zone_id=3&limit=10&per_type=5
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query = request.args.get('q', '')
     type_param = request.args.get('types', 'task,habit,project,material')
     zone_id = request.args.get('zone_id')
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    per_type = request.args.get('per_type', type=int)
+    fuzzy = request.args.get('fuzzy', 'false').lower() == 'true'
+    include_totals = request.args.get('include_totals', 'false').lower() == 'true'
 
     included_types = type_param.split(',')
 
     try:
-        results = search_service.global_search(user_id, query, included_types, zone_id)
+        results = search_service.global_search(user_id, query, included_types, zone_id,
+                                               limit=limit, cursor=cursor, per_type=per_type,
+                                               fuzzy=fuzzy, include_totals=include_totals)
         return jsonify(results), 200
     except Exception as e:
         return {"error": str(e)}, 400
+
+@search_bp.route('/suggest', methods=['GET'])
+@jwt_required()
+@query_budget(8)
+def suggest():
+    """
+    GET /search/suggest
+    Autocompletado por prefijo sobre los nombres de tareas, hábitos, proyectos,
+    materiales, zonas y plantillas del usuario (sin acentos ni mayúsculas).
+    Query Params:
+      q: lo que lleva escrito el usuario
+      limit: nº de sugerencias (por defecto 8, máx. 20)
+    Ejemplo:
+      GET /search/suggest?q=progr
+      => {"suggestions": [{"type": "project", "id": 4, "name": "Programación web"}, ...]}
+    """
+    user_id = current_user_id()
+    prefix = request.args.get('q', '')
+    limit = request.args.get('limit', 8, type=int)
+    try:
+        suggestions = suggest_service.suggest(user_id, prefix, limit=limit)
+        return jsonify({"suggestions": suggestions}), 200
+    except Exception as e:
+        return {"error": str(e)}, 400
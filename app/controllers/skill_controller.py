@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required,  get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.skill_service import SkillService
 from app.schemas.skill_schema import SkillSchema
 
@@ -71,7 +72,7 @@ def delete_skill(skill_id):
 @skill_bp.route('/use/<int:skill_id>', methods=['POST'])
 @jwt_required()
 def use_skill(skill_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         result = skill_service.use_skill(user_id, skill_id)
         return jsonify(result), 200
@@ -1,38 +1,55 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.stats_service import StatsService
+from app.utils.query_guard import query_budget
+from app.utils.http_cache import not_modified, set_cache_headers
+from app.services.resource_version_service import ResourceVersionService, STATS
 
 stats_bp = Blueprint('stats_bp', __name__)
 stats_service = StatsService()
+resource_versions = ResourceVersionService()
 
 @stats_bp.route('/user', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_user_stats():
     """
     GET /stats/user
     Devuelve estadísticas del usuario, incluida la barra de energía actualizada.
     Query param:
       refresh_energy = true|false (indica si recalcular o no)
+
+    Sin refresh_energy responde con ETag según la versión de las estadísticas
+    del usuario; si el cliente ya la tiene (If-None-Match) devuelve 304 sin
+    cargar el usuario.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     refresh_energy = request.args.get('refresh_energy', 'false').lower() == 'true'
     try:
         if refresh_energy:
+            # Escritura: la versión se lee después, ya con la energía recalculada
             stats_service.update_user_energy(user_id)
+        etag = resource_versions.etag(user_id, (STATS,))
+        if not refresh_energy:
+            cached = not_modified(etag)
+            if cached is not None:
+                return cached
         stats = stats_service.get_user_stats(user_id)
-        return jsonify(stats), 200
+        return set_cache_headers(jsonify(stats), etag)
     except Exception as e:
         return {"error": str(e)}, 400
 
 @stats_bp.route('/zone/<int:zone_id>', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_zone_stats(zone_id):
     """
     GET /stats/zone/<zone_id>
     Devuelve estadísticas de la zona, con opción de refresh de energía.
     ?refresh_energy=true
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     refresh_energy = request.args.get('refresh_energy', 'false').lower() == 'true'
     try:
         if refresh_energy:
@@ -44,6 +61,7 @@ def get_zone_stats(zone_id):
 
 @stats_bp.route('/history', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_stats_history():
     """
     GET /stats/history
@@ -53,7 +71,7 @@ def get_stats_history():
       type = 'energy'|'xp'|'level'
       days_back = 7 (default)
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     stats_type = request.args.get('type', 'energy')
     days_back = int(request.args.get('days_back', '7'))
 
@@ -1,18 +1,21 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.store_service import StoreService
+from app.utils.query_guard import query_budget
 
 store_bp = Blueprint('store_bp', __name__)
 store_service = StoreService()
 
 @store_bp.route('/skills', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def list_store_skills():
     """
     Lista las skills disponibles en la tienda (que el usuario aún no posee).
     """
     query_params = request.args
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     try:
         items = store_service.list_skills_in_store(user_id, query_params)
         return jsonify(items), 200
@@ -21,12 +24,13 @@ def list_store_skills():
 
 @store_bp.route('/items', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def list_store_items():
     """
     Lista los ítems (Gear) disponibles en la tienda (que el usuario aún no posee).
     """
     query_params = request.args
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     try:
         items = store_service.list_gear_in_store(user_id, query_params)
         return jsonify(items), 200
@@ -37,7 +41,7 @@ def list_store_items():
 @store_bp.route('/skills/purchase', methods=['POST'])
 @jwt_required()
 def purchase_skill():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json() or {}
     skill_id = data.get('skill_id')
     zone_id = data.get('zone_id')  # Opcional, solo si es skill de zona
@@ -52,7 +56,7 @@ def purchase_skill():
 @store_bp.route('/items/purchase', methods=['POST'])
 @jwt_required()
 def purchase_item():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json() or {}
     gear_id = data.get('gear_id')
 
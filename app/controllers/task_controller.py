@@ -1,16 +1,23 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.task_service import TaskService
 from app.schemas.task_schema import TaskSchema
+from app.utils.query_guard import query_budget
+from app.utils.pagination import pagination_args
+from app.utils.http_cache import not_modified, set_cache_headers
+from app.services.resource_version_service import ResourceVersionService, TASKS
 
 task_bp = Blueprint('task_bp', __name__)
 task_service = TaskService()
+resource_versions = ResourceVersionService()
 
 task_schema = TaskSchema()
 tasks_schema = TaskSchema(many=True)
 
 @task_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_all_tasks():
     """
     GET /tasks
@@ -23,11 +30,19 @@ def get_all_tasks():
       - zone_id=...
       - project_id=...
       - energy_type=positive|negative  (NUEVO)
-      - page=1, limit=10               (NUEVO)
+      - cursor, limit, include_total=true (paginación por cursor, ver app/utils/pagination.py)
+
+    Responde con ETag según la versión de las tareas del usuario; si el
+    cliente ya la tiene (If-None-Match) devuelve 304 sin consultar las tareas.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query_params = request.args
 
+    etag = resource_versions.etag(user_id, (TASKS,), request.query_string.decode())
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     status = query_params.get('status')
     priority = query_params.get('priority')
     cycle = query_params.get('cycle')
@@ -38,41 +53,31 @@ def get_all_tasks():
 
     # NUEVO
     energy_type = query_params.get('energy_type')  # "positive" o "negative"
-    page = query_params.get('page')
-    limit = query_params.get('limit')
-
-    tasks, total = task_service.get_tasks_with_filters(
-        user_id=user_id,
-        status=status,
-        priority=priority,
-        cycle=cycle,
-        project_id=project_id,
-        zone_id=zone_id,
-        start_date=start_date,
-        end_date=end_date,
-        energy_type=energy_type,   # Param filtrado de energía
-        page=page,                 # Para paginación
-        limit=limit
-    )
-
-    # Estructura de respuesta que incluya datos y metadatos de paginación
-    response = {
-        "items": tasks_schema.dump(tasks),  # la lista de tareas
-        "total": total,                     # total de tareas que cumplen el filtro
-    }
-
-    # si se enviaron parámetros de paginación, devolvemos la info
-    if page and limit:
-        response["page"] = int(page)
-        response["limit"] = int(limit)
-
-    return jsonify(response), 200
+
+    try:
+        page = task_service.get_tasks_with_filters(
+            user_id=user_id,
+            status=status,
+            priority=priority,
+            cycle=cycle,
+            project_id=project_id,
+            zone_id=zone_id,
+            start_date=start_date,
+            end_date=end_date,
+            energy_type=energy_type,   # Param filtrado de energía
+            **pagination_args(query_params)
+        )
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+    # items, next_cursor, has_more, limit y total (si include_total=true)
+    return set_cache_headers(jsonify(page.to_dict(tasks_schema.dump(page.items))), etag)
 
 
 @task_bp.route('/<int:task_id>', methods=['GET'])
 @jwt_required()
 def get_task_by_id(task_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         t = task_service.get_task_by_id(task_id, user_id)
         return task_schema.dump(t), 200
@@ -83,7 +88,7 @@ def get_task_by_id(task_id):
 @task_bp.route('', methods=['POST'])
 @jwt_required()
 def create_task():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_task = task_service.create_task(data, user_id)
@@ -95,7 +100,7 @@ def create_task():
 @task_bp.route('/<int:task_id>', methods=['PUT'])
 @jwt_required()
 def update_task(task_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = task_service.update_task(task_id, data, user_id)
@@ -107,7 +112,7 @@ def update_task(task_id):
 @task_bp.route('/<int:task_id>', methods=['DELETE'])
 @jwt_required()
 def delete_task(task_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         task_service.delete_task(task_id, user_id)
         return {}, 204
@@ -121,7 +126,7 @@ def complete_task(task_id):
     """
     Marca la tarea como COMPLETED y opcionalmente actualiza XP/energy del usuario.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         t = task_service.complete_task(task_id, user_id)
         return {"message": f"Tarea '{t.name}' completada."}, 200
@@ -131,11 +136,12 @@ def complete_task(task_id):
 
 @task_bp.route('/overdue', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_overdue_tasks():
     """
     Devuelve las tareas vencidas (overdue) según la fecha actual.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     tasks = task_service.get_overdue_tasks(user_id)
     return jsonify(tasks_schema.dump(tasks)), 200
 
@@ -147,7 +153,7 @@ def mark_overdue_tasks():
     Marca las tareas atrasadas como 'VENCIDAS' y dispara el evento 
     TASK_OVERDUE_CHECK para logros globales.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     updated_tasks = task_service.mark_overdue_tasks(user_id)
     return {
         "message": "Tareas marcadas como vencidas",
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.template_service import TemplateService
 from app.schemas.template_schema import TemplateSchema
 
@@ -17,7 +18,7 @@ def get_all_templates():
     Soporta filtro por category=task|habit|project
     Ejemplo: /templates?category=habit
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     category = request.args.get('category')
     items = template_service.get_all_templates(user_id, category)
     return jsonify(templates_schema.dump(items)), 200
@@ -39,7 +40,7 @@ def create_template():
       "category": "habit"  // "task" | "project" | ...
     }
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_template = template_service.create_template(data, user_id)
@@ -54,7 +55,7 @@ def update_template(template_id):
     PUT /templates/{id}
     Permite editar la plantilla.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = template_service.update_template(template_id, data, user_id)
@@ -69,7 +70,7 @@ def delete_template(template_id):
     DELETE /templates/{id}
     Borrado lógico de una plantilla.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         template_service.delete_template(template_id, user_id)
         return {}, 204
@@ -85,7 +86,7 @@ def use_template(template_id):
     Aplica la plantilla para crear un nuevo elemento (task/habit/project).
     Body (opcional) puede incluir campos a sobrescribir.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json() or {}
     try:
         # Devuelve el nuevo objeto creado
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.user_service import UserService
 from app.schemas.user_schema import UserSchema
+from app.utils.query_guard import query_budget
 
 user_bp = Blueprint('user_bp', __name__)
 user_service = UserService()
@@ -11,11 +13,12 @@ users_schema = UserSchema(many=True)
 
 @user_bp.route('/me', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_me():
     """
     Devuelve la información del usuario autenticado.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         user = user_service.get_user_by_id(user_id)
         return user_schema.dump(user), 200
@@ -28,7 +31,7 @@ def update_me():
     """
     Permite al usuario autenticado actualizar su información.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = user_service.update_user(user_id, data)
@@ -42,7 +45,7 @@ def change_my_password():
     """
     Cambia la contraseña del usuario autenticado, solicitando la contraseña actual y la nueva.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     current_password = data.get('current_password')
     new_password = data.get('new_password')
@@ -66,8 +69,8 @@ def get_all_users():
     Retorna la lista de usuarios (normalmente acceso solo para admins).
     """
     # Ejemplo: podrías verificar si el current user es admin
-    current_user_id = get_jwt_identity()
-    # if not user_service.is_admin(current_user_id):
+    requester_id = current_user_id()
+    # if not user_service.is_admin(requester_id):
     #     return {"error": "No autorizado"}, 403
 
     try:
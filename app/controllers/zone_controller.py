@@ -1,16 +1,22 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
+from app.utils.principal import current_user_id
 from app.services.zone_service import ZoneService
 from app.schemas.zone_schema import ZoneSchema
+from app.utils.query_guard import query_budget
+from app.utils.http_cache import not_modified, set_cache_headers
+from app.services.resource_version_service import ResourceVersionService, ZONES
 
 zone_bp = Blueprint('zone_bp', __name__)
 zone_service = ZoneService()
+resource_versions = ResourceVersionService()
 
 zone_schema = ZoneSchema()
 zones_schema = ZoneSchema(many=True)
 
 @zone_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_all_zones():
     """
     GET /zones
@@ -20,10 +26,17 @@ def get_all_zones():
       - min_level, max_level
       - xp (rango)
     Ejemplo: /zones?name=Work&min_level=2
+
+    Con ETag según la versión de las zonas del usuario (304 si no han cambiado).
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     query_params = request.args
 
+    etag = resource_versions.etag(user_id, (ZONES,), request.query_string.decode())
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+
     name_filter = query_params.get('name')
     min_energy = query_params.get('min_energy')
     max_energy = query_params.get('max_energy')
@@ -42,12 +55,12 @@ def get_all_zones():
         min_xp=min_xp,
         max_xp=max_xp
     )
-    return jsonify(zones_schema.dump(items)), 200
+    return set_cache_headers(jsonify(zones_schema.dump(items)), etag)
 
 @zone_bp.route('/<int:zone_id>', methods=['GET'])
 @jwt_required()
 def get_zone_by_id(zone_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         z = zone_service.get_zone_by_id(zone_id, user_id)
         return zone_schema.dump(z), 200
@@ -57,7 +70,7 @@ def get_zone_by_id(zone_id):
 @zone_bp.route('', methods=['POST'])
 @jwt_required()
 def create_zone():
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         new_z = zone_service.create_zone(data, user_id)
@@ -68,7 +81,7 @@ def create_zone():
 @zone_bp.route('/<int:zone_id>', methods=['PUT'])
 @jwt_required()
 def update_zone(zone_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     try:
         updated = zone_service.update_zone(zone_id, data, user_id)
@@ -79,7 +92,7 @@ def update_zone(zone_id):
 @zone_bp.route('/<int:zone_id>', methods=['DELETE'])
 @jwt_required()
 def delete_zone(zone_id):
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         zone_service.delete_zone(zone_id, user_id)
         return {}, 204
@@ -88,12 +101,13 @@ def delete_zone(zone_id):
 
 @zone_bp.route('/<int:zone_id>/stats', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_zone_stats(zone_id):
     """
     GET /zones/<zone_id>/stats
     Retorna info como energía, xp, level, etc.
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     try:
         stats = zone_service.get_zone_stats(zone_id, user_id)
         return jsonify(stats), 200
@@ -111,7 +125,7 @@ def assign_zone(zone_id):
         "item_id": 123
       }
     """
-    user_id = get_jwt_identity()
+    user_id = current_user_id()
     data = request.get_json()
     obj_type = data.get('type')
     item_id = data.get('item_id')
@@ -0,0 +1,28 @@
+from app import db
+from datetime import datetime
+
+class AchievementBackfillJob(db.Model):
+    """
+    Trabajo de otorgamiento retroactivo de un GlobalAchievement a todos los
+    usuarios. Se procesa por tramos de usuarios (keyset sobre user.id) y guarda
+    el último user.id procesado, de modo que se puede reanudar si se corta.
+    """
+    __tablename__ = "achievement_backfill_job"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    status = db.Column(db.String(20), default="PENDING")  # "PENDING", "RUNNING", "DONE", "FAILED"
+    chunk_size = db.Column(db.Integer, default=1000)
+    last_user_id = db.Column(db.Integer, default=0)
+    processed_users = db.Column(db.Integer, default=0)
+    granted_count = db.Column(db.Integer, default=0)
+    error = db.Column(db.String(255))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    global_achievement_id = db.Column(db.Integer, db.ForeignKey('global_achievement.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<AchievementBackfillJob {self.id} ach={self.global_achievement_id} status={self.status}>"
@@ -4,11 +4,16 @@ from datetime import datetime
 class AdminLog(db.Model):
     __tablename__ = "admin_log"
 
+    __table_args__ = (
+        db.Index('ix_admin_log_created', 'deleted', 'created_at'),  # GET /admin/logs paginado
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
     level = db.Column(db.String(50), default="INFO")  # "INFO", "WARN", "ERROR"
     message = db.Column(db.String(255))
+    details = db.Column(db.Text)  # JSON opcional (p.ej. peticiones lentas, ver app/utils/profiling.py)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __repr__(self):
@@ -0,0 +1,19 @@
+from app import db
+from datetime import datetime
+
+class AgendaFeedToken(db.Model):
+    """
+    Token secreto de la URL de suscripción de calendario de un usuario
+    (/agenda/feed.ics?token=...). Los clientes de calendario no mandan JWT:
+    quien tenga la URL puede leer la agenda, así que se puede regenerar.
+    """
+    __tablename__ = "agenda_feed_token"
+
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(64), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<AgendaFeedToken user={self.user_id}>"
@@ -4,6 +4,11 @@ from app.models.challenge_level import ChallengeLevel
 class Habit(db.Model):
     __tablename__ = "habit"
 
+    __table_args__ = (
+        db.Index('ix_habit_user_zone', 'user_id', 'deleted', 'zone_id'),
+        db.Index('ix_habit_user_id', 'user_id', 'deleted', 'id'),  # GET /habits paginado por cursor
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
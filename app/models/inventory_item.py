@@ -4,6 +4,11 @@ from datetime import datetime
 class InventoryItem(db.Model):
     __tablename__ = "inventory_item"
 
+    __table_args__ = (
+        db.Index('ix_inventory_item_user_gear', 'user_id', 'deleted', 'gear_id'),
+        db.Index('ix_inventory_item_user_id', 'user_id', 'deleted', 'id'),  # GET /inventory paginado por cursor
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
     remaining_uses = db.Column(db.Integer)
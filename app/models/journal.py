@@ -4,6 +4,10 @@ from datetime import datetime
 class Journal(db.Model):
     __tablename__ = "journal"
 
+    __table_args__ = (
+        db.Index('ix_journal_user_created', 'user_id', 'deleted', 'created_at'),  # último diario del usuario
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
@@ -4,6 +4,10 @@ from datetime import date
 class JournalEntry(db.Model):
     __tablename__ = "journal_entry"
 
+    __table_args__ = (
+        db.Index('ix_journal_entry_journal', 'journal_id', 'deleted'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
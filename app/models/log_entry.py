@@ -5,6 +5,10 @@ from app.models.challenge_level import ChallengeLevel
 class LogEntry(db.Model):
     __tablename__ = "log_entry"
 
+    __table_args__ = (
+        db.Index('ix_log_entry_user_end', 'user_id', 'deleted', 'end_timestamp'),  # /log-entries?from=&to=, estadísticas
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
@@ -15,7 +19,7 @@ class LogEntry(db.Model):
     energy = db.Column(db.Integer)
 
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    zone_id = db.Column(db.Integer, db.ForeignKey('zone.id'), nullable=False)
+    zone_id = db.Column(db.Integer, db.ForeignKey('zone.id'), nullable=True)
 
     def __repr__(self):
         return f"<LogEntry {self.id}>"
@@ -0,0 +1,30 @@
+from app import db
+
+class LogEntryRollup(db.Model):
+    """
+    Agregado diario de log_entry: una fila por (user_id, zone_id, type, day)
+    con la energía total y el número de entradas. Las vistas semanales (ISO)
+    y mensuales se derivan de estas filas.
+
+    zone_id = 0 / type = "" representan entradas sin zona / sin tipo, para que
+    la clave única no dependa de NULLs.
+    """
+    __tablename__ = "log_entry_rollup"
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'zone_id', 'type', 'day', name='uq_log_entry_rollup_key'),
+        db.Index('ix_log_entry_rollup_user_day', 'user_id', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    zone_id = db.Column(db.Integer, default=0, nullable=False)
+    type = db.Column(db.String(20), default="", nullable=False)
+    day = db.Column(db.Date, nullable=False)
+
+    energy = db.Column(db.Integer, default=0, nullable=False)
+    entries = db.Column(db.Integer, default=0, nullable=False)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<LogEntryRollup user={self.user_id} zone={self.zone_id} type={self.type} day={self.day}>"
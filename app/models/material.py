@@ -10,6 +10,10 @@ project_materials = db.Table(
 class Material(db.Model):
     __tablename__ = "material"
 
+    __table_args__ = (
+        db.Index('ix_material_user', 'user_id', 'deleted'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
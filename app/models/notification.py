@@ -4,6 +4,11 @@ from datetime import datetime
 class Notification(db.Model):
     __tablename__ = "notification"
 
+    __table_args__ = (
+        db.Index('ix_notification_user_read', 'user_id', 'deleted', 'is_read'),  # no leídas / marcar todas
+        db.Index('ix_notification_user_created', 'user_id', 'deleted', 'created_at'),  # GET /notifications paginado
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
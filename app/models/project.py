@@ -10,6 +10,12 @@ from datetime import datetime
 class Project(db.Model):
     __tablename__ = "project"
 
+    __table_args__ = (
+        db.Index('ix_project_user_zone', 'user_id', 'deleted', 'zone_id'),  # /projects, búsqueda por zona
+        db.Index('ix_project_user_end_date', 'user_id', 'deleted', 'end_date'),  # agenda
+        db.Index('ix_project_user_id', 'user_id', 'deleted', 'id'),  # GET /projects paginado por cursor
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
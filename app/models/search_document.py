@@ -0,0 +1,58 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import DDL, event
+
+class SearchDocument(db.Model):
+    """
+    Documento del índice de búsqueda de global_search: una fila por Task,
+    Habit, Project o Material no borrado, con el texto ya normalizado
+    (ver app/utils/text_search.py). Lo mantienen los servicios al crear,
+    editar o borrar; `flask rebuild-search-index` lo regenera entero.
+
+    - MySQL: índices FULLTEXT sobre title_terms / body_terms.
+    - SQLite: tabla virtual FTS5 'search_document_fts' (external content)
+      sincronizada con triggers.
+    """
+    __tablename__ = "search_document"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    entity_type = db.Column(db.String(20), nullable=False)   # "task", "habit", "project", "material"
+    entity_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    title_terms = db.Column(db.Text, default="")
+    body_terms = db.Column(db.Text, default="")
+    trigram_count = db.Column(db.Integer, default=0)   # nº de filas en search_trigram (búsqueda difusa)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint("entity_type", "entity_id", name="uq_search_document_entity"),
+        db.Index("ix_search_document_user_type", "user_id", "entity_type"),
+        db.Index("ft_search_document_title", "title_terms", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+        db.Index("ft_search_document_all", "title_terms", "body_terms", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+    def __repr__(self):
+        return f"<SearchDocument {self.entity_type}:{self.entity_id}>"
+
+# ---- FTS5 (solo SQLite) ----
+_SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_document_fts USING fts5("
+    "title_terms, body_terms, content='search_document', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS search_document_ai AFTER INSERT ON search_document BEGIN "
+    "INSERT INTO search_document_fts(rowid, title_terms, body_terms) "
+    "VALUES (new.id, new.title_terms, new.body_terms); END",
+    "CREATE TRIGGER IF NOT EXISTS search_document_ad AFTER DELETE ON search_document BEGIN "
+    "INSERT INTO search_document_fts(search_document_fts, rowid, title_terms, body_terms) "
+    "VALUES ('delete', old.id, old.title_terms, old.body_terms); END",
+    "CREATE TRIGGER IF NOT EXISTS search_document_au AFTER UPDATE ON search_document BEGIN "
+    "INSERT INTO search_document_fts(search_document_fts, rowid, title_terms, body_terms) "
+    "VALUES ('delete', old.id, old.title_terms, old.body_terms); "
+    "INSERT INTO search_document_fts(rowid, title_terms, body_terms) "
+    "VALUES (new.id, new.title_terms, new.body_terms); END",
+)
+for _statement in _SQLITE_FTS:
+    event.listen(SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(SearchDocument.__table__, "before_drop",
+             DDL("DROP TABLE IF EXISTS search_document_fts").execute_if(dialect="sqlite"))
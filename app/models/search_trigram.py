@@ -0,0 +1,23 @@
+from app import db
+
+class SearchTrigram(db.Model):
+    """
+    Trigramas del nombre de cada SearchDocument (ver text_search.trigrams),
+    para la búsqueda difusa: se buscan los documentos del usuario que
+    comparten suficientes trigramas con la consulta usando el índice
+    (user_id, trigram), sin recorrer todos los nombres.
+    """
+    __tablename__ = "search_trigram"
+    __table_args__ = (
+        db.Index("ix_search_trigram_lookup", "user_id", "trigram", "document_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    trigram = db.Column(db.String(3), nullable=False)
+
+    document_id = db.Column(db.Integer, db.ForeignKey('search_document.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<SearchTrigram {self.document_id} '{self.trigram}'>"
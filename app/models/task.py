@@ -5,6 +5,13 @@ from app.models.challenge_level import ChallengeLevel
 class Task(db.Model):
     __tablename__ = "task"
 
+    __table_args__ = (
+        db.Index('ix_task_user_status', 'user_id', 'deleted', 'status'),  # /tasks?status=..., logros
+        db.Index('ix_task_user_end_date', 'user_id', 'deleted', 'end_date'),  # vencidas y agenda
+        db.Index('ix_task_project', 'project_id'),  # tareas de un proyecto
+        db.Index('ix_task_user_id', 'user_id', 'deleted', 'id'),  # GET /tasks paginado por cursor
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
@@ -3,6 +3,10 @@ from app import db
 class Template(db.Model):
     __tablename__ = "template"
 
+    __table_args__ = (
+        db.Index('ix_template_user', 'user_id', 'deleted'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
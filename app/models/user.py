@@ -16,6 +16,10 @@ user_skills = db.Table(
 class User(db.Model):
     __tablename__ = "user"
 
+    __table_args__ = (
+        db.Index('ix_user_reset_token', 'reset_token'),  # restablecer contraseña
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
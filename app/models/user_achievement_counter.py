@@ -0,0 +1,23 @@
+from app import db
+
+class UserAchievementCounter(db.Model):
+    """
+    Contador por usuario para los logros de tipo "conteo"
+    (TASKS_COMPLETED, JOURNAL_ENTRIES, HABIT_CHECKS...). Se incrementa en la
+    misma transacción que la acción que lo provoca, de modo que evaluar un
+    logro es comparar value >= threshold sin hacer COUNT(*).
+    """
+    __tablename__ = "user_achievement_counter"
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'counter_type', name='uq_user_achievement_counter'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    counter_type = db.Column(db.String(50), nullable=False)  # mismo valor que GlobalAchievement.condition_type
+    value = db.Column(db.Integer, default=0, nullable=False)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<UserAchievementCounter user={self.user_id} {self.counter_type}={self.value}>"
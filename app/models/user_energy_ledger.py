@@ -0,0 +1,22 @@
+from app import db
+
+class UserEnergyLedger(db.Model):
+    """
+    Libro diario de energía por usuario: una fila por (user_id, day) con la
+    suma de energía de sus LogEntries de ese día. Se mantiene incrementalmente
+    desde LogService / LogEntryService.
+    """
+    __tablename__ = "user_energy_ledger"
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', name='uq_user_energy_ledger_user_day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    day = db.Column(db.Date, nullable=False)
+    energy = db.Column(db.Integer, default=0, nullable=False)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<UserEnergyLedger user={self.user_id} day={self.day} energy={self.energy}>"
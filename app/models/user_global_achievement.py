@@ -5,6 +5,11 @@ from datetime import datetime
 class UserGlobalAchievement(db.Model):
     __tablename__ = "user_global_achievement"
 
+    __table_args__ = (
+        db.Index('ix_user_global_achievement_user', 'user_id', 'deleted'),
+        db.UniqueConstraint('user_id', 'global_achievement_id', name='uq_user_global_achievement'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
 
@@ -0,0 +1,39 @@
+from app import db
+from datetime import datetime, date
+
+class UserProgressHistory(db.Model):
+    """
+    Historial append-only de la progresión del usuario. Cada fila guarda la
+    foto (xp, level, coins, blue_gems) tras el cambio y los deltas aplicados.
+
+    granularity:
+      - "RAW"  => un punto por cambio (últimos 30 días)
+      - "DAY"  => último punto del día, con los deltas del día sumados
+      - "WEEK" => último punto de la semana ISO (datos de hace más de un año)
+    """
+    __tablename__ = "user_progress_history"
+    __table_args__ = (
+        db.Index('ix_user_progress_history_user_day', 'user_id', 'day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    day = db.Column(db.Date, default=date.today, nullable=False)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    granularity = db.Column(db.String(10), default="RAW", nullable=False)
+    source = db.Column(db.String(20))  # "TASK", "HABIT", "PROJECT", ...
+
+    xp = db.Column(db.Integer, default=0)
+    level = db.Column(db.Integer, default=1)
+    coins = db.Column(db.Integer, default=0)
+    blue_gems = db.Column(db.Integer, default=0)
+
+    xp_delta = db.Column(db.Integer, default=0)
+    level_delta = db.Column(db.Integer, default=0)
+    coins_delta = db.Column(db.Integer, default=0)
+    blue_gems_delta = db.Column(db.Integer, default=0)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<UserProgressHistory user={self.user_id} day={self.day} xp={self.xp} level={self.level}>"
@@ -0,0 +1,25 @@
+from app import db
+from datetime import datetime
+
+class UserResourceVersion(db.Model):
+    """
+    Versión por usuario de una familia de recursos ("search", ...). Los
+    servicios la incrementan en la misma transacción que la escritura, de
+    modo que una caché (o un cliente) solo tiene que comparar el número
+    para saber si sus datos siguen al día.
+    """
+    __tablename__ = "user_resource_version"
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'resource', name='uq_user_resource_version'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    resource = db.Column(db.String(50), nullable=False)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<UserResourceVersion user={self.user_id} {self.resource}={self.version}>"
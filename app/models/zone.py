@@ -3,6 +3,10 @@ from app import db
 class Zone(db.Model):
     __tablename__ = "zone"
 
+    __table_args__ = (
+        db.Index('ix_zone_user', 'user_id', 'deleted'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     deleted = db.Column(db.Boolean, default=False)
     name = db.Column(db.String(100))
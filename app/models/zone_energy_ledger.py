@@ -0,0 +1,20 @@
+from app import db
+
+class ZoneEnergyLedger(db.Model):
+    """
+    Libro diario de energía por zona: una fila por (zone_id, day).
+    """
+    __tablename__ = "zone_energy_ledger"
+    __table_args__ = (
+        db.UniqueConstraint('zone_id', 'day', name='uq_zone_energy_ledger_zone_day'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    day = db.Column(db.Date, nullable=False)
+    energy = db.Column(db.Integer, default=0, nullable=False)
+
+    zone_id = db.Column(db.Integer, db.ForeignKey('zone.id'), nullable=False)
+
+    def __repr__(self):
+        return f"<ZoneEnergyLedger zone={self.zone_id} day={self.day} energy={self.energy}>"
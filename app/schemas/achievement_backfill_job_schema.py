@@ -0,0 +1,14 @@
+from marshmallow import Schema, fields
+
+class AchievementBackfillJobSchema(Schema):
+    id = fields.Int(dump_only=True)
+    global_achievement_id = fields.Int()
+    status = fields.Str()
+    chunk_size = fields.Int()
+    last_user_id = fields.Int()
+    processed_users = fields.Int()
+    granted_count = fields.Int()
+    error = fields.Str(allow_none=True)
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+    finished_at = fields.DateTime(allow_none=True)
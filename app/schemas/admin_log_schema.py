@@ -5,4 +5,5 @@ class AdminLogSchema(Schema):
     deleted = fields.Bool()
     level = fields.Str()
     message = fields.Str()
+    details = fields.Str()
     created_at = fields.DateTime()
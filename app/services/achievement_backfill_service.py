@@ -0,0 +1,202 @@
+from app import db
+from app.models.achievement_backfill_job import AchievementBackfillJob
+from app.models.global_achievement import GlobalAchievement
+from app.models.user_global_achievement import UserGlobalAchievement
+from app.models.habit import Habit
+from app.models.user import User
+from app.services.achievement_counter_service import AchievementCounterService, COUNTER_TYPES
+from datetime import datetime, timedelta
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+import threading
+
+# condition_type que se pueden evaluar de forma retroactiva (los SURPRISE
+# dependen del momento del evento y no se pueden reconstruir)
+BACKFILLABLE_TYPES = COUNTER_TYPES + ("LOGIN_STREAK", "HABIT_STREAK")
+
+# Un trabajo RUNNING que no avanza en este tiempo se da por abandonado (proceso
+# caído) y se puede reanudar o sustituir
+STALE_AFTER = timedelta(minutes=10)
+
+counter_service = AchievementCounterService()
+
+class AchievementBackfillService:
+    """
+    Otorga un logro global a todos los usuarios que ya cumplen su condición.
+    Cada tramo de usuarios se resuelve con una consulta agrupada (no un check
+    por usuario), se insertan los UserGlobalAchievement en bloque y el avance
+    del trabajo se guarda en el mismo commit.
+    Solo puede haber un trabajo activo por logro; aun así, el índice único
+    (user_id, global_achievement_id) impide otorgar el mismo logro dos veces.
+    """
+
+    def create_job(self, ach_id, chunk_size=1000):
+        ach = GlobalAchievement.query.filter_by(id=ach_id, deleted=False).first()
+        if not ach:
+            raise Exception("Logro global no encontrado.")
+        if ach.condition_type not in BACKFILLABLE_TYPES:
+            raise Exception(f"El tipo {ach.condition_type} no admite otorgamiento retroactivo.")
+
+        active = AchievementBackfillJob.query.filter(
+            AchievementBackfillJob.global_achievement_id == ach.id,
+            AchievementBackfillJob.status.in_(["PENDING", "RUNNING"]),
+            AchievementBackfillJob.updated_at >= datetime.utcnow() - STALE_AFTER
+        ).first()
+        if active:
+            raise Exception(f"Ya hay un trabajo de backfill en curso para este logro (#{active.id}).")
+
+        job = AchievementBackfillJob(
+            global_achievement_id=ach.id,
+            chunk_size=chunk_size,
+            status="PENDING",
+            last_user_id=0
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def get_job(self, job_id):
+        job = AchievementBackfillJob.query.filter_by(id=job_id).first()
+        if not job:
+            raise Exception("Trabajo de backfill no encontrado.")
+        return job
+
+    def start_job_async(self, app, job_id):
+        """
+        Lanza run_job en un hilo aparte (con su propio app context) para no
+        bloquear la petición HTTP. El progreso se consulta con get_job.
+        """
+        def target():
+            with app.app_context():
+                try:
+                    self.run_job(job_id)
+                finally:
+                    db.session.remove()
+
+        thread = threading.Thread(target=target, name=f"achievement-backfill-{job_id}", daemon=True)
+        thread.start()
+        return thread
+
+    def run_job(self, job_id, progress=None):
+        """
+        Procesa (o reanuda desde last_user_id) un trabajo hasta terminar.
+        - progress: callback opcional progress(job) tras cada tramo.
+        """
+        job = self.get_job(job_id)
+        if job.status == "DONE":
+            return job
+
+        ach = GlobalAchievement.query.filter_by(id=job.global_achievement_id).first()
+
+        # Reclamar el trabajo de forma atómica: si otro hilo lo tiene RUNNING
+        # (y no está abandonado), no se procesa dos veces
+        now = datetime.utcnow()
+        claimed = AchievementBackfillJob.query.filter(
+            AchievementBackfillJob.id == job.id,
+            or_(
+                AchievementBackfillJob.status != "RUNNING",
+                AchievementBackfillJob.updated_at < now - STALE_AFTER
+            )
+        ).update({"status": "RUNNING", "error": None, "updated_at": now}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            raise Exception("El trabajo de backfill ya está en ejecución.")
+
+        try:
+            while True:
+                user_ids = [row[0] for row in db.session.query(User.id).filter(
+                    User.id > job.last_user_id,
+                    User.deleted == False
+                ).order_by(User.id).limit(job.chunk_size)]
+                if not user_ids:
+                    break
+
+                self._grant_chunk(job, ach, user_ids)
+
+                if progress:
+                    progress(job)
+
+            job.status = "DONE"
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            job.status = "FAILED"
+            job.error = str(e)[:255]
+            db.session.commit()
+            raise
+
+        return job
+
+    # ---- MÉTODOS PRIVADOS ----
+    def _grant_chunk(self, job, ach, user_ids):
+        """
+        Inserta los logros del tramo y guarda el avance en un mismo commit.
+        Si una evaluación en vivo otorga el logro a la vez (IntegrityError por
+        el índice único), se deshace y se repite el tramo una vez: la segunda
+        lectura ya excluye a ese usuario.
+        """
+        for attempt in range(2):
+            eligible = self._eligible_progress(ach, user_ids)
+            now = datetime.utcnow()
+            try:
+                db.session.bulk_insert_mappings(UserGlobalAchievement, [
+                    {
+                        "user_id": uid,
+                        "global_achievement_id": ach.id,
+                        "achieved_at": now,
+                        "current_progress": int(value),
+                        "deleted": False
+                    }
+                    for uid, value in eligible
+                ])
+
+                job.last_user_id = user_ids[-1]
+                job.processed_users += len(user_ids)
+                job.granted_count += len(eligible)
+                job.updated_at = now
+                db.session.commit()
+                return
+            except IntegrityError:
+                db.session.rollback()
+                if attempt:
+                    raise
+
+    def _eligible_progress(self, ach, user_ids):
+        """
+        Retorna [(user_id, progreso)] de los usuarios del tramo que cumplen la
+        condición y aún no tienen el logro, con una sola consulta.
+        Los logros de conteo se calculan desde las tablas origen (no desde
+        user_achievement_counter, que puede no existir para usuarios antiguos).
+        """
+        # Sin filtrar deleted: cualquier fila existente choca con el índice único
+        already = db.session.query(UserGlobalAchievement.user_id).filter(
+            UserGlobalAchievement.global_achievement_id == ach.id,
+            UserGlobalAchievement.user_id.in_(user_ids)
+        )
+
+        if ach.condition_type in COUNTER_TYPES:
+            q = counter_service.source_query(ach.condition_type)
+            entity = q.column_descriptions[0]["entity"]
+            value = q.column_descriptions[1]["expr"]
+            q = q.filter(
+                entity.user_id.in_(user_ids),
+                entity.user_id.notin_(already)
+            ).group_by(entity.user_id).having(value >= ach.threshold)
+        elif ach.condition_type == "LOGIN_STREAK":
+            q = db.session.query(User.id, User.login_streak).filter(
+                User.login_streak >= ach.threshold,
+                User.id.in_(user_ids),
+                User.id.notin_(already)
+            )
+        elif ach.condition_type == "HABIT_STREAK":
+            max_streak = func.max(Habit.streak)
+            q = db.session.query(Habit.user_id, max_streak).filter(
+                Habit.deleted == False,
+                Habit.user_id.in_(user_ids),
+                Habit.user_id.notin_(already)
+            ).group_by(Habit.user_id).having(max_streak >= ach.threshold)
+        else:
+            return []
+
+        return q.all()
@@ -0,0 +1,81 @@
+from app import db
+from app.models.user_achievement_counter import UserAchievementCounter
+from app.models.task import Task
+from app.models.habit import Habit
+from app.models.journal_entry import JournalEntry
+from app.utils.counters import increment_or_insert
+from sqlalchemy import func
+
+TASKS_COMPLETED = "TASKS_COMPLETED"
+JOURNAL_ENTRIES = "JOURNAL_ENTRIES"
+HABIT_CHECKS = "HABIT_CHECKS"
+
+# condition_type de logros que se evalúan contra un contador
+COUNTER_TYPES = (TASKS_COMPLETED, JOURNAL_ENTRIES, HABIT_CHECKS)
+
+class AchievementCounterService:
+    """
+    Contadores de progreso por usuario para logros de conteo.
+    increment() NO hace commit: se llama antes del commit de la acción que
+    lo provoca (completar tarea, crear entrada de diario, marcar hábito...).
+    """
+
+    def increment(self, user_id, counter_type, delta=1):
+        if not delta:
+            return
+        increment_or_insert(
+            UserAchievementCounter,
+            {"user_id": int(user_id), "counter_type": counter_type},
+            {"value": delta}
+        )
+
+    def get_counters(self, user_id, counter_types=COUNTER_TYPES):
+        """
+        Retorna {counter_type: valor} en una sola consulta (0 si no existe).
+        """
+        rows = db.session.query(UserAchievementCounter.counter_type, UserAchievementCounter.value).filter(
+            UserAchievementCounter.user_id == int(user_id),
+            UserAchievementCounter.counter_type.in_(list(counter_types))
+        ).all()
+        counters = {ctype: 0 for ctype in counter_types}
+        counters.update({ctype: value for ctype, value in rows})
+        return counters
+
+    def source_query(self, counter_type):
+        """
+        Consulta (user_id, valor) que calcula el contador desde su tabla
+        origen, sin agrupar: quien la usa añade filtros y group_by(user_id).
+        """
+        if counter_type == TASKS_COMPLETED:
+            return (db.session.query(Task.user_id, func.count(Task.id))
+                .filter(Task.deleted == False, Task.status == "COMPLETED"))
+        if counter_type == JOURNAL_ENTRIES:
+            return (db.session.query(JournalEntry.user_id, func.count(JournalEntry.id))
+                .filter(JournalEntry.deleted == False))
+        if counter_type == HABIT_CHECKS:
+            return (db.session.query(Habit.user_id, func.coalesce(func.sum(Habit.total_check), 0))
+                .filter(Habit.deleted == False))
+        raise Exception(f"Tipo de contador desconocido: {counter_type}")
+
+    def recompute(self, user_id=None):
+        """
+        Reconstruye los contadores desde las tablas origen con una consulta
+        agrupada por tipo. Retorna cuántas filas de contador se han escrito.
+        """
+        delete_q = UserAchievementCounter.query
+        if user_id is not None:
+            delete_q = delete_q.filter(UserAchievementCounter.user_id == user_id)
+        delete_q.delete(synchronize_session=False)
+
+        mappings = []
+        for counter_type in COUNTER_TYPES:
+            q = self.source_query(counter_type)
+            entity = q.column_descriptions[0]["entity"]
+            if user_id is not None:
+                q = q.filter(entity.user_id == user_id)
+            for uid, value in q.group_by(entity.user_id).all():
+                mappings.append({"user_id": uid, "counter_type": counter_type, "value": int(value or 0)})
+
+        db.session.bulk_insert_mappings(UserAchievementCounter, mappings)
+        db.session.commit()
+        return len(mappings)
@@ -3,22 +3,30 @@ from app.models.user import User
 from app.models.role import Role
 from app.models.admin_log import AdminLog
 from app.models.incident import Incident
+from app.utils.pagination import paginate
 # from app.models.achievement import Achievement
 from app.models.task import Task
 from app.models.habit import Habit
 from datetime import datetime
 import io
+from app.utils.principal import get_user
+from app.services.resource_version_service import ResourceVersionService, AGENDA, TASKS, HABITS, SEARCH
+from app.services.search_index_service import SearchIndexService
+
+resource_versions = ResourceVersionService()
+search_index = SearchIndexService()
 
 class AdminService:
 
-    def list_all_users(self):
+    def list_all_users(self, cursor=None, limit=None, include_total=False):
         """Lista todos los usuarios (incluyendo borrados si quisieras). 
-           Aquí dejamos solo los activos (deleted=False)."""
-        return User.query.filter_by(deleted=False).all()
+           Aquí dejamos solo los activos (deleted=False). Page ordenada por id."""
+        return paginate(User.query.filter_by(deleted=False), User.id,
+                        cursor=cursor, limit=limit, include_total=include_total)
 
     def update_user_role(self, user_id, new_role):
         """Cambia el rol de un usuario a USER o ADMIN."""
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado")
         try:
@@ -36,12 +44,13 @@ class AdminService:
         """Crea un registro manual en admin_log."""
         return self._create_admin_log(level, message)
 
-    def list_admin_logs(self, level_filter=None):
-        """Lista logs de admin, opcional filtra por nivel."""
+    def list_admin_logs(self, level_filter=None, cursor=None, limit=None, include_total=False):
+        """Lista logs de admin, opcional filtra por nivel. Page, los más recientes primero."""
         q = AdminLog.query.filter_by(deleted=False)
         if level_filter:
             q = q.filter_by(level=level_filter)
-        return q.all()
+        return paginate(q, AdminLog.id, AdminLog.created_at, descending=True,
+                        cursor=cursor, limit=limit, include_total=include_total)
 
     def delete_admin_log(self, log_id):
         """Soft delete de un log."""
@@ -90,6 +99,9 @@ class AdminService:
         Task.query.update({Task.deleted: True})
         Habit.query.update({Habit.deleted: True})
         # Achievement.query.update({Achievement.deleted: True})
+        # Sin pasar por index(): se quitan del índice de búsqueda en bloque
+        search_index.remove_types(("task", "habit"))
+        resource_versions.bump_all_users(AGENDA, TASKS, HABITS, SEARCH)
         db.session.commit()
         self._create_admin_log("ERROR", "Reset global de datos aplicado.")
         return {"message": "Datos globales reseteados (soft delete)."}
@@ -1,17 +1,39 @@
+from app import db
+from calendar import monthrange
 from datetime import datetime, timedelta, date
 from app.models.task import Task
 from app.models.habit import Habit
 from app.models.project import Project
 from app.models.zone import Zone
+from app.models.agenda_feed_token import AgendaFeedToken
+from app.services.resource_version_service import ResourceVersionService, AGENDA
+from app.utils.recurrence import RECURRING, DEFAULT_ANCHOR, is_recurring, cached_occurrences, rrule
+from app.utils.ics import CRLF, all_day_event
+import secrets
+from sqlalchemy import Date, String, and_, cast, literal, null, or_, select, union_all
+resource_versions = ResourceVersionService()
+
+# Cambiar si cambia el formato del feed ICS (invalida los ETag ya emitidos)
+FEED_FORMAT = 1
+ICS_HEADER = (
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//IterPolaris Agenda//EN",
+    "CALSCALE:GREGORIAN",
+    "METHOD:PUBLISH",
+)
 
 class AgendaService:
-    def get_agenda_data(self, user_id, period, ref_date_str, zone_id, included_types):
+    def get_agenda_data(self, user_id, period, ref_date_str, zone_id, included_types, version=None):
         """
-        Combina tareas, hábitos y proyectos según los parámetros.
-        - period: "daily", "weekly", "monthly"
+        Combina tareas, hábitos y proyectos según los parámetros. Los hábitos
+        (frequency) y las tareas cíclicas (cycle DAILY/WEEKLY/MONTHLY/YEARLY)
+        se expanden en una entrada por ocurrencia dentro del rango, con "date".
+        - period: "daily", "weekly" (semana ISO, de lunes a domingo), "monthly" (mes natural)
         - ref_date_str: fecha de referencia ("YYYY-MM-DD"); si None, usar hoy
         - zone_id: filtra objetos asociados a una zona específica (si se desea)
         - included_types: lista con "task", "habit", "project"
+        - version: versión AGENDA ya leída (p.ej. para el ETag); si None, se consulta
 
         Retorna un dict con la información consolidada:
         {
@@ -25,11 +47,15 @@ class AgendaService:
                   "name": ...,
                   "start_date": ...,
                   "end_date": ...,
-                  "zone_id": ...
+                  "zone_id": ...,
+                  "zone_name": ...,
+                  "date": ...      # solo ocurrencias de hábitos / tareas cíclicas
               },
               ...
           ]
         }
+        Todas las tareas, hábitos y proyectos del rango (con su zona) se
+        leen en una sola consulta UNION ALL, sin cargas perezosas por fila.
         """
         # 1) Determinar start_date y end_date según period
         today = date.today()
@@ -40,87 +66,14 @@ class AgendaService:
                 ref_date = today
         else:
             ref_date = today
+        start_date, end_date = self.period_window(period, ref_date)
 
-        if period == 'weekly':
-            # supongamos que la "semana" inicia en ref_date (lunes, etc.)
-            start_date = ref_date
-            end_date = ref_date + timedelta(days=6)
-        elif period == 'monthly':
-            # mes completo a partir del 1 del mes de ref_date
-            start_date = ref_date.replace(day=1)
-            # día 1 + 30 días (aprox, no calculamos meses de 28/29/31 exacto)
-            end_date = start_date + timedelta(days=30)
-        else:
-            # daily por defecto
-            start_date = ref_date
-            end_date = ref_date
-
-        # 2) Recolectar items
-        items = []
-
-        # TAREAS
-        if 'task' in included_types:
-            q_task = Task.query.filter_by(user_id=user_id, deleted=False)
-            # Filtro por fecha (si la tarea tiene start_date/end_date):
-            q_task = q_task.filter(Task.end_date >= start_date, Task.start_date <= end_date)
-            if zone_id:
-                # Filtramos por tasks que estén en un proyecto con zone_id
-                q_task = q_task.join(Project).filter(Project.zone_id == zone_id)
-
-            tasks = q_task.all()
-            for t in tasks:
-                items.append({
-                    "type": "task",
-                    "id": t.id,
-                    "name": t.name,
-                    "status": t.status,
-                    "start_date": str(t.start_date) if t.start_date else None,
-                    "end_date": str(t.end_date) if t.end_date else None,
-                    "zone_id": t.project.zone_id if t.project else None
-                })
-
-        # HÁBITOS
-        if 'habit' in included_types:
-            q_habit = Habit.query.filter_by(user_id=user_id, deleted=False)
-            # No siempre un hábito tiene start_date / end_date.
-            # Para la agenda, supondremos que "siempre" aplica, 
-            # o podríamos filtrar si hay un campo "created_at" / "someDate".
-            if zone_id:
-                q_habit = q_habit.filter_by(zone_id=zone_id)
-            habits = q_habit.all()
-            # Asumimos que en una vista "weekly", 
-            # se mostrará el hábito cada día del rango, 
-            # o una vez, etc. Esto depende de la lógica.
-            for h in habits:
-                items.append({
-                    "type": "habit",
-                    "id": h.id,
-                    "name": h.name,
-                    "frequency": h.frequency,
-                    "zone_id": h.zone_id,
-                    # Podríamos expandir "proyección" de los días en que se repite, etc.
-                })
-
-        # PROYECTOS
-        if 'project' in included_types:
-            q_project = Project.query.filter_by(user_id=user_id, deleted=False)
-            # Filtrar por rango: project con end_date >= start_date
-            # y start_date <= end_date
-            q_project = q_project.filter(Project.end_date >= start_date, Project.start_date <= end_date)
-            if zone_id:
-                q_project = q_project.filter_by(zone_id=zone_id)
-
-            projects = q_project.all()
-            for p in projects:
-                items.append({
-                    "type": "project",
-                    "id": p.id,
-                    "name": p.name,
-                    "status": p.status,
-                    "start_date": str(p.start_date) if p.start_date else None,
-                    "end_date": str(p.end_date) if p.end_date else None,
-                    "zone_id": p.zone_id
-                })
+        # 2) Recolectar items: una consulta para todo y un generador que
+        # expande las ocurrencias al construir la lista final
+        if version is None:
+            version = resource_versions.get(user_id, AGENDA)
+        rows = self._agenda_rows(user_id, start_date, end_date, zone_id, included_types)
+        items = list(self._items(rows, version, start_date, end_date))
 
         # 3) Construir respuesta final
         return {
@@ -130,36 +83,218 @@ class AgendaService:
             "items": items
         }
 
-    def export_agenda_to_ics(self, agenda_data):
+    def period_window(self, period, ref_date):
         """
-        Dado un dict 'agenda_data', produce un string ICS (iCalendar)
-        básico para importar/sincronizar con Google Calendar u otros.
-        Ejemplo muy simplificado.
+        (primer día, último día) del periodo que contiene ref_date:
+        semana ISO (lunes a domingo) o mes natural (28-31 días).
         """
-        # Cabecera ICS
-        ics_lines = [
-            "BEGIN:VCALENDAR",
-            "VERSION:2.0",
-            "PRODID:-//IterPolaris Agenda//EN"
-        ]
+        if period == 'weekly':
+            start_date = ref_date - timedelta(days=ref_date.weekday())
+            return start_date, start_date + timedelta(days=6)
+        if period == 'monthly':
+            last_day = monthrange(ref_date.year, ref_date.month)[1]
+            return ref_date.replace(day=1), ref_date.replace(day=last_day)
+        # daily por defecto
+        return ref_date, ref_date
+
+    def stream_agenda_ics(self, agenda_data, dtstamp=None):
+        """
+        Generador del iCalendar de una vista de agenda (get_agenda_data),
+        línea a línea, para enviarlo en streaming. Cada ocurrencia de
+        hábito / tarea cíclica es un evento de un día.
+        """
+        dtstamp = dtstamp or datetime.utcnow()
+        yield CRLF.join(ICS_HEADER) + CRLF
 
         for item in agenda_data.get("items", []):
             uid = f"{item['type']}-{item['id']}@iterpolaris"
-            summary = f"{item['type'].capitalize()}: {item['name']}"
             start = item.get("start_date") or agenda_data["start_date"]
             end = item.get("end_date") or agenda_data["end_date"]
-            # ICS requiere formato "YYYYMMDDT000000Z" en UTC, 
-            # pero haremos un ejemplo sencillo sin TZ
-            start_ics = start.replace('-', '')  # "20230710"
-            end_ics = end.replace('-', '')      # "20230715"
-            ics_lines.append("BEGIN:VEVENT")
-            ics_lines.append(f"UID:{uid}")
-            ics_lines.append(f"SUMMARY:{summary}")
-            ics_lines.append(f"DTSTART;VALUE=DATE:{start_ics}")
-            ics_lines.append(f"DTEND;VALUE=DATE:{end_ics}")
-            ics_lines.append("END:VEVENT")
-
-        # Cierre ICS
-        ics_lines.append("END:VCALENDAR")
-
-        return "\r\n".join(ics_lines)
+            if item.get("date"):
+                # ocurrencia de un hábito / tarea cíclica
+                uid = f"{item['type']}-{item['id']}-{item['date']}@iterpolaris"
+                start = end = item["date"]
+            yield all_day_event(
+                uid, f"{item['type'].capitalize()}: {item['name']}",
+                self._parse_date(start), self._parse_date(end), dtstamp,
+                description=f"Zona: {item['zone_name']}" if item.get("zone_name") else None
+            )
+
+        yield "END:VCALENDAR" + CRLF
+
+    def stream_feed_ics(self, user_id, dtstamp=None):
+        """
+        Generador del feed de suscripción: todas las tareas y proyectos con
+        fechas y todos los hábitos activos del usuario, sin ventana. Los
+        hábitos y tareas cíclicas van como un evento con RRULE (no copias
+        expandidas). Las filas se leen en streaming de una sola consulta.
+        """
+        dtstamp = dtstamp or datetime.utcnow()
+        yield CRLF.join(ICS_HEADER + ("X-WR-CALNAME:IterPolaris",)) + CRLF
+
+        stmt = self._agenda_query(user_id, None, None, None, ("task", "habit", "project"))
+        for row in db.session.execute(stmt.execution_options(yield_per=500)):
+            event = self._feed_event(row, dtstamp)
+            if event:
+                yield event
+
+        yield "END:VCALENDAR" + CRLF
+
+    def feed_version(self, user_id):
+        """
+        (etag, last_modified) del feed del usuario, a partir de su versión AGENDA.
+        """
+        version, updated_at = resource_versions.get_with_time(user_id, AGENDA)
+        return f"agenda-{user_id}-{version}-{FEED_FORMAT}", updated_at
+
+    def get_feed_token(self, user_id, rotate=False):
+        """
+        Token de la URL de suscripción del usuario (se crea la primera vez;
+        con rotate=True se genera uno nuevo y el anterior deja de valer).
+        """
+        feed = AgendaFeedToken.query.filter_by(user_id=user_id).first()
+        if feed and not rotate:
+            return feed.token
+        if not feed:
+            feed = AgendaFeedToken(user_id=user_id)
+            db.session.add(feed)
+        feed.token = secrets.token_urlsafe(32)
+        feed.created_at = datetime.utcnow()
+        db.session.commit()
+        return feed.token
+
+    def user_for_feed_token(self, token):
+        feed = AgendaFeedToken.query.filter_by(token=token).first() if token else None
+        if not feed:
+            raise Exception("Token de calendario no válido.")
+        return feed.user_id
+
+    # ---- PRIVADOS ----
+    def _agenda_rows(self, user_id, start_date, end_date, zone_id, included_types):
+        stmt = self._agenda_query(user_id, start_date, end_date, zone_id, included_types)
+        return db.session.execute(stmt).all() if stmt is not None else []
+
+    def _agenda_query(self, user_id, start_date, end_date, zone_id, included_types):
+        """
+        Tareas, hábitos y proyectos del rango en un solo UNION ALL, con el
+        nombre de su zona (la de la tarea es la de su proyecto).
+        Sin rango (start_date None) => todos.
+        """
+        selects = []
+
+        # TAREAS: solapan con el rango, o son cíclicas, ya han empezado y no han terminado
+        if 'task' in included_types:
+            project = Project.__table__.alias("task_project")
+            q = select(
+                literal("task").label("type"), literal(0).label("kind_order"),
+                Task.id, Task.name, Task.status, Task.start_date, Task.end_date,
+                Task.cycle.label("recurrence"), Task.active,
+                project.c.zone_id.label("zone_id"), Zone.name.label("zone_name")
+            ).select_from(Task.__table__) \
+                .outerjoin(project, project.c.id == Task.project_id) \
+                .outerjoin(Zone, Zone.id == project.c.zone_id) \
+                .where(Task.user_id == user_id, Task.deleted == False)
+            if start_date:
+                q = q.where(or_(
+                    and_(Task.end_date >= start_date, Task.start_date <= end_date),
+                    and_(
+                        Task.cycle.in_(RECURRING),
+                        or_(Task.start_date == None, Task.start_date <= end_date),
+                        or_(Task.end_date == None, Task.end_date >= start_date)
+                    )
+                ))
+            if zone_id:
+                q = q.where(project.c.zone_id == zone_id)
+            selects.append(q)
+
+        # HÁBITOS: no tienen fechas, aplican siempre
+        if 'habit' in included_types:
+            q = select(
+                literal("habit").label("type"), literal(1).label("kind_order"),
+                Habit.id, Habit.name, cast(null(), String(20)).label("status"),
+                cast(null(), Date).label("start_date"), cast(null(), Date).label("end_date"),
+                Habit.frequency.label("recurrence"), Habit.active,
+                Habit.zone_id.label("zone_id"), Zone.name.label("zone_name")
+            ).select_from(Habit.__table__) \
+                .outerjoin(Zone, Zone.id == Habit.zone_id) \
+                .where(Habit.user_id == user_id, Habit.deleted == False)
+            if zone_id:
+                q = q.where(Habit.zone_id == zone_id)
+            selects.append(q)
+
+        # PROYECTOS: solapan con el rango
+        if 'project' in included_types:
+            q = select(
+                literal("project").label("type"), literal(2).label("kind_order"),
+                Project.id, Project.name, Project.status, Project.start_date, Project.end_date,
+                cast(null(), String(20)).label("recurrence"), null().label("active"),
+                Project.zone_id.label("zone_id"), Zone.name.label("zone_name")
+            ).select_from(Project.__table__) \
+                .outerjoin(Zone, Zone.id == Project.zone_id) \
+                .where(Project.user_id == user_id, Project.deleted == False)
+            if start_date:
+                q = q.where(Project.end_date >= start_date, Project.start_date <= end_date)
+            if zone_id:
+                q = q.where(Project.zone_id == zone_id)
+            selects.append(q)
+
+        if not selects:
+            return None
+        union = union_all(*selects).subquery()
+        return select(union).order_by(union.c.kind_order, union.c.id)
+
+    def _items(self, rows, version, start_date, end_date):
+        for row in rows:
+            item = {
+                "type": row.type,
+                "id": row.id,
+                "name": row.name,
+                "zone_id": row.zone_id,
+                "zone_name": row.zone_name
+            }
+            if row.type == "habit":
+                item["frequency"] = row.recurrence
+            else:
+                item["status"] = row.status
+                item["start_date"] = str(row.start_date) if row.start_date else None
+                item["end_date"] = str(row.end_date) if row.end_date else None
+
+            if row.type == "project" or not is_recurring(row.recurrence):
+                yield item
+                continue
+
+            if row.type == "task":
+                # Tarea cíclica: se repite desde start_date hasta end_date (si lo tiene)
+                item["cycle"] = row.recurrence
+                anchor, until = row.start_date or DEFAULT_ANCHOR, row.end_date
+            elif row.active is False:
+                continue
+            else:
+                anchor, until = DEFAULT_ANCHOR, None
+            for day in cached_occurrences(row.type, row.id, version, row.recurrence.upper(), anchor,
+                                          start_date, end_date, until):
+                yield dict(item, date=str(day))
+
+    def _feed_event(self, row, dtstamp):
+        uid = f"{row.type}-{row.id}@iterpolaris"
+        summary = f"{row.type.capitalize()}: {row.name}"
+        description = f"Zona: {row.zone_name}" if row.zone_name else None
+
+        if row.type != "project" and is_recurring(row.recurrence):
+            if row.type == "habit":
+                if row.active is False:
+                    return None
+                anchor, until = DEFAULT_ANCHOR, None
+            else:
+                anchor, until = row.start_date or DEFAULT_ANCHOR, row.end_date
+            return all_day_event(uid, summary, anchor, anchor, dtstamp,
+                                 rrule=rrule(row.recurrence, anchor, until), description=description)
+
+        # Sin repetición: solo si tiene fechas (los hábitos no tienen)
+        start = row.start_date or row.end_date
+        if not start:
+            return None
+        return all_day_event(uid, summary, start, row.end_date or start, dtstamp, description=description)
+
+    def _parse_date(self, value):
+        return value if isinstance(value, date) else datetime.strptime(value, "%Y-%m-%d").date()
@@ -1,9 +1,15 @@
 from app import db
 from app.models.effect import Effect
 from app.models.user import User
+from app.models.user_effects import UserEffects
+from app.utils.counters import increment_columns
+from app.services.resource_version_service import ResourceVersionService, HABITS, STATS
 from datetime import datetime, timedelta
+from sqlalchemy import func
 import json
 
+resource_versions = ResourceVersionService()
+
 class EffectService:
 
     def get_all_effects(self):
@@ -61,30 +67,43 @@ class EffectService:
 
         # ----------------------- LÓGICA DE CADA EFFECT ------------------------
 
+def _user_effects(user):
+    """
+    Los flags y temporizadores de efectos viven en UserEffects (1:1 con User);
+    se crea la fila la primera vez que el usuario recibe un efecto.
+    """
+    if user.user_effects is None:
+        user.user_effects = UserEffects(user_id=user.id)
+    return user.user_effects
+
 def _apply_energy_boost(user, context):
-    user.energy += 10
+    increment_columns(user, {"energy": 10})
+    resource_versions.bump(user.id, STATS)
     db.session.commit()
 
 def _apply_energy_reduction(user, context):
-    user.energy -= 15
+    increment_columns(user, {"energy": -15})
+    resource_versions.bump(user.id, STATS)
     db.session.commit()
 
 def _apply_double_energy_next(user, context):
     # Activa la bandera que duplicará la energía en la siguiente tarea/hábito
-    user.double_energy_next_active = True
+    _user_effects(user).double_energy_next_active = True
     db.session.commit()
 
 def _apply_xp_multiplier_daily(user, context):
     # Multiplica la XP en 1.5 hasta hoy a las 23:59 (o 24h)
     now = datetime.utcnow()
     end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-    user.xp_multiplier = 1.5
-    user.xp_multiplier_expires = end_of_day
+    effects = _user_effects(user)
+    effects.xp_multiplier = 1.5
+    effects.xp_multiplier_expires = end_of_day
     db.session.commit()
 
 def _apply_discount_store(user, context):
-    user.store_discount_active = True
-    user.store_discount_value = 0.2  # 20%
+    effects = _user_effects(user)
+    effects.store_discount_active = True
+    effects.store_discount_value = 0.2  # 20%
     db.session.commit()
 
 def _apply_habit_autocomplete(user, context):
@@ -97,78 +116,80 @@ def _apply_habit_autocomplete(user, context):
     if not habit:
         raise Exception("Hábito no encontrado o no pertenece al usuario")
     # Marcamos como completado
-    habit.streak += 1
-    habit.total_check += 1
+    increment_columns(habit, {"streak": 1, "total_check": 1})
+    resource_versions.bump(user.id, HABITS)
     db.session.commit()
     # Podrías invocar log_service, xp, etc., si fuese coherente con tu HabitService.
 
 def _apply_project_energy_boost(user, context):
     from app.models.project import Project
-    projects = Project.query.filter_by(user_id=user.id, deleted=False, status="ACTIVE").all()
-    for p in projects:
-        if p.energy is None:
-            p.energy = 0
-        p.energy += 10
+    # Un solo UPDATE para todos los proyectos activos
+    Project.query.filter_by(user_id=user.id, deleted=False, status="ACTIVE") \
+        .update({Project.energy: func.coalesce(Project.energy, 0) + 10}, synchronize_session=False)
     db.session.commit()
 
 def _apply_skip_penalty(user, context):
     # Anula penalizaciones hasta el final del día
     now = datetime.utcnow()
     end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=999999)
-    user.skip_penalty_active = True
-    user.skip_penalty_expires = end_of_day
+    effects = _user_effects(user)
+    effects.skip_penalty_active = True
+    effects.skip_penalty_expires = end_of_day
     db.session.commit()
 
 def _apply_skip_penalty_user(user, context):
     # Restaura la racha de login en 1. (o a su valor anterior si lo guardaste)
-    user.login_streak += 1
+    increment_columns(user, {"login_streak": 1})
+    resource_versions.bump(user.id, STATS)
     db.session.commit()
 
 def _apply_shield_energy_loss(user, context):
-    user.shield_energy_loss_until = datetime.utcnow() + timedelta(days=3)
+    _user_effects(user).shield_energy_loss_until = datetime.utcnow() + timedelta(days=3)
     db.session.commit()
 
 def _apply_double_rewards_week(user, context):
-    user.double_rewards_until = datetime.utcnow() + timedelta(days=7)
+    _user_effects(user).double_rewards_until = datetime.utcnow() + timedelta(days=7)
     db.session.commit()
 
 def _apply_zone_energy_protection(user, context):
     """
     Reduce 50% la pérdida de energía en 'zone_id' por 7 días.
-    Guardamos la info en user.zone_effects_json => 'energy_protection'
+    Guardamos la info en UserEffects.zone_effects_json => 'energy_protection'
     """
     zone_id = context.get("zone_id")
     if not zone_id:
         raise Exception("No se indicó zone_id en context para zone_energy_protection.")
+    effects = _user_effects(user)
     data = {}
-    if user.zone_effects_json:
-        data = json.loads(user.zone_effects_json)
+    if effects.zone_effects_json:
+        data = json.loads(effects.zone_effects_json)
     if "energy_protection" not in data:
         data["energy_protection"] = {}
     data["energy_protection"][str(zone_id)] = {
         "expires": (datetime.utcnow() + timedelta(days=7)).isoformat(),
         "value": 0.5
     }
-    user.zone_effects_json = json.dumps(data)
+    effects.zone_effects_json = json.dumps(data)
     db.session.commit()
 
 def _apply_coin_multiplier_zone(user, context):
     """
-    25% más monedas en la zona dada, guardado en zone_effects_json => 'coin_multiplier'
+    25% más monedas en la zona dada, guardado en UserEffects.zone_effects_json => 'coin_multiplier'
     """
     zone_id = context.get("zone_id")
     if not zone_id:
         raise Exception("No se indicó zone_id en context para coin_multiplier_zone.")
+    effects = _user_effects(user)
     data = {}
-    if user.zone_effects_json:
-        data = json.loads(user.zone_effects_json)
+    if effects.zone_effects_json:
+        data = json.loads(effects.zone_effects_json)
     if "coin_multiplier" not in data:
         data["coin_multiplier"] = {}
     data["coin_multiplier"][str(zone_id)] = {
         "expires": (datetime.utcnow() + timedelta(days=7)).isoformat(),
         "value": 1.25
     }
-    user.zone_effects_json = json.dumps(data)
+    effects.zone_effects_json = json.dumps(data)
     db.session.commit()
 
 def _apply_gear_auto_repair(user, context):
@@ -191,7 +212,7 @@ def _apply_no_habit_loss_weekend(user, context):
     Activamos un flag hasta 7 días después
     (o solo hasta el siguiente fin de semana, ajusta a tu gusto).
     """
-    user.no_habit_loss_weekend_expires = datetime.utcnow() + timedelta(days=7)
+    _user_effects(user).no_habit_loss_weekend_expires = datetime.utcnow() + timedelta(days=7)
     db.session.commit()
 
 def _apply_stackable_energy_bonus(user, context):
@@ -199,9 +220,10 @@ def _apply_stackable_energy_bonus(user, context):
     Cada vez que completes un hábito, +1 de energía acumulativa
     durante 12h. Se reinicia si fallas uno.
     """
-    user.stackable_energy_active = True
-    user.stackable_energy_expires = datetime.utcnow() + timedelta(hours=12)
-    user.stackable_energy_count = 0  # empieza en 0, se incrementará al completar cada hábito
+    effects = _user_effects(user)
+    effects.stackable_energy_active = True
+    effects.stackable_energy_expires = datetime.utcnow() + timedelta(hours=12)
+    effects.stackable_energy_count = 0  # empieza en 0, se incrementará al completar cada hábito
     db.session.commit()
 
 def _apply_daily_first_completion_bonus(user, context):
@@ -210,9 +232,10 @@ def _apply_daily_first_completion_bonus(user, context):
     Lo activamos con daily_first_completion_active = True,
     y reseteamos la fecha actual.
     """
-    user.daily_first_completion_active = True
-    user.daily_first_completion_date = datetime.utcnow().date()
-    user.daily_first_completion_used = False
+    effects = _user_effects(user)
+    effects.daily_first_completion_active = True
+    effects.daily_first_completion_date = datetime.utcnow().date()
+    effects.daily_first_completion_used = False
     db.session.commit()
 
 def _apply_placebo(user, context):
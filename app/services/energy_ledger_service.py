@@ -0,0 +1,99 @@
+from app import db
+from app.models.log_entry import LogEntry
+from app.models.zone import Zone
+from app.models.user_energy_ledger import UserEnergyLedger
+from app.models.zone_energy_ledger import ZoneEnergyLedger
+from datetime import date, timedelta
+from sqlalchemy import func
+from app.utils.counters import increment_or_insert
+from app.utils.date_utils import to_date
+
+# Ventana de la barra de energía: mismos días que el cálculo original (hoy - 7)
+ENERGY_WINDOW_DAYS = 7
+
+class EnergyLedgerService:
+    """
+    Mantiene un libro diario de energía (por usuario y por zona) para que el
+    balance de los últimos 7 días sea una lectura de ~8 filas en lugar de
+    recorrer todos los LogEntries.
+
+    Los métodos record_* NO hacen commit: se ejecutan dentro de la misma
+    transacción que el LogEntry que los origina.
+    """
+
+    def record_log(self, log_entry):
+        """
+        Suma la energía de un LogEntry recién creado al libro.
+        """
+        self._apply(log_entry.user_id, log_entry.zone_id,
+                    log_entry.end_timestamp, log_entry.energy or 0)
+
+    def revert_log(self, log_entry):
+        """
+        Resta la energía de un LogEntry que se borra (lógicamente).
+        """
+        self._apply(log_entry.user_id, log_entry.zone_id,
+                    log_entry.end_timestamp, -(log_entry.energy or 0))
+
+    def get_user_balance(self, user_id):
+        start_date = date.today() - timedelta(days=ENERGY_WINDOW_DAYS)
+        total = db.session.query(func.coalesce(func.sum(UserEnergyLedger.energy), 0)).filter(
+            UserEnergyLedger.user_id == user_id,
+            UserEnergyLedger.day >= start_date
+        ).scalar()
+        return int(total)
+
+    def get_zone_balance(self, zone_id):
+        start_date = date.today() - timedelta(days=ENERGY_WINDOW_DAYS)
+        total = db.session.query(func.coalesce(func.sum(ZoneEnergyLedger.energy), 0)).filter(
+            ZoneEnergyLedger.zone_id == zone_id,
+            ZoneEnergyLedger.day >= start_date
+        ).scalar()
+        return int(total)
+
+    def rebuild(self, user_id=None):
+        """
+        Reconstruye el libro a partir de log_entry (todas las filas o solo las
+        de un usuario). Útil tras cargas manuales o si se sospecha de deriva.
+        Retorna cuántas filas de usuario y de zona se han generado.
+        """
+        user_q = UserEnergyLedger.query
+        zone_q = ZoneEnergyLedger.query
+        if user_id is not None:
+            user_q = user_q.filter(UserEnergyLedger.user_id == user_id)
+            zone_ids = db.session.query(Zone.id).filter(Zone.user_id == user_id)
+            zone_q = zone_q.filter(ZoneEnergyLedger.zone_id.in_(zone_ids))
+        user_q.delete(synchronize_session=False)
+        zone_q.delete(synchronize_session=False)
+
+        energy_sum = func.sum(func.coalesce(LogEntry.energy, 0))
+        filters = [LogEntry.deleted == False, LogEntry.end_timestamp != None]
+        if user_id is not None:
+            filters.append(LogEntry.user_id == user_id)
+
+        user_rows = db.session.query(LogEntry.user_id, LogEntry.end_timestamp, energy_sum) \
+            .filter(*filters) \
+            .group_by(LogEntry.user_id, LogEntry.end_timestamp).all()
+        zone_rows = db.session.query(LogEntry.zone_id, LogEntry.end_timestamp, energy_sum) \
+            .filter(*filters, LogEntry.zone_id != None) \
+            .group_by(LogEntry.zone_id, LogEntry.end_timestamp).all()
+
+        db.session.bulk_insert_mappings(UserEnergyLedger, [
+            {"user_id": uid, "day": day, "energy": int(total)} for uid, day, total in user_rows
+        ])
+        db.session.bulk_insert_mappings(ZoneEnergyLedger, [
+            {"zone_id": zid, "day": day, "energy": int(total)} for zid, day, total in zone_rows
+        ])
+        db.session.commit()
+
+        return {"user_rows": len(user_rows), "zone_rows": len(zone_rows)}
+
+    # ---- MÉTODOS PRIVADOS ----
+    def _apply(self, user_id, zone_id, day, delta):
+        day = to_date(day)
+        if day is None or not delta:
+            return
+        increment_or_insert(UserEnergyLedger, {"user_id": user_id, "day": day}, {"energy": delta})
+        if zone_id is not None:
+            increment_or_insert(ZoneEnergyLedger, {"zone_id": zone_id, "day": day}, {"energy": delta})
+
@@ -1,8 +1,74 @@
 from app import db
 from app.models.global_achievement import GlobalAchievement
 from app.models.user_global_achievement import UserGlobalAchievement
-from app.models.user import User
+from app.services.achievement_counter_service import AchievementCounterService, COUNTER_TYPES
+from app.utils.principal import get_user
+from app.utils.metrics import ACHIEVEMENT_EVALUATIONS, ACHIEVEMENTS_GRANTED
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from collections import namedtuple
+import threading
+import time
+
+# Eventos a los que reacciona cada condition_type. Un evento que no aparece
+# aquí (p.ej. HABIT_DELETED) no evalúa ninguna regla.
+CONDITION_EVENTS = {
+    "TASKS_COMPLETED": ("TASK_COMPLETED",),
+    "JOURNAL_ENTRIES": ("JOURNAL_ENTRY_CREATED",),
+    "HABIT_CHECKS": ("HABIT_COMPLETED",),
+    "HABIT_STREAK": ("HABIT_COMPLETED",),
+    "LOGIN_STREAK": ("USER_LOGIN",),
+    "SURPRISE": ("TASK_COMPLETED", "USER_LOGIN"),
+}
+
+# Segundos que otro proceso puede tardar en ver un cambio del catálogo
+CATALOG_TTL_SECONDS = 60
+
+# Copia ligera (no ORM) de un GlobalAchievement para el índice en memoria
+AchievementRule = namedtuple("AchievementRule", "id name condition_type threshold")
+
+class AchievementIndex:
+    """
+    Índice en memoria {evento: [AchievementRule]} del catálogo de logros.
+    Se recarga de la BD si se invalida (CRUD en este proceso) o si supera el TTL.
+    """
+
+    def __init__(self, ttl=CATALOG_TTL_SECONDS):
+        self.ttl = ttl
+        self._by_event = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def rules_for(self, event):
+        by_event = self._by_event
+        if by_event is None or time.monotonic() - self._loaded_at > self.ttl:
+            by_event = self._load()
+        return by_event.get(event, ())
+
+    def invalidate(self):
+        self._by_event = None
+
+    def _load(self):
+        with self._lock:
+            rows = db.session.query(
+                GlobalAchievement.id,
+                GlobalAchievement.name,
+                GlobalAchievement.condition_type,
+                GlobalAchievement.threshold
+            ).filter(GlobalAchievement.deleted == False).all()
+
+            by_event = {}
+            for row in rows:
+                rule = AchievementRule(*row)
+                for event in CONDITION_EVENTS.get(rule.condition_type, ()):
+                    by_event.setdefault(event, []).append(rule)
+
+            self._by_event = by_event
+            self._loaded_at = time.monotonic()
+            return by_event
+
+achievement_index = AchievementIndex()
+counter_service = AchievementCounterService()
 
 class GlobalAchievementService:
 
@@ -21,6 +87,7 @@ class GlobalAchievementService:
         )
         db.session.add(ach)
         db.session.commit()
+        achievement_index.invalidate()
         return ach
 
     def update_global_achievement(self, ach_id, data):
@@ -35,6 +102,7 @@ class GlobalAchievementService:
         ach.honorific_title = data.get('honorific_title', ach.honorific_title)
         ach.is_surprise = data.get('is_surprise', ach.is_surprise)
         db.session.commit()
+        achievement_index.invalidate()
         return ach
 
     def delete_global_achievement(self, ach_id):
@@ -43,6 +111,7 @@ class GlobalAchievementService:
             raise Exception("Logro global no encontrado.")
         ach.deleted = True
         db.session.commit()
+        achievement_index.invalidate()
 
     def list_global_achievements(self, only_active=True):
         q = GlobalAchievement.query
@@ -50,6 +119,34 @@ class GlobalAchievementService:
             q = q.filter_by(deleted=False)
         return q.all()
 
+    def get_user_progress(self, user_id):
+        """
+        Progreso del usuario en los logros de conteo: una consulta para el
+        catálogo, otra para los contadores y otra para los ya desbloqueados.
+        """
+        achievements = GlobalAchievement.query.filter(
+            GlobalAchievement.deleted == False,
+            GlobalAchievement.condition_type.in_(COUNTER_TYPES)
+        ).all()
+        counters = counter_service.get_counters(user_id)
+        unlocked_ids = {
+            row[0] for row in db.session.query(UserGlobalAchievement.global_achievement_id).filter(
+                UserGlobalAchievement.user_id == user_id,
+                UserGlobalAchievement.deleted == False
+            )
+        }
+        return [
+            {
+                "global_achievement_id": ga.id,
+                "name": ga.name,
+                "condition_type": ga.condition_type,
+                "threshold": ga.threshold,
+                "current_progress": counters.get(ga.condition_type, 0),
+                "unlocked": ga.id in unlocked_ids
+            }
+            for ga in achievements
+        ]
+
     # ---------------------------------------------------------------------
     #                 FUNCIONES DE EVALUACIÓN DE LOGROS
     # ---------------------------------------------------------------------
@@ -62,45 +159,81 @@ class GlobalAchievementService:
         
         - event: string que describe el suceso.
         - extra_data: dict con datos relevantes (e.g. {'task_id': 123})
+
+        Solo se revisan los logros cuyo condition_type reacciona al evento
+        (ver CONDITION_EVENTS); los ya desbloqueados se cargan en una sola
+        consulta y todos los logros nuevos se guardan en un único commit.
+        Un logro que otro proceso (otra compleción, el backfill) ha otorgado a
+        la vez se ignora: la compleción que disparó el evento ya está guardada.
+        Retorna la lista de UserGlobalAchievement creados.
         """
-        if extra_data is None:
-            extra_data = {}
+        # Copia propia: los checks guardan aquí valores calculados una sola vez
+        # por evaluación (p.ej. el nº de tareas completadas)
+        extra_data = dict(extra_data or {})
+        ACHIEVEMENT_EVALUATIONS.inc(event)
+
+        # 1) Logros que pueden reaccionar a este evento (índice en memoria)
+        rules = achievement_index.rules_for(event)
+        if not rules:
+            return []
 
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
-            return  # O lanza excepción
+            return []  # O lanza excepción
+        # Id sin tocar 'user': si la petición ya hizo commit, el objeto está
+        # expirado y leer un atributo lo recargaría
+        uid = int(user_id)
 
-        # 1) Obtener todos los logros globales que puedan aplicar (p.ej., los que no estén borrados).
-        global_achievements = GlobalAchievement.query.filter_by(deleted=False).all()
-        
-        for ga in global_achievements:
-            # 2) Revisar si el usuario ya tiene este logro
-            already_unlocked = UserGlobalAchievement.query.filter_by(
-                user_id=user_id,
-                global_achievement_id=ga.id,
-                deleted=False
-            ).first()
-
-            if already_unlocked:
-                # El usuario ya lo tiene, no hay que reevaluar
+        # 2) Logros que el usuario ya tiene, en una sola consulta. Sin filtrar
+        # deleted: cualquier fila existente choca con uq_user_global_achievement
+        unlocked_ids = {
+            row[0] for row in db.session.query(UserGlobalAchievement.global_achievement_id).filter(
+                UserGlobalAchievement.user_id == uid,
+                UserGlobalAchievement.global_achievement_id.in_([r.id for r in rules])
+            )
+        }
+
+        # 3) Contadores de progreso (logros de conteo), también en una sola consulta
+        counter_types = {r.condition_type for r in rules if r.condition_type in COUNTER_TYPES}
+        if counter_types:
+            extra_data['_counters'] = counter_service.get_counters(uid, counter_types)
+
+        # 4) Según condition_type, calcular si el usuario cumple la condición
+        granted = []
+        now = datetime.utcnow()
+        for rule in rules:
+            if rule.id in unlocked_ids:
                 continue
+            if self._check_condition_met(user, rule, event, extra_data):
+                granted.append(UserGlobalAchievement(
+                    user_id=uid,
+                    global_achievement_id=rule.id,
+                    achieved_at=now,
+                    current_progress=extra_data.get('_counters', {}).get(rule.condition_type, rule.threshold)
+                ))
 
-            # 3) Según condition_type, calcular si el usuario cumple la condición
-            if self._check_condition_met(user, ga, event, extra_data):
-                # 4) Otorgar el logro
-                new_user_ach = UserGlobalAchievement(
-                    user_id=user.id,
-                    global_achievement_id=ga.id,
-                    achieved_at=datetime.utcnow(),
-                    current_progress=ga.threshold  # O el valor exacto que tengas
-                )
-                db.session.add(new_user_ach)
+        # 5) Otorgar todos los logros en un único commit; cada uno en su
+        # savepoint para descartar solo los duplicados
+        if granted:
+            granted = [uga for uga in granted if self._insert_once(uga)]
+            db.session.commit()
+            ACHIEVEMENTS_GRANTED.inc(amount=len(granted))
+            # Podrías disparar una notificación, etc.
 
-                # (Opcional) si quieres darle al user un “title” activo
-                # user.honorific_title = ga.honorific_title
-                db.session.commit()
+        return granted
 
-                # Podrías disparar una notificación, etc.
+    def _insert_once(self, uga):
+        """
+        Inserta 'uga' en un savepoint. Retorna False (y deshace solo esa
+        inserción) si el usuario ya tiene el logro (IntegrityError por
+        uq_user_global_achievement).
+        """
+        try:
+            with db.session.begin_nested():
+                db.session.add(uga)
+        except IntegrityError:
+            return False
+        return True
 
     def _check_condition_met(self, user, ga, event, extra_data):
         """
@@ -111,8 +244,8 @@ class GlobalAchievementService:
 
         # Por simplicidad, muchas "sorpresas" encajarán en la categoría SURPRISE,
         # y se verifica la lógica según el evento o la data.
-        if cond_type == "TASKS_COMPLETED":
-            return self._check_tasks_completed(user, ga, event, extra_data)
+        if cond_type in COUNTER_TYPES:
+            return self._check_counter(user, ga, event, extra_data)
         elif cond_type == "HABIT_STREAK":
             return self._check_habit_streak(user, ga, event, extra_data)
         elif cond_type == "LOGIN_STREAK":
@@ -122,23 +255,16 @@ class GlobalAchievementService:
         # ... etc. Agrega más handlers según necesites
         return False
 
-    def _check_tasks_completed(self, user, ga, event, extra_data):
+    def _check_counter(self, user, ga, event, extra_data):
         """
-        Ejemplo: “alcanzar X tareas completadas”
-        - Se evalúa cuando event == 'TASK_COMPLETED'
-        - Contamos cuántas tareas completadas lleva el usuario en total.
+        Logros de conteo: “alcanzar X tareas completadas”, “X entradas de diario”,
+        “X checks de hábitos”... Se compara el contador del usuario (mantenido
+        al completar/crear) con el umbral, sin COUNT(*) sobre la tabla origen.
         """
-        if event != 'TASK_COMPLETED':
-            return False
-        # count tasks completadas => ver tu Task model
-        from app.models.task import Task
-        completed_count = Task.query.filter_by(
-            user_id=user.id,
-            status="COMPLETED",
-            deleted=False
-        ).count()
-
-        return completed_count >= ga.threshold
+        counters = extra_data.get('_counters')
+        if counters is None:
+            counters = extra_data['_counters'] = counter_service.get_counters(user.id)
+        return counters.get(ga.condition_type, 0) >= ga.threshold
 
     def _check_habit_streak(self, user, ga, event, extra_data):
         """
@@ -153,7 +279,9 @@ class GlobalAchievementService:
         habit_id = extra_data.get('habit_id')
         if not habit_id:
             return False
-        habit = Habit.query.filter_by(id=habit_id, deleted=False).first()
+        if '_habit' not in extra_data:
+            extra_data['_habit'] = Habit.query.filter_by(id=habit_id, deleted=False).first()
+        habit = extra_data['_habit']
         if not habit or habit.user_id != user.id:
             return False
         
@@ -196,8 +324,7 @@ class GlobalAchievementService:
                         return True
 
             # Ver si es domingo
-            day_of_week = completion_time.weekday()  # lunes=0 ... domingo=6
-            if day_of_week == 6:  # 6 => domingo
+            if completion_time and completion_time.weekday() == 6:  # lunes=0 ... domingo=6
                 if ga.name == "El Domingo No Se Trabaja":
                     return True
 
@@ -1,25 +1,31 @@
 from app import db
-from app.models.user import User
 from app.models.habit import Habit
 from app.models.zone import Zone
 from app.models.effect import Effect
 from datetime import datetime, date
-from app.services.log_service import LogService
-from app.services.stats_service import StatsService
-from app.services.zone_service import ZoneService
-zone_service = ZoneService()
-log_service = LogService()
-stats_service = StatsService()
+from app.services.reward_service import RewardService
+from app.utils.counters import increment_columns
+from app.services.achievement_counter_service import AchievementCounterService, HABIT_CHECKS
+from app.utils.principal import get_user
+from app.services.search_index_service import SearchIndexService
+from app.services.resource_version_service import ResourceVersionService, AGENDA, HABITS, STATS
+from app.utils.metrics import COMPLETIONS
+from app.utils.pagination import paginate
+counter_service = AchievementCounterService()
+reward_service = RewardService()
+search_index = SearchIndexService()
+resource_versions = ResourceVersionService()
 
 class HabitService:
 
     def get_habits_with_filters(self, user_id, active=None, frequency=None,
                                 min_energy=None, max_energy=None,
                                 start_date=None, end_date=None,
-                                energy_type=None, page=None, limit=None):
+                                energy_type=None, cursor=None, limit=None, include_total=False):
         """
         Aplica filtros sobre la tabla Habit. Todos los parámetros son opcionales.
-        Incluye paginación y filtro por energía positiva/negativa.
+        Incluye filtro por energía positiva/negativa.
+        Retorna una Page ordenada por id (ver app/utils/pagination.py).
         """
         query = Habit.query.filter_by(user_id=user_id, deleted=False)
 
@@ -56,23 +62,7 @@ class HabitService:
         #     except:
         #         pass
 
-        total = query.count()
-
-        # Paginación
-        if page and limit:
-            try:
-                page = int(page)
-                limit = int(limit)
-            except:
-                page = 1
-                limit = 10
-
-            offset = (page - 1) * limit
-            query = query.offset(offset).limit(limit)
-
-        habits = query.all()
-
-        return habits, total
+        return paginate(query, Habit.id, cursor=cursor, limit=limit, include_total=include_total)
 
     def get_habit_by_id(self, habit_id, user_id):
         h = Habit.query.filter_by(id=habit_id, deleted=False).first()
@@ -117,6 +107,8 @@ class HabitService:
             deleted=False
         )
         db.session.add(habit)
+        search_index.index("habit", habit)
+        resource_versions.bump(user_id, AGENDA, HABITS)
         db.session.commit()
         return habit
 
@@ -162,6 +154,9 @@ class HabitService:
                     raise Exception("Efecto no encontrado.")
                 h.effect_id = eff.id
 
+        search_index.index("habit", h)
+
+        resource_versions.bump(user_id, AGENDA, HABITS)
         db.session.commit()
         return h
 
@@ -174,6 +169,9 @@ class HabitService:
         deletion_time = datetime.now()
 
         h.deleted = True
+        counter_service.increment(user_id, HABIT_CHECKS, -(h.total_check or 0))
+        search_index.remove("habit", h.id, user_id)
+        resource_versions.bump(user_id, AGENDA, HABITS)
         db.session.commit()
 
         # NUEVO: Disparamos la evaluación de logros
@@ -191,62 +189,20 @@ class HabitService:
 
     def complete_habit(self, habit_id, user_id):
         h = self.get_habit_by_id(habit_id, user_id)
-        h.streak += 1
-        h.total_check += 1
-        db.session.commit()
-
-        user = User.query.filter_by(id=user_id, deleted=False).first()
-
-        # Cálculo de energía base
-        base_energy = h.energy or 0
-        final_energy = base_energy
-
-        # double_energy_next
-        if user.double_energy_next_active:
-            final_energy *= 2
-            user.double_energy_next_active = False
-
-        # stackable_energy_bonus
-        now = datetime.utcnow()
-        if user.stackable_energy_active:
-            if user.stackable_energy_expires and now <= user.stackable_energy_expires:
-                final_energy += user.stackable_energy_count
-                user.stackable_energy_count += 1
-            else:
-                user.stackable_energy_active = False
-                user.stackable_energy_count = 0
-
-        # Log
-        log_service.create_log(user_id, "HABIT", h.id, final_energy)
-        user.energy += final_energy
-
-        # Cálculo XP
-        base_xp = h.points or 0
-        xp_gained = base_xp
-        coins_gained = xp_gained
-
-        # daily_first_completion_bonus
-        today = datetime.utcnow().date()
-        if user.daily_first_completion_active:
-            if user.daily_first_completion_date == today and not user.daily_first_completion_used:
-                xp_gained *= 2
-                coins_gained *= 2
-                user.daily_first_completion_used = True
-        
-        # double_rewards_week
-        if user.double_rewards_until and now <= user.double_rewards_until:
-            xp_gained *= 2
-            coins_gained *= 2
-
-        # xp_multiplier_daily
-        if user.xp_multiplier_expires and now <= user.xp_multiplier_expires:
-            xp_gained = int(xp_gained * user.xp_multiplier)
-        
-        # Actualizar XP y coins
-        user.xp += xp_gained
-        user.coins += coins_gained
+        user = reward_service.load_user(user_id)
 
+        # Racha, contador, log, usuario y zona => una sola transacción
+        increment_columns(h, {"streak": 1, "total_check": 1})
+        counter_service.increment(user_id, HABIT_CHECKS)
+        reward_service.grant(user, "HABIT", h.id, h.energy, h.points, zone_id=h.zone_id)
+        resource_versions.bump(user_id, HABITS)
         db.session.commit()
+        COMPLETIONS.inc("habit")
+
+        from app.services.global_achievement_service import GlobalAchievementService
+        GlobalAchievementService().evaluate_achievements(user_id, event="HABIT_COMPLETED", extra_data={
+            "habit_id": h.id
+        })
 
         return h
     
@@ -294,25 +250,28 @@ class HabitService:
         Lógica de fallo de hábito, restando energía o penalizando streak.
         """
         h = self.get_habit_by_id(habit_id, user_id)
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
 
         # Si skip_penalty_active y no ha expirado
         now = datetime.utcnow()
-        if user.skip_penalty_active and user.skip_penalty_expires and now <= user.skip_penalty_expires:
+        effects = user.user_effects
+        if effects and effects.skip_penalty_active and effects.skip_penalty_expires \
+                and now <= effects.skip_penalty_expires:
             # se anula la penalización, desactivamos
-            user.skip_penalty_active = False
-            user.skip_penalty_expires = None
+            effects.skip_penalty_active = False
+            effects.skip_penalty_expires = None
             db.session.commit()
             return h  # sin penalizar
         
         # Sino, penalizamos
         # shield_energy_loss => no restar energía negativa
         energy_loss = 10
-        if user.shield_energy_loss_until and now <= user.shield_energy_loss_until:
+        if effects and effects.shield_energy_loss_until and now <= effects.shield_energy_loss_until:
             energy_loss = 0  # no pierde
 
-        user.energy -= energy_loss
+        increment_columns(user, {"energy": -energy_loss})
         # romper streak
         h.streak = 0
+        resource_versions.bump(user_id, HABITS, STATS)
         db.session.commit()
         return h
@@ -1,15 +1,18 @@
 from app import db
 from app.models.inventory_item import InventoryItem
 from app.models.gear import Gear
+from app.utils.pagination import paginate
 from datetime import datetime
 
 class InventoryService:
     def get_user_inventory(self, user_id):
         return InventoryItem.query.filter_by(user_id=user_id, deleted=False).all()
 
-    def get_user_inventory_filtered(self, user_id, gear_type, min_uses, max_uses, acquired_from, acquired_to):
+    def get_user_inventory_filtered(self, user_id, gear_type, min_uses, max_uses, acquired_from, acquired_to,
+                                    cursor=None, limit=None, include_total=False):
         """
         Aplica filtros avanzados para el inventario.
+        Retorna una Page ordenada por id (ver app/utils/pagination.py).
         """
         q = InventoryItem.query.filter_by(user_id=user_id, deleted=False)
 
@@ -36,7 +39,7 @@ class InventoryService:
             except:
                 pass
 
-        return q.all()
+        return paginate(q, InventoryItem.id, cursor=cursor, limit=limit, include_total=include_total)
 
     def get_item_by_id(self, item_id, user_id):
         item = InventoryItem.query.filter_by(id=item_id, deleted=False).first()
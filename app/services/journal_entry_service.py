@@ -4,9 +4,11 @@ from app.models.journal_entry import JournalEntry
 from datetime import date, timedelta
 from app.services.log_service import LogService
 from app.services.stats_service import StatsService
+from app.services.achievement_counter_service import AchievementCounterService, JOURNAL_ENTRIES
 
 log_service = LogService()
 stats_service = StatsService()
+counter_service = AchievementCounterService()
 
 class JournalEntryService:
     def get_entries_by_journal(self, journal_id, user_id):
@@ -59,6 +61,7 @@ class JournalEntryService:
             deleted=False
         )
         db.session.add(entry)
+        counter_service.increment(user_id, JOURNAL_ENTRIES)
         db.session.commit()
 
         log_service.create_log(user_id, "JOURNAL_ENTRY", entry.id, entry.energy)
@@ -89,4 +92,5 @@ class JournalEntryService:
     def delete_entry(self, entry_id, user_id):
         entry = self.get_entry_by_id(entry_id, user_id)
         entry.deleted = True
+        counter_service.increment(user_id, JOURNAL_ENTRIES, -1)
         db.session.commit()
@@ -1,10 +1,17 @@
 from app import db
 from app.models.journal import Journal
+from sqlalchemy.orm import selectinload
+from app.utils.pagination import paginate
 from datetime import datetime, date, timedelta
 
 
 class JournalService:
-    def get_all_journals_filtered(self, user_id, from_date, to_date, j_type):
+    def get_all_journals_filtered(self, user_id, from_date, to_date, j_type,
+                                  cursor=None, limit=None, include_total=False):
+        """
+        Diarios del usuario, los más recientes primero.
+        Retorna una Page (ver app/utils/pagination.py).
+        """
         query = Journal.query.filter_by(user_id=user_id, deleted=False)
         if j_type:
             query = query.filter_by(type=j_type)
@@ -21,7 +28,10 @@ class JournalService:
                 query = query.filter(Journal.created_at <= end)
             except:
                 pass
-        return query.all()
+        # El listado devuelve entries_ids de cada diario: una sola consulta para todos
+        query = query.options(selectinload(Journal.entries))
+        return paginate(query, Journal.id, Journal.created_at, descending=True,
+                        cursor=cursor, limit=limit, include_total=include_total)
 
     def get_journal_by_id(self, journal_id, user_id):
         j = Journal.query.filter_by(id=journal_id, deleted=False).first()
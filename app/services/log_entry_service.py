@@ -1,16 +1,25 @@
 from app import db
 from app.models.log_entry import LogEntry
 from app.models.zone import Zone
+from app.services.energy_ledger_service import EnergyLedgerService
+from app.services.log_rollup_service import LogRollupService
+from app.utils.date_utils import to_date
+from app.utils.pagination import paginate
 from datetime import date, datetime, timedelta
 
+energy_ledger_service = EnergyLedgerService()
+log_rollup_service = LogRollupService()
+
 class LogEntryService:
 
-    def get_log_entries_filtered(self, user_id, log_type, zone_id, from_date, to_date):
+    def get_log_entries_filtered(self, user_id, log_type, zone_id, from_date, to_date,
+                                 cursor=None, limit=None, include_total=False):
         """
         Aplica filtros a la lista de log entries:
           - type => LogEntry.type
           - zone_id => LogEntry.zone_id
           - date range => end_timestamp
+        Retorna una Page, las más recientes (end_timestamp) primero.
         """
         q = LogEntry.query.filter_by(user_id=user_id, deleted=False)
 
@@ -34,7 +43,8 @@ class LogEntryService:
             except:
                 pass
 
-        return q.all()
+        return paginate(q, LogEntry.id, LogEntry.end_timestamp, descending=True,
+                        cursor=cursor, limit=limit, include_total=include_total)
 
     def create_log_entry(self, data, user_id):
         zone_id = data.get('zone_id')
@@ -49,13 +59,15 @@ class LogEntryService:
             challenge_level=data.get('challenge_level'),
             type=data.get('type'),
             item_id=data.get('item_id'),
-            end_timestamp=data.get('end_timestamp', date.today()),
+            end_timestamp=to_date(data.get('end_timestamp')) or date.today(),
             energy=data.get('energy', 0),
             user_id=user_id,
             zone_id=zone_id,
             deleted=False
         )
         db.session.add(entry)
+        energy_ledger_service.record_log(entry)
+        log_rollup_service.record_log(entry)
         db.session.commit()
         return entry
 
@@ -66,58 +78,35 @@ class LogEntryService:
         if entry.user_id != user_id:
             raise Exception("No tienes acceso a este LogEntry.")
         entry.deleted = True
+        energy_ledger_service.revert_log(entry)
+        log_rollup_service.revert_log(entry)
         db.session.commit()
 
     def get_log_summary(self, user_id, range_type, days_back):
         """
-        Genera un resumen de la energía total por día o por semana en el intervalo especificado.
-        range_type: 'daily' o 'weekly'
+        Genera un resumen de la energía total por día, semana o mes en el intervalo especificado.
+        range_type: 'daily', 'weekly' o 'monthly'
         days_back: cuántos días hacia atrás contar (por defecto 7 o 30, etc.)
         
         Retorna una lista de { "label": X, "total_energy": Y } 
-        donde label puede ser la fecha o la semana representada.
+        donde label puede ser la fecha, la semana o el mes representado.
+        Se calcula sobre log_entry_rollup (una fila agregada por día).
         """
         end_date = date.today()
         start_date = end_date - timedelta(days=days_back)
-        
-        # Obtener log entries en el rango
-        logs = LogEntry.query.filter(
-            LogEntry.user_id == user_id,
-            LogEntry.deleted == False,
-            LogEntry.end_timestamp >= start_date,
-            LogEntry.end_timestamp <= end_date
-        ).all()
 
-        # Agrupar
-        summary_map = {}  # clave = label, valor = total_energy
-        if range_type == 'daily':
-            for log in logs:
-                d = log.end_timestamp.isoformat()
-                summary_map[d] = summary_map.get(d, 0) + log.energy
-            # Convertimos a lista
-            summary_list = []
-            for k in sorted(summary_map.keys()):  # ordenado por fecha
-                summary_list.append({
-                    "date": k,
-                    "total_energy": summary_map[k]
-                })
-            return {"range_type": "daily", "data": summary_list}
+        levels = {
+            'daily': ('day', 'date'),
+            'weekly': ('week', 'week'),
+            'monthly': ('month', 'month'),
+        }
+        if range_type not in levels:
+            return {"range_type": range_type, "data": []}
 
-        elif range_type == 'weekly':
-            for log in logs:
-                # Determinar la "semana del año"
-                week_label = log.end_timestamp.isocalendar()[:2]  # (year, week_number)
-                # o algo como "YYYY-WW"
-                label_str = f"{week_label[0]}-W{week_label[1]}"
-                summary_map[label_str] = summary_map.get(label_str, 0) + log.energy
-            
-            summary_list = []
-            for k in sorted(summary_map.keys()):
-                summary_list.append({
-                    "week": k,
-                    "total_energy": summary_map[k]
-                })
-            return {"range_type": "weekly", "data": summary_list}
-        
-        # si range_type no es daily o weekly, devolvemos daily por defecto
-        return {"range_type": range_type, "data": []}
+        level, label_key = levels[range_type]
+        periods = log_rollup_service.get_energy_by_period(user_id, start_date, end_date, level)
+        summary_list = [
+            {label_key: label, "total_energy": total}
+            for label, total in periods
+        ]
+        return {"range_type": range_type, "data": summary_list}
@@ -0,0 +1,148 @@
+from app import db
+from app.models.log_entry import LogEntry
+from app.models.log_entry_rollup import LogEntryRollup
+from app.utils.counters import increment_or_insert
+from app.utils.date_utils import to_date
+from datetime import timedelta
+from sqlalchemy import func
+
+class LogRollupService:
+    """
+    Mantiene log_entry_rollup (agregado diario por usuario/zona/tipo) y
+    construye a partir de él los resúmenes diarios, semanales (ISO) y mensuales,
+    de forma que un histórico de 365 días lee como mucho 366 filas agregadas.
+
+    record_log / revert_log NO hacen commit (misma transacción que el LogEntry).
+    """
+
+    def record_log(self, log_entry):
+        self._apply(log_entry, 1)
+
+    def revert_log(self, log_entry):
+        self._apply(log_entry, -1)
+
+    def get_daily_energy(self, user_id, start_date, end_date, zone_id=None, log_type=None):
+        """
+        Retorna {date: energía_total} para los días con actividad en [start_date, end_date].
+        La suma por día se hace en la BD, así que llegan como mucho (end - start + 1) filas.
+        """
+        q = db.session.query(LogEntryRollup.day, func.sum(LogEntryRollup.energy)).filter(
+            LogEntryRollup.user_id == user_id,
+            LogEntryRollup.day >= start_date,
+            LogEntryRollup.day <= end_date
+        )
+        if zone_id:
+            q = q.filter(LogEntryRollup.zone_id == int(zone_id))
+        if log_type:
+            q = q.filter(LogEntryRollup.type == log_type)
+        rows = q.group_by(LogEntryRollup.day).all()
+        return {day: int(total or 0) for day, total in rows}
+
+    def get_energy_by_period(self, user_id, start_date, end_date, level="day"):
+        """
+        Agrupa la energía diaria en el nivel pedido:
+          - "day"   => label "YYYY-MM-DD"
+          - "week"  => label "YYYY-Www" (semana ISO con dos dígitos)
+          - "month" => label "YYYY-MM"
+        Retorna una lista de (label, energía) ordenada por label.
+        """
+        daily = self.get_daily_energy(user_id, start_date, end_date)
+        grouped = {}
+        for day, energy in daily.items():
+            label = period_label(day, level)
+            grouped[label] = grouped.get(label, 0) + energy
+        return sorted(grouped.items())
+
+    def backfill(self, start_date=None, end_date=None, chunk_days=30, user_id=None, progress=None):
+        """
+        Recalcula el rollup desde log_entry por tramos de 'chunk_days' días,
+        haciendo commit al final de cada tramo. Cada tramo borra y reinserta
+        sus propios días, así que el proceso es idempotente y se puede reanudar
+        con start_date = último día procesado.
+
+        - progress: callback opcional progress(chunk_start, chunk_end, rows)
+        Retorna el total de filas de rollup generadas.
+        """
+        base = db.session.query(func.min(LogEntry.end_timestamp), func.max(LogEntry.end_timestamp)) \
+            .filter(LogEntry.deleted == False)
+        if user_id is not None:
+            base = base.filter(LogEntry.user_id == user_id)
+        min_day, max_day = base.one()
+
+        start = to_date(start_date) or to_date(min_day)
+        end = to_date(end_date) or to_date(max_day)
+        if start is None or end is None:
+            return 0
+
+        total_rows = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+            rows = self._rebuild_range(chunk_start, chunk_end, user_id)
+            db.session.commit()
+            total_rows += rows
+            if progress:
+                progress(chunk_start, chunk_end, rows)
+            chunk_start = chunk_end + timedelta(days=1)
+
+        return total_rows
+
+    # ---- MÉTODOS PRIVADOS ----
+    def _apply(self, log_entry, sign):
+        day = to_date(log_entry.end_timestamp)
+        if day is None:
+            return
+        keys = {
+            "user_id": log_entry.user_id,
+            "zone_id": log_entry.zone_id or 0,
+            "type": log_entry.type or "",
+            "day": day
+        }
+        increment_or_insert(LogEntryRollup, keys, {
+            "energy": sign * (log_entry.energy or 0),
+            "entries": sign
+        })
+
+    def _rebuild_range(self, start_date, end_date, user_id=None):
+        delete_q = LogEntryRollup.query.filter(
+            LogEntryRollup.day >= start_date,
+            LogEntryRollup.day <= end_date
+        )
+        source_q = db.session.query(
+            LogEntry.user_id,
+            func.coalesce(LogEntry.zone_id, 0),
+            func.coalesce(LogEntry.type, ""),
+            LogEntry.end_timestamp,
+            func.sum(func.coalesce(LogEntry.energy, 0)),
+            func.count(LogEntry.id)
+        ).filter(
+            LogEntry.deleted == False,
+            LogEntry.end_timestamp >= start_date,
+            LogEntry.end_timestamp <= end_date
+        )
+        if user_id is not None:
+            delete_q = delete_q.filter(LogEntryRollup.user_id == user_id)
+            source_q = source_q.filter(LogEntry.user_id == user_id)
+
+        delete_q.delete(synchronize_session=False)
+        rows = source_q.group_by(
+            LogEntry.user_id,
+            func.coalesce(LogEntry.zone_id, 0),
+            func.coalesce(LogEntry.type, ""),
+            LogEntry.end_timestamp
+        ).all()
+
+        db.session.bulk_insert_mappings(LogEntryRollup, [
+            {"user_id": uid, "zone_id": zid, "type": ltype, "day": day,
+             "energy": int(energy), "entries": int(count)}
+            for uid, zid, ltype, day, energy, count in rows
+        ])
+        return len(rows)
+
+def period_label(day, level):
+    if level == "week":
+        iso_year, iso_week = day.isocalendar()[:2]
+        return f"{iso_year}-W{iso_week:02d}"
+    if level == "month":
+        return f"{day.year}-{day.month:02d}"
+    return day.isoformat()
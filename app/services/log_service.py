@@ -1,14 +1,31 @@
 # app/services/log_service.py
 from app import db
 from app.models.log_entry import LogEntry
+from app.services.energy_ledger_service import EnergyLedgerService
+from app.services.log_rollup_service import LogRollupService
 from datetime import date
 
+energy_ledger_service = EnergyLedgerService()
+log_rollup_service = LogRollupService()
+
 class LogService:
 
-    def create_log(self, user_id, item_type, item_id, energy):
+    def create_log(self, user_id, item_type, item_id, energy, zone_id=None):
         """
         Crea un LogEntry con la energía, el día (sin hora) y 
         el tipo de ítem (TASK, HABIT, PROJECT, JOURNAL, etc.).
+        También actualiza el libro diario de energía y el rollup diario
+        en la misma transacción.
+        """
+        new_log = self.add_log(user_id, item_type, item_id, energy, zone_id=zone_id)
+        db.session.commit()
+
+        return new_log
+
+    def add_log(self, user_id, item_type, item_id, energy, zone_id=None):
+        """
+        Igual que create_log pero sin commit, para usarlo dentro de una
+        transacción mayor (p.ej. la recompensa de una compleción).
         """
         new_log = LogEntry(
             user_id=user_id,
@@ -16,9 +33,10 @@ class LogService:
             item_id=item_id,
             end_timestamp=date.today(),  # guardamos solo la fecha
             energy=energy,
+            zone_id=zone_id,
             deleted=False
         )
         db.session.add(new_log)
-        db.session.commit()
-
+        energy_ledger_service.record_log(new_log)
+        log_rollup_service.record_log(new_log)
         return new_log
@@ -1,6 +1,8 @@
 from app import db
 from app.models.material import Material, project_materials
 from app.models.project import Project
+from app.services.search_index_service import SearchIndexService
+search_index = SearchIndexService()
 
 class MaterialService:
     def get_materials_with_filters(self, user_id, mat_type=None, query=None, project_id=None):
@@ -47,6 +49,7 @@ class MaterialService:
             deleted=False
         )
         db.session.add(mat)
+        search_index.index("material", mat)
         db.session.commit()
         return mat
 
@@ -56,10 +59,12 @@ class MaterialService:
         mat.type = data.get('type', mat.type)
         mat.url = data.get('url', mat.url)
         mat.description = data.get('description', mat.description)
+        search_index.index("material", mat)
         db.session.commit()
         return mat
 
     def delete_material(self, material_id, user_id):
         mat = self.get_material_by_id(material_id, user_id)
         mat.deleted = True
+        search_index.remove("material", mat.id, user_id)
         db.session.commit()
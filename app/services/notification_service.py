@@ -1,5 +1,6 @@
 from app import db
 from app.models.notification import Notification
+from app.utils.pagination import paginate
 from datetime import datetime
 
 class NotificationService:
@@ -9,14 +10,17 @@ class NotificationService:
         """
         return Notification.query.filter_by(user_id=user_id, deleted=False).all()
 
-    def get_user_notifications_filtered(self, user_id, notif_type=None):
+    def get_user_notifications_filtered(self, user_id, notif_type=None,
+                                        cursor=None, limit=None, include_total=False):
         """
-        Versión extendida que filtra por tipo.
+        Versión extendida que filtra por tipo. Las más recientes primero.
+        Retorna una Page (ver app/utils/pagination.py).
         """
         q = Notification.query.filter_by(user_id=user_id, deleted=False)
         if notif_type:
             q = q.filter_by(type=notif_type)
-        return q.all()
+        return paginate(q, Notification.id, Notification.created_at, descending=True,
+                        cursor=cursor, limit=limit, include_total=include_total)
 
     def mark_as_read(self, notification_id, user_id):
         notif = Notification.query.filter_by(id=notification_id, deleted=False).first()
@@ -0,0 +1,141 @@
+from app import db
+from app.models.user_progress_history import UserProgressHistory
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+
+# Antigüedad a partir de la cual se compactan los puntos
+RAW_RETENTION_DAYS = 30     # más antiguos => un punto por día
+DAILY_RETENTION_DAYS = 365  # más antiguos => un punto por semana ISO
+
+TRACKED_FIELDS = ("xp", "level", "coins", "blue_gems")
+
+class ProgressHistoryService:
+    """
+    Registra la evolución de xp/level/coins/blue_gems del usuario y la sirve
+    como serie diaria para /stats/history. Los puntos antiguos se compactan
+    (downsample) para que la tabla crezca como mucho ~30 + 335 + 52/año filas
+    por usuario.
+    """
+
+    def record(self, user, source, xp_delta=0, coins_delta=0, blue_gems_delta=0, level_delta=0):
+        """
+        Añade un punto con los valores actuales de 'user' (ya actualizados) y
+        los deltas aplicados. NO hace commit: va en la transacción del llamador.
+        """
+        if not (xp_delta or coins_delta or blue_gems_delta or level_delta):
+            return None
+        # 'day' con la fecha local, como get_daily_series/downsample y el resto
+        # de series diarias (log_entry.end_timestamp); recorded_at sigue en UTC
+        point = UserProgressHistory(
+            user_id=user.id,
+            day=date.today(),
+            recorded_at=datetime.utcnow(),
+            granularity="RAW",
+            source=source,
+            xp=user.xp,
+            level=user.level,
+            coins=user.coins,
+            blue_gems=user.blue_gems,
+            xp_delta=xp_delta,
+            level_delta=level_delta,
+            coins_delta=coins_delta,
+            blue_gems_delta=blue_gems_delta
+        )
+        db.session.add(point)
+        return point
+
+    def get_daily_series(self, user_id, field, days_back, current_value=None):
+        """
+        Retorna [(date, valor)] para cada día de [hoy - days_back, hoy],
+        arrastrando el último valor conocido en los días sin cambios.
+        Lee como mucho un punto por día más un punto base anterior al rango.
+        """
+        if field not in TRACKED_FIELDS:
+            raise Exception(f"Campo de historial no soportado: {field}")
+
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days_back)
+        H = UserProgressHistory
+        value_col = getattr(H, field)
+        delta_col = getattr(H, f"{field}_delta")
+
+        last_ids = db.session.query(func.max(H.id)).filter(
+            H.user_id == user_id,
+            H.day >= start_date,
+            H.day <= end_date
+        ).group_by(H.day)
+        rows = db.session.query(H.day, value_col, delta_col) \
+            .filter(H.id.in_(last_ids)).order_by(H.day).all()
+
+        baseline = db.session.query(value_col).filter(
+            H.user_id == user_id,
+            H.day < start_date
+        ).order_by(H.day.desc(), H.id.desc()).first()
+
+        if baseline is not None:
+            value = baseline[0]
+        elif rows:
+            # Sin puntos previos: el valor inicial es el del primer punto menos su delta
+            # (no es exacto si el primer punto es un resumen DAY/WEEK con varios cambios).
+            value = rows[0][1] - (rows[0][2] or 0)
+        else:
+            value = current_value
+
+        by_day = {day: val for day, val, _ in rows}
+        series = []
+        for i in range(days_back + 1):
+            current_d = start_date + timedelta(days=i)
+            value = by_day.get(current_d, value)
+            series.append((current_d, value))
+        return series
+
+    def downsample(self, user_id=None, today=None):
+        """
+        Compacta el historial:
+          - RAW con más de 30 días => un punto DAY por día
+          - DAY con más de 365 días => un punto WEEK por semana ISO
+        El punto que se conserva es el último del grupo (su foto es el valor al
+        cierre del periodo) y acumula los deltas de todo el grupo.
+        Retorna cuántas filas se han eliminado.
+        """
+        today = today or date.today()
+        removed = self._collapse(
+            user_id, "RAW", "DAY",
+            today - timedelta(days=RAW_RETENTION_DAYS),
+            lambda p: p.day
+        )
+        removed += self._collapse(
+            user_id, "DAY", "WEEK",
+            today - timedelta(days=DAILY_RETENTION_DAYS),
+            lambda p: p.day.isocalendar()[:2]
+        )
+        db.session.commit()
+        return removed
+
+    # ---- MÉTODOS PRIVADOS ----
+    def _collapse(self, user_id, from_granularity, to_granularity, cutoff, bucket_key):
+        H = UserProgressHistory
+        q = H.query.filter(H.granularity == from_granularity, H.day < cutoff)
+        if user_id is not None:
+            q = q.filter(H.user_id == user_id)
+        points = q.order_by(H.user_id, H.day, H.id).all()
+
+        groups = {}
+        for p in points:
+            groups.setdefault((p.user_id, bucket_key(p)), []).append(p)
+
+        to_delete = []
+        for group in groups.values():
+            keeper = group[-1]
+            for p in group[:-1]:
+                keeper.xp_delta = (keeper.xp_delta or 0) + (p.xp_delta or 0)
+                keeper.level_delta = (keeper.level_delta or 0) + (p.level_delta or 0)
+                keeper.coins_delta = (keeper.coins_delta or 0) + (p.coins_delta or 0)
+                keeper.blue_gems_delta = (keeper.blue_gems_delta or 0) + (p.blue_gems_delta or 0)
+                to_delete.append(p.id)
+            keeper.granularity = to_granularity
+            keeper.source = None
+
+        for i in range(0, len(to_delete), 500):
+            H.query.filter(H.id.in_(to_delete[i:i + 500])).delete(synchronize_session=False)
+        return len(to_delete)
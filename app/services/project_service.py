@@ -1,21 +1,26 @@
 from app import db
+from sqlalchemy.orm import selectinload
 from app.models.project import Project
 from app.models.material import Material
 from app.models.habit import Habit
 from app.models.task import Task
 from datetime import datetime, date
-from app.services.log_service import LogService
-from app.services.stats_service import StatsService
-from app.services.zone_service import ZoneService
-zone_service = ZoneService()
-log_service = LogService()
-stats_service = StatsService()
+from app.services.reward_service import RewardService
+from app.services.search_index_service import SearchIndexService
+from app.services.resource_version_service import ResourceVersionService, AGENDA, TASKS
+from app.utils.pagination import paginate
+from app.utils.metrics import COMPLETIONS
+reward_service = RewardService()
+search_index = SearchIndexService()
+resource_versions = ResourceVersionService()
 
 class ProjectService:
     def get_projects_with_filters(self, user_id, zone_id=None, status=None,
-                                  priority=None, start_date=None, end_date=None):
+                                  priority=None, start_date=None, end_date=None,
+                                  cursor=None, limit=None, include_total=False):
         """
         Filtra proyectos según los parámetros proporcionados.
+        Retorna una Page ordenada por id (ver app/utils/pagination.py).
         """
         query = Project.query.filter_by(user_id=user_id, deleted=False)
 
@@ -41,7 +46,9 @@ class ProjectService:
             except:
                 pass
 
-        return query.all()
+        # El listado devuelve materials_ids de cada proyecto: una sola consulta para todos
+        query = query.options(selectinload(Project.materials))
+        return paginate(query, Project.id, cursor=cursor, limit=limit, include_total=include_total)
 
     def get_project_by_id(self, project_id, user_id):
         prj = Project.query.filter_by(id=project_id, deleted=False).first()
@@ -84,6 +91,9 @@ class ProjectService:
             if hb and hb.user_id == user_id:
                 prj.habits.append(hb)
 
+        search_index.index("project", prj)
+
+        resource_versions.bump(user_id, AGENDA)
         db.session.commit()
         return prj
 
@@ -100,6 +110,7 @@ class ProjectService:
         prj.color = data.get('color', prj.color)
         prj.status = data.get('status', prj.status)
         prj.priority = data.get('priority', prj.priority)
+        old_zone_id = prj.zone_id
         prj.zone_id = data.get('zone_id', prj.zone_id)
 
         if 'materials_ids' in data:
@@ -116,12 +127,21 @@ class ProjectService:
                 if hb and hb.user_id == user_id:
                     prj.habits.append(hb)
 
+        search_index.index("project", prj)
+
+        # GET /tasks?zone_id= filtra por la zona del proyecto
+        if prj.zone_id != old_zone_id:
+            resource_versions.bump(user_id, AGENDA, TASKS)
+        else:
+            resource_versions.bump(user_id, AGENDA)
         db.session.commit()
         return prj
 
     def delete_project(self, project_id, user_id):
         prj = self.get_project_by_id(project_id, user_id)
         prj.deleted = True
+        search_index.remove("project", prj.id, user_id)
+        resource_versions.bump(user_id, AGENDA, TASKS)
         db.session.commit()
 
     def get_project_progress(self, project_id, user_id):
@@ -156,16 +176,15 @@ class ProjectService:
         }
     def complete_project(self, project_id, user_id):
         p = self.get_project_by_id(project_id, user_id)
-        p.status = "COMPLETED"
-        db.session.commit()
+        if p.status == "COMPLETED":
+            return p
 
-        log_service.create_log(user_id, "PROJECT", p.id, p.points or 0)
+        user = reward_service.load_user(user_id)
 
-        xp_gained = p.points or 0
-        coins_gained = xp_gained
-
-        if p.zone_id:
-            zone_service.add_xp_to_zone(p.zone_id, xp_gained)
-
-        stats_service.add_xp_and_coins_to_user(user_id, xp_gained, coins_gained)
+        # Estado, log, usuario y zona => una sola transacción
+        p.status = "COMPLETED"
+        reward_service.grant(user, "PROJECT", p.id, p.points, p.points, zone_id=p.zone_id)
+        resource_versions.bump(user_id, AGENDA)
+        db.session.commit()
+        COMPLETIONS.inc("project")
         return p
@@ -0,0 +1,101 @@
+import zlib
+from app import db
+from app.models.user import User
+from app.models.user_resource_version import UserResourceVersion
+from datetime import datetime
+from sqlalchemy import insert, literal, select
+from app.utils.counters import increment_or_insert
+
+# Familias de recursos versionadas
+SEARCH = "search"   # nombres de tareas, hábitos, proyectos, materiales, zonas y plantillas
+AGENDA = "agenda"   # tareas, hábitos y proyectos (fechas, frecuencia, estado) y nombres de zona
+TASKS = "tasks"     # tareas (GET /tasks)
+HABITS = "habits"   # hábitos, con racha y total_check (GET /habits)
+ZONES = "zones"     # zonas, con energía, xp, nivel y gemas amarillas (GET /zones)
+STATS = "stats"     # energía, xp, nivel, puntos, mana y racha de login del usuario (GET /stats/user)
+
+# Se incrementa si cambia el formato de las respuestas versionadas: invalida todos sus ETag
+ETAG_FORMAT = 1
+
+class ResourceVersionService:
+    """
+    Contadores de versión por usuario y familia de recursos.
+    bump() NO hace commit: se llama antes del commit de la escritura.
+    """
+
+    def bump(self, user_id, *resources):
+        for resource in resources:
+            increment_or_insert(
+                UserResourceVersion,
+                {"user_id": int(user_id), "resource": resource},
+                {"version": 1}
+            )
+
+    def bump_all_users(self, *resources):
+        """
+        Sube la versión de esas familias a todos los usuarios (escrituras
+        masivas, p.ej. el reset global de admin). Los usuarios sin fila
+        (versión 0) pasan a 1: también pueden tener un ETag o una caché de la
+        versión 0.
+        """
+        UserResourceVersion.query.filter(UserResourceVersion.resource.in_(resources)).update(
+            {UserResourceVersion.version: UserResourceVersion.version + 1},
+            synchronize_session=False
+        )
+        now = datetime.utcnow()
+        for resource in resources:
+            missing = select(User.id, literal(resource), literal(1), literal(now)).where(
+                ~select(UserResourceVersion.id).where(
+                    UserResourceVersion.user_id == User.id,
+                    UserResourceVersion.resource == resource
+                ).exists()
+            )
+            db.session.execute(insert(UserResourceVersion).from_select(
+                ["user_id", "resource", "version", "updated_at"], missing
+            ))
+
+    def get(self, user_id, resource):
+        """
+        Versión actual (0 si nunca se ha escrito).
+        """
+        version = db.session.query(UserResourceVersion.version).filter_by(
+            user_id=int(user_id), resource=resource
+        ).scalar()
+        return version or 0
+
+    def get_with_time(self, user_id, resource):
+        """
+        (versión, fecha UTC del último cambio) o (0, None) si nunca se ha escrito.
+        """
+        row = db.session.query(UserResourceVersion.version, UserResourceVersion.updated_at).filter_by(
+            user_id=int(user_id), resource=resource
+        ).first()
+        return (row.version, row.updated_at) if row else (0, None)
+
+    def versions(self, user_id, resources):
+        """
+        {familia: versión} de varias familias en una sola consulta (0 si
+        nunca se ha escrito).
+        """
+        rows = db.session.query(UserResourceVersion.resource, UserResourceVersion.version).filter(
+            UserResourceVersion.user_id == int(user_id),
+            UserResourceVersion.resource.in_(resources)
+        ).all()
+        found = dict(rows)
+        return {resource: found.get(resource, 0) for resource in resources}
+
+    def etag(self, user_id, resources, scope=None, versions=None):
+        """
+        ETag de una respuesta del usuario que solo depende de las familias
+        'resources', con una sola consulta (sin tocar las tablas de datos).
+        'scope' distingue variantes de la misma respuesta: query string,
+        día de referencia, etc. Si se pasan 'versions' (de versions()), no
+        se consulta nada: así quien las necesita también las lee una sola vez.
+        """
+        if versions is None:
+            versions = self.versions(user_id, resources)
+        version_str = ".".join(str(versions[resource]) for resource in resources)
+        etag = f"{'+'.join(resources)}-{int(user_id)}-{version_str}-{ETAG_FORMAT}"
+        if scope:
+            etag += f"-{zlib.crc32(scope.encode()):08x}"
+        return etag
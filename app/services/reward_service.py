@@ -0,0 +1,138 @@
+from app.models.zone import Zone
+from app.services.log_service import LogService
+from app.services.stats_service import StatsService
+from app.services.zone_service import ZoneService
+from app.utils.counters import increment_columns
+from app.utils.principal import get_user
+from collections import namedtuple
+from datetime import datetime
+
+log_service = LogService()
+stats_service = StatsService()
+zone_service = ZoneService()
+
+Reward = namedtuple("Reward", "energy xp coins")
+
+class ModifierSnapshot:
+    """
+    Foto de los efectos activos del usuario (UserEffects) resuelta una sola vez
+    en 'now'. Los efectos caducados ya se ven como inactivos; consume() aplica
+    a UserEffects los cambios de estado (efectos de un solo uso, contador del
+    stackable, resets por caducidad).
+    """
+
+    def __init__(self, effects, now):
+        self.effects = effects
+        self.now = now
+        today = now.date()
+
+        self.double_energy_next = bool(effects and effects.double_energy_next_active)
+
+        self.stackable_active = bool(effects and effects.stackable_energy_active)
+        self.stackable_valid = bool(
+            self.stackable_active and effects.stackable_energy_expires
+            and now <= effects.stackable_energy_expires
+        )
+        self.stackable_bonus = (effects.stackable_energy_count or 0) if self.stackable_valid else 0
+
+        self.daily_first = bool(
+            effects and effects.daily_first_completion_active
+            and effects.daily_first_completion_date == today
+            and not effects.daily_first_completion_used
+        )
+        self.double_rewards = bool(
+            effects and effects.double_rewards_until and now <= effects.double_rewards_until
+        )
+        self.xp_multiplier_valid = bool(
+            effects and effects.xp_multiplier_expires and now <= effects.xp_multiplier_expires
+        )
+        self.xp_multiplier = (effects.xp_multiplier or 1.0) if self.xp_multiplier_valid else 1.0
+
+    def apply(self, base_energy, base_xp):
+        """
+        Calcula la recompensa final (sin tocar la BD):
+          - energía: x2 si double_energy_next, + contador del stackable
+          - xp/coins (coins = xp base): x2 primera compleción del día,
+            x2 double_rewards; el multiplicador de xp solo afecta a la xp
+        """
+        energy = base_energy
+        if self.double_energy_next:
+            energy *= 2
+        energy += self.stackable_bonus
+
+        xp = base_xp
+        coins = base_xp
+        if self.daily_first:
+            xp *= 2
+            coins *= 2
+        if self.double_rewards:
+            xp *= 2
+            coins *= 2
+        if self.xp_multiplier_valid:
+            xp = int(xp * self.xp_multiplier)
+
+        return Reward(energy, xp, coins)
+
+    def consume(self):
+        e = self.effects
+        if e is None:
+            return
+        if self.double_energy_next:
+            e.double_energy_next_active = False
+        if self.stackable_valid:
+            increment_columns(e, {"stackable_energy_count": 1})
+        elif self.stackable_active:
+            e.stackable_energy_active = False
+            e.stackable_energy_count = 0
+        if self.daily_first:
+            e.daily_first_completion_used = True
+        if not self.xp_multiplier_valid and e.xp_multiplier_expires:
+            e.xp_multiplier = 1.0
+
+class RewardService:
+    """
+    Pipeline único de recompensa para cualquier entidad completable
+    (tarea, hábito, proyecto). El llamador cambia el estado de la entidad y
+    llama a grant(); grant() calcula la recompensa sobre una foto de los
+    modificadores y deja en la sesión el LogEntry (con libro y rollup), los
+    contadores del usuario (energía, xp, coins, nivel, gemas, historial) y los
+    de la zona, con sus versiones STATS y ZONES (ver apply_xp_and_coins y
+    apply_xp_to_zone). Un único commit al final lo escribe todo en una transacción.
+    """
+
+    def load_user(self, user_id):
+        """
+        Usuario + UserEffects (una sola consulta por petición, ver get_user).
+        """
+        user = get_user(user_id)
+        if not user:
+            raise Exception("Usuario no encontrado")
+        return user
+
+    def grant(self, user, item_type, item_id, base_energy, base_xp, zone_id=None, now=None):
+        """
+        Aplica la recompensa de completar 'item_type'/'item_id'. NO hace commit.
+        Retorna un dict con lo otorgado.
+        """
+        now = now or datetime.utcnow()
+        snapshot = ModifierSnapshot(user.user_effects, now)
+        reward = snapshot.apply(base_energy or 0, base_xp or 0)
+        snapshot.consume()
+
+        log_service.add_log(user.id, item_type, item_id, reward.energy, zone_id=zone_id)
+        increment_columns(user, {"energy": reward.energy})
+        user_result = stats_service.apply_xp_and_coins(user, reward.xp, reward.coins, source=item_type)
+
+        zone_result = None
+        if zone_id and reward.xp:
+            zone = Zone.query.filter_by(id=zone_id, deleted=False).first()
+            if zone:
+                zone_result = zone_service.apply_xp_to_zone(zone, reward.xp)
+
+        return {
+            "energy": reward.energy,
+            "xp": reward.xp,
+            "coins": reward.coins,
+            "user": user_result,
+            "zone": zone_result
+        }
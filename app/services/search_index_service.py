@@ -0,0 +1,307 @@
+from app import db
+from app.models.search_document import SearchDocument
+from app.models.search_trigram import SearchTrigram
+from app.models.task import Task
+from app.models.habit import Habit
+from app.models.project import Project
+from app.models.material import Material
+from app.utils.text_search import analyze, index_terms, trigrams
+from app.services.resource_version_service import ResourceVersionService, SEARCH
+from datetime import datetime
+from sqlalchemy import Float, Integer, String, bindparam, case, func, select, text
+import math
+
+SEARCHABLE_MODELS = {
+    "task": Task,
+    "habit": Habit,
+    "project": Project,
+    "material": Material,
+}
+
+# Peso de una coincidencia en el nombre frente a una en la descripción
+TITLE_WEIGHT = 2.0
+
+# Búsqueda difusa: fracción mínima de trigramas de la consulta que debe
+# tener el nombre para considerarse coincidencia
+FUZZY_MIN_SIMILARITY = 0.5
+
+resource_versions = ResourceVersionService()
+
+# Subconsultas de búsqueda ya construidas, por forma (ver hits)
+_STATEMENTS = {}
+
+class SearchIndexService:
+    """
+    Índice de texto completo de Task, Habit, Project y Material (tabla
+    search_document). Se guarda el nombre y la descripción ya normalizados
+    (minúsculas, sin acentos, sin palabras vacías y con raíces ES/EN), y se
+    busca con el motor de la BD:
+      - MySQL: MATCH ... AGAINST en modo booleano sobre los índices FULLTEXT.
+      - SQLite: FTS5, ordenado por bm25.
+      - Otras BD: LIKE sobre los términos (sin índice; solo para no romper).
+    Cada término de la consulta se busca como prefijo, para que valga
+    mientras el usuario escribe.
+
+    Para la búsqueda difusa (fuzzy_search) se guardan además los trigramas
+    del nombre en search_trigram. hits()/fuzzy_hits() devuelven las
+    coincidencias como subconsulta para ordenarlas y paginarlas en la BD.
+
+    index()/remove() no hacen commit: van en la transacción del servicio que
+    crea, edita o borra la entidad. También suben la versión SEARCH del
+    usuario (invalida las sugerencias en caché, ver SuggestService).
+    """
+
+    def index(self, entity_type, entity):
+        """
+        Crea o actualiza el documento de 'entity'. Si la entidad está borrada
+        (borrado lógico) se quita del índice.
+        """
+        if entity.deleted:
+            self.remove(entity_type, entity.id, entity.user_id)
+            return
+        if entity.id is None:
+            db.session.flush()
+
+        doc = SearchDocument.query.filter_by(entity_type=entity_type, entity_id=entity.id).first()
+        if not doc:
+            doc = SearchDocument(entity_type=entity_type, entity_id=entity.id)
+            db.session.add(doc)
+        else:
+            SearchTrigram.query.filter_by(document_id=doc.id).delete(synchronize_session=False)
+        grams = trigrams(entity.name)
+        doc.user_id = entity.user_id
+        doc.title_terms = index_terms(entity.name)
+        doc.body_terms = index_terms(entity.description)
+        doc.trigram_count = len(grams)
+        doc.updated_at = datetime.utcnow()
+        db.session.flush()
+
+        db.session.bulk_insert_mappings(SearchTrigram, [
+            {"document_id": doc.id, "user_id": entity.user_id, "trigram": gram} for gram in grams
+        ])
+        resource_versions.bump(entity.user_id, SEARCH)
+
+    def remove(self, entity_type, entity_id, user_id):
+        doc_ids = db.session.query(SearchDocument.id) \
+            .filter_by(entity_type=entity_type, entity_id=entity_id).scalar_subquery()
+        SearchTrigram.query.filter(SearchTrigram.document_id.in_(doc_ids)).delete(synchronize_session=False)
+        SearchDocument.query.filter_by(entity_type=entity_type, entity_id=entity_id) \
+            .delete(synchronize_session=False)
+        resource_versions.bump(user_id, SEARCH)
+
+    def remove_types(self, entity_types):
+        """
+        Quita del índice todos los documentos (y sus trigramas) de esos
+        entity_type, de todos los usuarios: borrados masivos como el reset
+        global de admin. No sube versiones: lo hace el llamador con
+        bump_all_users().
+        """
+        doc_ids = db.session.query(SearchDocument.id) \
+            .filter(SearchDocument.entity_type.in_(entity_types)).scalar_subquery()
+        SearchTrigram.query.filter(SearchTrigram.document_id.in_(doc_ids)).delete(synchronize_session=False)
+        SearchDocument.query.filter(SearchDocument.entity_type.in_(entity_types)) \
+            .delete(synchronize_session=False)
+
+    def search(self, user_id, query, types=None, limit=None):
+        """
+        Busca 'query' en los documentos del usuario.
+        - types: lista de entity_type a incluir (None => todos)
+        - limit: máximo de resultados (None => todos)
+
+        Retorna [(entity_type, entity_id, score), ...] de más a menos relevante.
+        """
+        return self._ranked(self.hits(query, types), user_id, limit)
+
+    def hits(self, query, types=None):
+        """
+        (subconsulta, params) con las coincidencias de 'query': columnas
+        entity_type, entity_id y score, sin ordenar ni limitar (quien la usa
+        añade filtros, ORDER BY y LIMIT, ver SearchService) y con el usuario
+        como parámetro :user_id. None si la consulta no tiene términos.
+        La subconsulta solo depende del dialecto, de los tipos y (con LIKE)
+        del nº de términos, y se reutiliza entre peticiones: SQLAlchemy no
+        tiene que recalcular su clave de caché en cada búsqueda.
+        """
+        terms = list(dict.fromkeys(analyze(query)))
+        if not terms:
+            return None
+        types = tuple(types) if types else tuple(SEARCHABLE_MODELS)
+
+        dialect = db.engine.dialect.name
+        if dialect == "mysql":
+            sql, params = self._mysql_query(terms)
+        elif dialect == "sqlite":
+            sql, params = self._sqlite_query(terms)
+        else:
+            sql, params = self._like_query(terms)
+
+        key = ("hits", sql, types)
+        hits = _STATEMENTS.get(key)
+        if hits is None:
+            type_params = {f"type_{i}": t for i, t in enumerate(types)}
+            sql += " AND d.user_id = :user_id AND d.entity_type IN (%s)" % \
+                ", ".join(f":{name}" for name in type_params)
+            hits = _STATEMENTS[key] = text(sql).bindparams(**type_params).columns(
+                entity_type=String, entity_id=Integer, score=Float
+            ).subquery("hits")
+        return hits, params
+
+    def fuzzy_search(self, user_id, query, types=None, limit=None, min_similarity=FUZZY_MIN_SIMILARITY):
+        """
+        Búsqueda tolerante a erratas y acentos sobre los nombres ("hbito",
+        "proyeto", "habito" => "Hábito..."). Ver fuzzy_hits.
+
+        Retorna [(entity_type, entity_id, score), ...] con score en [0, 1].
+        """
+        return self._ranked(self.fuzzy_hits(query, types, min_similarity), user_id, limit)
+
+    def fuzzy_hits(self, query, types=None, min_similarity=FUZZY_MIN_SIMILARITY):
+        """
+        Como hits(), pero por trigramas de los nombres. Es coincidencia si el
+        nombre tiene al menos 'min_similarity' de los trigramas de la consulta;
+        el score es la media de esa fracción y la similitud de Jaccard (que
+        premia los nombres de longitud parecida a la consulta), calculado en
+        la BD para poder ordenar y limitar allí.
+        Solo se leen las filas de search_trigram del usuario con los
+        trigramas de la consulta (índice (user_id, trigram)), no todos los nombres.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return None
+        types = tuple(types) if types else tuple(SEARCHABLE_MODELS)
+        params = {
+            "grams": sorted(grams),
+            "gram_count": len(grams),
+            "needed": max(1, math.ceil(min_similarity * len(grams)))
+        }
+
+        key = ("fuzzy_hits", types)
+        hits = _STATEMENTS.get(key)
+        if hits is None:
+            gram_count = bindparam("gram_count", type_=Integer)
+            shared = func.count(SearchTrigram.id)
+            union_size = gram_count + func.coalesce(SearchDocument.trigram_count, 0) - shared
+            coverage = shared * 1.0 / gram_count
+            jaccard = shared * 1.0 / case((union_size > 1, union_size), else_=1)
+            hits = _STATEMENTS[key] = select(
+                SearchDocument.entity_type.label("entity_type"),
+                SearchDocument.entity_id.label("entity_id"),
+                ((coverage + jaccard) / 2).label("score")
+            ).join(SearchDocument, SearchDocument.id == SearchTrigram.document_id).where(
+                SearchTrigram.user_id == bindparam("user_id", type_=Integer),
+                SearchTrigram.trigram.in_(bindparam("grams", expanding=True)),
+                SearchDocument.entity_type.in_(types)
+            ).group_by(
+                SearchDocument.id, SearchDocument.entity_type, SearchDocument.entity_id, SearchDocument.trigram_count
+            ).having(shared >= bindparam("needed", type_=Integer)).subquery("hits")
+        return hits, params
+
+    def rebuild(self, user_id=None, chunk_size=500, progress=None):
+        """
+        Regenera el índice (entero o de un usuario) desde las tablas de
+        origen, por tramos de 'chunk_size' filas (keyset sobre id) con un
+        commit por tramo. Retorna el nº de documentos indexados.
+        """
+        grams = SearchTrigram.query
+        docs = SearchDocument.query
+        if user_id is not None:
+            grams = grams.filter_by(user_id=user_id)
+            docs = docs.filter_by(user_id=user_id)
+        grams.delete(synchronize_session=False)
+        docs.delete(synchronize_session=False)
+        db.session.commit()
+
+        total = 0
+        for entity_type, model in SEARCHABLE_MODELS.items():
+            last_id = 0
+            while True:
+                q = db.session.query(model.id, model.user_id, model.name, model.description) \
+                    .filter(model.id > last_id, model.deleted == False)
+                if user_id is not None:
+                    q = q.filter(model.user_id == user_id)
+                rows = q.order_by(model.id).limit(chunk_size).all()
+                if not rows:
+                    break
+
+                now = datetime.utcnow()
+                grams = {row.id: trigrams(row.name) for row in rows}
+                db.session.bulk_insert_mappings(SearchDocument, [
+                    {
+                        "entity_type": entity_type,
+                        "entity_id": row.id,
+                        "user_id": row.user_id,
+                        "title_terms": index_terms(row.name),
+                        "body_terms": index_terms(row.description),
+                        "trigram_count": len(grams[row.id]),
+                        "updated_at": now
+                    }
+                    for row in rows
+                ])
+                doc_ids = db.session.query(SearchDocument.entity_id, SearchDocument.id).filter(
+                    SearchDocument.entity_type == entity_type,
+                    SearchDocument.entity_id.in_(list(grams))
+                )
+                owners = {row.id: row.user_id for row in rows}
+                db.session.bulk_insert_mappings(SearchTrigram, [
+                    {"document_id": doc_id, "user_id": owners[entity_id], "trigram": gram}
+                    for entity_id, doc_id in doc_ids
+                    for gram in grams[entity_id]
+                ])
+                db.session.commit()
+
+                last_id = rows[-1].id
+                total += len(rows)
+                if progress:
+                    progress(entity_type, last_id, len(rows))
+        return total
+
+    # ---- PRIVADOS ----
+    def _ranked(self, found, user_id, limit=None):
+        if found is None:
+            return []
+        hits, params = found
+        q = select(hits.c.entity_type, hits.c.entity_id, hits.c.score) \
+            .order_by(hits.c.score.desc(), hits.c.entity_id.desc())
+        if limit:
+            q = q.limit(int(limit))
+        rows = db.session.execute(q, {**params, "user_id": int(user_id)})
+        return [(row.entity_type, row.entity_id, float(row.score or 0)) for row in rows]
+
+    def _mysql_query(self, terms):
+        # +term* => todos los términos obligatorios, cada uno como prefijo
+        against = " ".join(f"+{t}*" for t in terms)
+        sql = (
+            "SELECT d.entity_type, d.entity_id, "
+            f"MATCH(d.title_terms) AGAINST(:q IN BOOLEAN MODE) * {TITLE_WEIGHT} "
+            "+ MATCH(d.title_terms, d.body_terms) AGAINST(:q IN BOOLEAN MODE) AS score "
+            "FROM search_document d "
+            "WHERE MATCH(d.title_terms, d.body_terms) AGAINST(:q IN BOOLEAN MODE)"
+        )
+        return sql, {"q": against}
+
+    def _sqlite_query(self, terms):
+        # "term"* => prefijo; varios términos separados por espacio => AND
+        match = " ".join(f'"{t}"*' for t in terms)
+        sql = (
+            "SELECT d.entity_type, d.entity_id, "
+            f"-bm25(search_document_fts, {TITLE_WEIGHT}, 1.0) AS score "
+            "FROM search_document_fts "
+            "JOIN search_document d ON d.id = search_document_fts.rowid "
+            "WHERE search_document_fts MATCH :q"
+        )
+        return sql, {"q": match}
+
+    def _like_query(self, terms):
+        params = {}
+        conditions, title_hits = [], []
+        for i, term in enumerate(terms):
+            params[f"t{i}"] = f"% {term}%"
+            doc = "(' ' || d.title_terms || ' ' || d.body_terms)"
+            conditions.append(f"{doc} LIKE :t{i}")
+            title_hits.append(f"CASE WHEN (' ' || d.title_terms) LIKE :t{i} THEN {TITLE_WEIGHT} ELSE 1 END")
+        sql = (
+            f"SELECT d.entity_type, d.entity_id, {' + '.join(title_hits)} AS score "
+            "FROM search_document d "
+            f"WHERE {' AND '.join(conditions)}"
+        )
+        return sql, params
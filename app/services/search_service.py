@@ -4,124 +4,264 @@ from app.models.project import Project
 from app.models.material import Material
 from app.models.zone import Zone
 from app import db
-from sqlalchemy import or_
+from app.services.search_index_service import SearchIndexService
+from sqlalchemy import Float, Integer, String, and_, bindparam, func, literal, or_, select, union_all
+import base64
+import json
+search_index = SearchIndexService()
+
+SEARCH_TYPES = ("task", "habit", "project", "material")
+SEARCH_MODELS = {"task": Task, "habit": Habit, "project": Project, "material": Material}
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Consultas de búsqueda ya construidas, por forma (ver SearchService._statement)
+_STATEMENTS = {}
 
 class SearchService:
-    def global_search(self, user_id, query, included_types, zone_id):
+    def global_search(self, user_id, query, included_types, zone_id,
+                      limit=DEFAULT_LIMIT, cursor=None, per_type=None, fuzzy=False,
+                      include_totals=False):
         """
-        Realiza una búsqueda textual parcial en Task, Habit, Project, Material, etc.
+        Realiza una búsqueda de texto completo en Task, Habit, Project y Material
+        y devuelve una sola lista ordenada por relevancia, paginada.
         - user_id: filtra solo entidades del usuario
-        - query: string a buscar
-        - included_types: lista con "task","habit","project","material", ...
-        - zone_id: filtra si corresponde (tasks -> project.zone_id, habit.zone_id, project.zone_id, etc.)
+        - query: string a buscar (índice search_document, ver SearchIndexService).
+          Sin query se listan todas (de más nueva a más antigua).
+        - included_types: lista con "task","habit","project","material"
+        - zone_id: filtra si corresponde (tasks -> project.zone_id, habit.zone_id, project.zone_id,
+          materiales -> sus proyectos)
+        - limit: tamaño de página (máx. MAX_LIMIT)
+        - cursor: 'next_cursor' de la página anterior
+        - per_type: máximo de resultados de cada tipo en toda la búsqueda
+        - fuzzy: búsqueda por trigramas en los nombres, tolerante a erratas
+          ("hbito", "proyeto"); el score es una similitud entre 0 y 1
+        - include_totals: añade "totals" (cuenta todas las coincidencias, sin
+          aplicar per_type: una consulta más). Sin él no se calcula.
 
-        Retorna un diccionario con los resultados.
-        Ejemplo:
+        Retorna:
         {
-          "task": [ {...}, {...} ],
-          "habit": [ {...} ],
-          "project": [],
-          "material": [...]
+          "results": [ {"type": "task", "id": 3, "score": 1.7, "name": ..., "zone_id": ..., ...}, ... ],
+          "totals": {"task": 12, "habit": 0, ...},   # solo con include_totals
+          "next_cursor": "..." o None
         }
+        La página (limit + 1 filas, filtradas por zona y cursor y ordenadas)
+        sale de una sola consulta sobre el índice; después una consulta por
+        tipo presente en la página y una para los nombres de zona.
+        """
+        types = tuple(t for t in SEARCH_TYPES if t in included_types)
+        limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+        per_type = int(per_type) if per_type else None
+        zone_id = int(zone_id) if zone_id else None
+        after = self._decode_cursor(cursor) if cursor else None
+
+        found = None
+        if query:
+            found = search_index.fuzzy_hits(query, types) if fuzzy else search_index.hits(query, types)
+        if (query and found is None) or not types:
+            return self._response([], {t: 0 for t in types} if include_totals else None, None)
+
+        hits, params = found or (None, {})
+        params.update(user_id=int(user_id), zone_id=zone_id, per_type=per_type, page_size=limit + 1)
+        if after:
+            params.update(after_score=-after[0], after_type=after[1], after_id=-after[2])
+
+        totals = None
+        if include_totals:
+            totals = {t: 0 for t in types}
+            totals.update(db.session.execute(self._statement("totals", hits, types, zone_id), params).all())
+
+        # Una sola lista: relevancia, luego tipo, luego id más reciente
+        rows = db.session.execute(
+            self._statement("page", hits, types, zone_id, bool(per_type), bool(after)), params
+        ).all()
+        page = [(-float(row.score or 0), row.entity_type, -row.entity_id) for row in rows[:limit]]
+        next_cursor = self._encode_cursor(page[-1]) if len(rows) > limit else None
+
+        loaded = self._load(page)
+        results = []
+        for neg_score, entity_type, neg_id in page:
+            item = loaded.get((entity_type, -neg_id))
+            if item:
+                item["score"] = -neg_score
+                results.append(item)
+
+        return self._response(results, totals, next_cursor)
+
+    # ---- PRIVADOS ----
+    def _response(self, results, totals, next_cursor):
+        response = {"results": results, "next_cursor": next_cursor}
+        if totals is not None:
+            response["totals"] = totals
+        return response
+
+    def _statement(self, kind, hits, types, zone_id, capped=False, paged=False):
         """
-        results = {}
-        # Normalizamos
-        q_like = f"%{query}%"
-
-        # Buscar TAREAS
-        if "task" in included_types:
-            t_query = Task.query.filter_by(user_id=user_id, deleted=False)
-            if query:
-                t_query = t_query.filter(
-                    or_(
-                        Task.name.ilike(q_like),
-                        Task.description.ilike(q_like)
-                    )
+        Consulta de la página ("page") o de los totales ("totals"). Solo
+        depende de la forma de la búsqueda, así que se construye una vez y
+        se reutiliza; los valores (:user_id, :zone_id, cursor...) van como
+        parámetros.
+        """
+        key = (kind, hits, types, bool(zone_id), capped, paged)
+        statement = _STATEMENTS.get(key)
+        if statement is not None:
+            return statement
+
+        source = self._source(types, hits, zone_id)
+        if kind == "totals":
+            statement = select(source.c.entity_type, func.count()).group_by(source.c.entity_type)
+        else:
+            if capped:
+                source = self._cap_per_type(types, source)
+            statement = select(*source.c)
+            if paged:
+                statement = statement.where(self._after(source))
+            statement = statement.order_by(
+                source.c.score.desc(), source.c.entity_type, source.c.entity_id.desc()
+            ).limit(bindparam("page_size", type_=Integer))
+
+        _STATEMENTS[key] = statement
+        return statement
+
+    def _source(self, types, hits, zone_id):
+        """
+        Subconsulta (entity_type, entity_id, score): las coincidencias del
+        índice (de la zona, si se pide) o, sin texto, todas las entidades de
+        esos tipos con score 0.
+        """
+        if hits is None:
+            selects = [
+                self._scope_query(t, zone_id).with_only_columns(
+                    literal(t, String).label("entity_type"),
+                    SEARCH_MODELS[t].id.label("entity_id"),
+                    literal(0.0, Float).label("score")
                 )
-            if zone_id:
-                # filtrar tasks que pertenezcan a un project con zone_id
-                t_query = t_query.join(Project).filter(Project.zone_id == zone_id)
-            tasks = t_query.all()
-            results["task"] = [
-                {
+                for t in types
+            ]
+            return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+
+        q = select(hits.c.entity_type, hits.c.entity_id, hits.c.score)
+        if zone_id:
+            q = q.where(or_(*[
+                and_(hits.c.entity_type == t, hits.c.entity_id.in_(self._scope_query(t, zone_id)))
+                for t in types
+            ]))
+        return q.subquery()
+
+    def _cap_per_type(self, types, source):
+        """
+        Las :per_type filas más relevantes de cada tipo (una rama UNION ALL
+        por tipo, sin funciones de ventana).
+        """
+        capped = [
+            select(*source.c).where(source.c.entity_type == t)
+            .order_by(source.c.score.desc(), source.c.entity_id.desc())
+            .limit(bindparam("per_type", type_=Integer)).subquery()
+            for t in types
+        ]
+        selects = [select(*c.c) for c in capped]
+        return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+
+    def _after(self, source):
+        """
+        Filas posteriores al cursor (:after_score, :after_type, :after_id) en
+        el orden (score desc, tipo, id desc).
+        """
+        score = bindparam("after_score", type_=Float)
+        entity_type = bindparam("after_type", type_=String)
+        entity_id = bindparam("after_id", type_=Integer)
+        return or_(
+            source.c.score < score,
+            and_(source.c.score == score, source.c.entity_type > entity_type),
+            and_(source.c.score == score, source.c.entity_type == entity_type, source.c.entity_id < entity_id)
+        )
+
+    def _scope_query(self, entity_type, zone_id):
+        """
+        Ids de las entidades no borradas de :user_id (y de :zone_id, si se pide).
+        """
+        model = SEARCH_MODELS[entity_type]
+        q = select(model.id).where(model.user_id == bindparam("user_id", type_=Integer), model.deleted == False)
+        if zone_id:
+            zone = bindparam("zone_id", type_=Integer)
+            if entity_type == "task":
+                q = q.join(Project, Task.project_id == Project.id).where(Project.zone_id == zone)
+            elif entity_type == "material":
+                # el material pertenece a la zona de sus proyectos (projects -> zone)
+                q = q.join(Material.projects).where(Project.zone_id == zone).distinct()
+            else:
+                q = q.where(model.zone_id == zone)
+        return q
+
+    def _load(self, page):
+        """
+        Carga las entidades de la página: una consulta por tipo (las tareas
+        ya con su proyecto) y otra para los nombres de zona.
+        Retorna {(tipo, id): dict}.
+        """
+        ids = {}
+        for _neg_score, entity_type, neg_id in page:
+            ids.setdefault(entity_type, []).append(-neg_id)
+
+        items = {}
+        if "task" in ids:
+            rows = db.session.query(Task, Project.name, Project.zone_id) \
+                .outerjoin(Project, Task.project_id == Project.id) \
+                .filter(Task.id.in_(ids["task"]), Task.deleted == False)
+            for t, project_name, project_zone_id in rows:
+                items[("task", t.id)] = {
+                    "type": "task",
                     "id": t.id,
                     "name": t.name,
                     "description": t.description,
-                    "zone_id": t.project.zone_id if t.project else None,
-                    "status": t.status
+                    "status": t.status,
+                    "project_id": t.project_id,
+                    "project_name": project_name,
+                    "zone_id": project_zone_id
                 }
-                for t in tasks
-            ]
-
-        # Buscar HÁBITOS
-        if "habit" in included_types:
-            h_query = Habit.query.filter_by(user_id=user_id, deleted=False)
-            if query:
-                h_query = h_query.filter(
-                    or_(
-                        Habit.name.ilike(q_like),
-                        Habit.description.ilike(q_like)
-                    )
-                )
-            if zone_id:
-                h_query = h_query.filter_by(zone_id=zone_id)
-            habits = h_query.all()
-            results["habit"] = [
-                {
+        if "habit" in ids:
+            for h in Habit.query.filter(Habit.id.in_(ids["habit"]), Habit.deleted == False):
+                items[("habit", h.id)] = {
+                    "type": "habit",
                     "id": h.id,
                     "name": h.name,
                     "description": h.description,
                     "zone_id": h.zone_id
                 }
-                for h in habits
-            ]
-
-        # Buscar PROYECTOS
-        if "project" in included_types:
-            p_query = Project.query.filter_by(user_id=user_id, deleted=False)
-            if query:
-                p_query = p_query.filter(
-                    or_(
-                        Project.name.ilike(q_like),
-                        Project.description.ilike(q_like)
-                    )
-                )
-            if zone_id:
-                p_query = p_query.filter_by(zone_id=zone_id)
-            projects = p_query.all()
-            results["project"] = [
-                {
+        if "project" in ids:
+            for p in Project.query.filter(Project.id.in_(ids["project"]), Project.deleted == False):
+                items[("project", p.id)] = {
+                    "type": "project",
                     "id": p.id,
                     "name": p.name,
                     "description": p.description,
+                    "status": p.status,
                     "zone_id": p.zone_id
                 }
-                for p in projects
-            ]
-
-        # Buscar MATERIALES
-        if "material" in included_types:
-            m_query = Material.query.filter_by(user_id=user_id, deleted=False)
-            if query:
-                m_query = m_query.filter(
-                    or_(
-                        Material.name.ilike(q_like),
-                        Material.description.ilike(q_like)
-                    )
-                )
-            # zone_id no es directo en Material, se asocia via projects -> zone
-            # Podríamos unir project_materials y project, filtrar zone_id
-            if zone_id:
-                m_query = m_query.join(Material.projects).filter(Project.zone_id == zone_id)
-            mats = m_query.all()
-            results["material"] = [
-                {
+        if "material" in ids:
+            for m in Material.query.filter(Material.id.in_(ids["material"]), Material.deleted == False):
+                items[("material", m.id)] = {
+                    "type": "material",
                     "id": m.id,
                     "name": m.name,
                     "description": m.description,
-                    "type": m.type
+                    "material_type": m.type,
+                    "zone_id": m.zone_id
                 }
-                for m in mats
-            ]
 
-        return results
+        zone_ids = {item["zone_id"] for item in items.values() if item["zone_id"]}
+        zone_names = dict(db.session.query(Zone.id, Zone.name).filter(Zone.id.in_(zone_ids))) if zone_ids else {}
+        for item in items.values():
+            item["zone_name"] = zone_names.get(item["zone_id"])
+        return items
+
+    def _encode_cursor(self, key):
+        raw = json.dumps([-key[0], key[1], -key[2]]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def _decode_cursor(self, cursor):
+        try:
+            score, entity_type, entity_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (-float(score), str(entity_type), -int(entity_id))
+        except Exception:
+            raise Exception("Cursor de búsqueda no válido.")
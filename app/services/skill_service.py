@@ -2,6 +2,11 @@ from app import db
 from app.models.skill import Skill
 from app.models.effect import Effect
 from app.models.user import User
+from app.utils.counters import increment_columns
+from app.utils.principal import get_user
+from app.services.resource_version_service import ResourceVersionService, STATS
+
+resource_versions = ResourceVersionService()
 
 class SkillService:
     def get_all_skills(self):
@@ -80,17 +85,16 @@ class SkillService:
         Aplica el costo de mana al usar la skill, 
         y luego ejecuta la lógica de 'effect' si corresponde.
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         skill = Skill.query.filter_by(id=skill_id, deleted=False).first()
         if not user or not skill:
             raise Exception("No se encontró la skill o el usuario.")
 
-        # Verifica si el usuario tiene mana suficiente
-        if user.mana < skill.mana:
+        # Consumir mana solo si sigue habiendo suficiente (UPDATE condicionado)
+        mana_cost = skill.mana or 0
+        if not increment_columns(user, {"mana": -mana_cost}, [User.mana >= mana_cost]):
             raise Exception("No tienes suficiente mana para usar esta skill.")
-
-        # Consumir mana
-        user.mana -= skill.mana
+        resource_versions.bump(user_id, STATS)
 
         # Aplicar effect si existe
         if skill.effect_id:
@@ -110,9 +114,10 @@ class SkillService:
         Restaura el mana del usuario a (100 + 20*level).
         Llamar, por ejemplo, al cambiar de día.
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado.")
         user.mana = 100 + 20 * user.level
+        resource_versions.bump(user_id, STATS)
         db.session.commit()
         return user.mana
\ No newline at end of file
@@ -1,48 +1,47 @@
 from datetime import date, datetime, timedelta
 from app import db
-from app.models.log_entry import LogEntry
-from app.models.user import User
 from app.models.zone import Zone
 from app.services.zone_service import ZoneService
+from app.services.energy_ledger_service import EnergyLedgerService
+from app.services.log_rollup_service import LogRollupService
+from app.services.progress_history_service import ProgressHistoryService
+from app.services.resource_version_service import ResourceVersionService, STATS, ZONES
+from app.utils.counters import increment_columns, raise_level
+from app.utils.progression import get_curve
+from app.utils.principal import get_user
 zone_service = ZoneService()
+energy_ledger_service = EnergyLedgerService()
+log_rollup_service = LogRollupService()
+progress_history_service = ProgressHistoryService()
+resource_versions = ResourceVersionService()
 class StatsService:
     def get_energy_balance_for_user(self, user_id):
         """
         Suma la energía de los LogEntries del usuario en los últimos 7 días.
+        Se lee del libro diario (user_energy_ledger), sin recorrer log_entry.
         """
-        start_date = date.today() - timedelta(days=7)
-        logs = LogEntry.query.filter(
-            LogEntry.user_id == user_id,
-            LogEntry.deleted == False,
-            LogEntry.end_timestamp >= start_date
-        ).all()
-
-        total_energy = sum(e.energy for e in logs)
-        return total_energy
+        return energy_ledger_service.get_user_balance(user_id)
 
     def update_user_energy(self, user_id):
         """
         Llama a get_energy_balance_for_user() y asigna el resultado a user.energy.
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado")
 
         total_energy = self.get_energy_balance_for_user(user_id)
         user.energy = total_energy
+        resource_versions.bump(user_id, STATS)
         db.session.commit()
 
         return total_energy
 
     def get_energy_balance_for_zone(self, zone_id):
-        start_date = date.today() - timedelta(days=7)
-        entries = LogEntry.query.filter(
-            LogEntry.zone_id == zone_id,
-            LogEntry.deleted == False,
-            LogEntry.end_timestamp >= start_date
-        ).all()
-        total_energy = sum(e.energy for e in entries)
-        return total_energy
+        """
+        Igual que get_energy_balance_for_user pero leyendo zone_energy_ledger.
+        """
+        return energy_ledger_service.get_zone_balance(zone_id)
 
     def update_zone_energy(self, zone_id, user_id):
         """
@@ -56,6 +55,7 @@ class StatsService:
 
         total_energy = self.get_energy_balance_for_zone(zone_id)
         zone.energy = total_energy
+        resource_versions.bump(user_id, ZONES)
         db.session.commit()
         return total_energy
 
@@ -63,7 +63,7 @@ class StatsService:
         """
         Retorna un dict con las estadísticas del usuario.
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado")
         stats = {
@@ -101,66 +101,38 @@ class StatsService:
         del 'stats_type' (energy, xp, level, etc.) 
         en los últimos days_back días.
         
-        Realmente la 'energy' se calcula de log_entries, 
-        mientras xp/level deberías guardarlo en 
-        un historial si quisieras ver su evolución. 
-        Como no hay un 'user_history' implementado, 
-        haremos un ejemplo con log_entries = daily energy.
+        La 'energy' se calcula del rollup diario de log_entries,
+        mientras xp/level salen de user_progress_history.
         """
         if stats_type == 'energy':
-            # Tomamos la sumatoria diaria de log_entries en los últimos days_back días
+            # Sumatoria diaria desde log_entry_rollup en los últimos days_back días
             end_date = date.today()
             start_date = end_date - timedelta(days=days_back)
 
-            # Filtrar
-            logs = LogEntry.query.filter(
-                LogEntry.user_id == user_id,
-                LogEntry.deleted == False,
-                LogEntry.end_timestamp >= start_date,
-                LogEntry.end_timestamp <= end_date
-            ).all()
-
-            # Agrupar por día
-            daily_map = {}
-            for l in logs:
-                dstr = l.end_timestamp.isoformat()
-                daily_map[dstr] = daily_map.get(dstr, 0) + l.energy
-            
+            daily_map = log_rollup_service.get_daily_energy(user_id, start_date, end_date)
+
             # Crear lista ordenada
             result = []
             for i in range(days_back + 1):
                 current_d = start_date + timedelta(days=i)
-                cdstr = current_d.isoformat()
-                e_val = daily_map.get(cdstr, 0)
-                result.append({"date": cdstr, "energy": e_val})
+                result.append({"date": current_d.isoformat(), "energy": daily_map.get(current_d, 0)})
             
             return {"type": "energy_history", "data": result}
 
-        elif stats_type == 'xp':
-            # Como ejemplo, devolvemos un valor fijo (no hay historial).
-            # En un caso real, deberías tener tabla user_xp_history 
-            # o algo similar.
-            user = User.query.filter_by(id=user_id, deleted=False).first()
+        elif stats_type in ('xp', 'level'):
+            # Serie diaria desde user_progress_history (último punto de cada día)
+            user = get_user(user_id)
             if not user:
                 raise Exception("Usuario no encontrado")
+            series = progress_history_service.get_daily_series(
+                user_id, stats_type, days_back,
+                current_value=getattr(user, stats_type)
+            )
             return {
-                "type": "xp_history",
+                "type": f"{stats_type}_history",
                 "data": [
-                    {"date": (date.today() - timedelta(days=i)).isoformat(), "xp": user.xp}
-                    for i in range(days_back + 1)
-                ]
-            }
-
-        elif stats_type == 'level':
-            # Similar a xp, devuelves algo fijo o generas un dummy.
-            user = User.query.filter_by(id=user_id, deleted=False).first()
-            if not user:
-                raise Exception("Usuario no encontrado")
-            return {
-                "type": "level_history",
-                "data": [
-                    {"date": (date.today() - timedelta(days=i)).isoformat(), "level": user.level}
-                    for i in range(days_back + 1)
+                    {"date": d.isoformat(), stats_type: value}
+                    for d, value in reversed(series)
                 ]
             }
 
@@ -168,28 +140,41 @@ class StatsService:
             # Tipo no soportado
             return {"type": stats_type, "data": []}
         
-    def add_xp_and_coins_to_user(self, user_id, xp_gained, coins_gained):
+    def add_xp_and_coins_to_user(self, user_id, xp_gained, coins_gained, source=None):
         """
         Suma xp y monedas al usuario; chequea si sube de nivel => +1 gema azul
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado")
 
-        # Sumar xp
-        user.xp += xp_gained
-        # Sumar monedas
-        user.coins += coins_gained
-
-        # Chequeamos subida de nivel en bucle (por si gana mucho xp de golpe)
-        level_up = False
-        while user.xp >= xp_needed_for_level(user.level + 1):
-            user.level += 1
-            level_up = True
-            # Al subir de nivel => +1 gema azul
-            user.blue_gems += 1
-
+        result = self.apply_xp_and_coins(user, xp_gained, coins_gained, source=source)
         db.session.commit()
+        return result
+
+    def apply_xp_and_coins(self, user, xp_gained, coins_gained, source=None):
+        """
+        Parte sin commit de add_xp_and_coins_to_user, sobre un User ya cargado.
+        """
+        # Sumar xp y monedas en la BD (UPDATE col = col + delta), sin pisar
+        # lo que sumen a la vez otras peticiones del mismo usuario
+        increment_columns(user, {"xp": xp_gained, "coins": coins_gained})
+        resource_versions.bump(user.id, STATS)
+
+        # Nivel calculado desde la xp resultante con la curva de usuario
+        # (bisect, aunque gane muchos niveles de golpe); gemas azules por nivel
+        curve = get_curve("user")
+        target_level, _, _ = curve.level_up(user.level, user.xp)
+        levels_gained = raise_level(user, target_level, "blue_gems", curve.gems_per_level)
+        level_up = levels_gained > 0
+
+        progress_history_service.record(
+            user, source or "XP_GRANT",
+            xp_delta=xp_gained,
+            coins_delta=coins_gained,
+            blue_gems_delta=levels_gained * curve.gems_per_level,
+            level_delta=levels_gained
+        )
 
         return {
             "user_level": user.level,
@@ -201,7 +186,7 @@ class StatsService:
 
 def xp_needed_for_level(level):
     """
-    Lógica de cuánta XP se requiere para cada nivel del user.
-    Aquí un ejemplo lineal: 100 * level.
+    XP total que se requiere para cada nivel del user, según la curva
+    configurada (por defecto lineal: 100 * level).
     """
-    return 100 * level
+    return get_curve("user").xp_for_level(level)
@@ -7,6 +7,12 @@ from app.models.skill import Skill
 from app.models.gear import Gear
 from app.models.inventory_item import InventoryItem
 from app.services.skill_service import SkillService
+from app.utils.counters import increment_columns
+from app.utils.principal import get_user
+from app.utils.metrics import STORE_PURCHASES
+from app.services.resource_version_service import ResourceVersionService, ZONES
+
+resource_versions = ResourceVersionService()
 
 class StoreService:
 
@@ -17,7 +23,7 @@ class StoreService:
          - Si is_zone_skill=False => se consumen gemas azules del user
          - Se chequea level_required
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado")
 
@@ -39,19 +45,20 @@ class StoreService:
 
             # Coste en gemas amarillas => tú definiste 3 gemas amarillas
             gem_cost = 3
-            if zone.yellow_gems < gem_cost:
+            # Descuento atómico: solo se aplica si sigue habiendo gemas suficientes
+            if not increment_columns(zone, {"yellow_gems": -gem_cost}, [Zone.yellow_gems >= gem_cost]):
                 raise Exception("No tienes suficientes gemas amarillas en la zona.")
-            zone.yellow_gems -= gem_cost
+            resource_versions.bump(user.id, ZONES)
 
         else:
             # Skill personal => 1 gema azul del user
             gem_cost = 1
-            if user.blue_gems < gem_cost:
+            if not increment_columns(user, {"blue_gems": -gem_cost}, [User.blue_gems >= gem_cost]):
                 raise Exception("No tienes gemas azules suficientes.")
-            user.blue_gems -= gem_cost
 
         user.skills.append(skill)
         db.session.commit()
+        STORE_PURCHASES.inc("skill")
 
         return {"message": f"Skill '{skill.name}' comprada con éxito."}
 
@@ -63,7 +70,7 @@ class StoreService:
          - user.level >= gear.level_required
          - crea un InventoryItem para el user
         """
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("Usuario no encontrado")
 
@@ -72,20 +79,21 @@ class StoreService:
             raise Exception("Ítem no encontrado")
 
         final_cost = gear.cost
-        if getattr(user, "store_discount_active", False):
-            discount_value = getattr(user, "store_discount_value", 0.2)
+        effects = user.user_effects
+        if effects and effects.store_discount_active:
+            discount_value = effects.store_discount_value or 0.2
             final_cost = int(final_cost * (1 - discount_value))
-            # Desactivamos el descuento tras esta compra
-            user.store_discount_active = False
-            user.store_discount_value = 0.0
 
-        if user.coins < final_cost:
+        # Cobro atómico: UPDATE coins = coins - coste WHERE coins >= coste
+        if not increment_columns(user, {"coins": -final_cost}, [User.coins >= final_cost]):
             raise Exception("No tienes suficientes monedas.")
 
-        user.coins -= final_cost
-        db.session.commit()
+        if effects and effects.store_discount_active:
+            # Desactivamos el descuento tras esta compra
+            effects.store_discount_active = False
+            effects.store_discount_value = 0.0
 
-        # Crear el InventoryItem
+        # Crear el InventoryItem (mismo commit que el cobro)
         item = InventoryItem(
             gear_id=gear.id,
             user_id=user.id,
@@ -94,6 +102,7 @@ class StoreService:
         )
         db.session.add(item)
         db.session.commit()
+        STORE_PURCHASES.inc("item")
 
         return {"message": f"Has comprado '{gear.name}' por {final_cost} monedas."}
     
@@ -113,7 +122,7 @@ class StoreService:
             all_skills = skill_service.get_skills_filtered(s_type, min_level, max_level, min_cost, max_cost)
 
             # Obtener skills que YA tiene el usuario
-            user = User.query.filter_by(id=user_id, deleted=False).first()
+            user = get_user(user_id)
             owned_skills = [s.id for s in user.skills]
 
             # Filtrar las que aún no tiene
@@ -0,0 +1,94 @@
+from app import db
+from app.models.task import Task
+from app.models.habit import Habit
+from app.models.project import Project
+from app.models.material import Material
+from app.models.zone import Zone
+from app.models.template import Template
+from app.services.resource_version_service import ResourceVersionService, SEARCH
+from app.utils.prefix_index import PrefixIndex
+from collections import OrderedDict
+import threading
+
+SUGGEST_MODELS = (
+    ("task", Task),
+    ("habit", Habit),
+    ("project", Project),
+    ("material", Material),
+    ("zone", Zone),
+    ("template", Template),
+)
+DEFAULT_SUGGEST_CACHE_SIZE = 512
+MAX_SUGGESTIONS = 20
+
+resource_versions = ResourceVersionService()
+
+# user_id => (versión SEARCH, PrefixIndex), del menos al más usado
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+class SuggestService:
+    """
+    Sugerencias de autocompletado para la caja de búsqueda. Por usuario se
+    construye (la primera vez que se pide) un PrefixIndex con los nombres de
+    sus tareas, hábitos, proyectos, materiales, zonas y plantillas, y se
+    guarda en memoria en un LRU acotado (Config.SEARCH_SUGGEST_CACHE_SIZE).
+
+    Cada escritura de esos nombres sube la versión SEARCH del usuario
+    (ResourceVersionService); si no coincide con la del índice en caché, se
+    reconstruye. Con el índice en caché una sugerencia cuesta la consulta
+    de la versión y una búsqueda binaria en memoria.
+    """
+
+    def suggest(self, user_id, prefix, limit=8):
+        """
+        Retorna hasta 'limit' sugerencias [{"type", "id", "name"}, ...].
+        """
+        limit = max(1, min(int(limit or 8), MAX_SUGGESTIONS))
+        if not prefix or not prefix.strip():
+            return []
+
+        index = self._get_index(int(user_id))
+        return [
+            {"type": entity_type, "id": entity_id, "name": name}
+            for entity_type, entity_id, name in index.search(prefix, limit)
+        ]
+
+    def invalidate(self, user_id=None):
+        """
+        Saca de la caché el índice de un usuario (o todos).
+        """
+        with _cache_lock:
+            if user_id is None:
+                _cache.clear()
+            else:
+                _cache.pop(int(user_id), None)
+
+    # ---- PRIVADOS ----
+    def _get_index(self, user_id):
+        version = resource_versions.get(user_id, SEARCH)
+        with _cache_lock:
+            cached = _cache.get(user_id)
+            if cached and cached[0] == version:
+                _cache.move_to_end(user_id)
+                return cached[1]
+
+        index = self._build_index(user_id)
+        with _cache_lock:
+            _cache[user_id] = (version, index)
+            _cache.move_to_end(user_id)
+            while len(_cache) > self._cache_size():
+                _cache.popitem(last=False)
+        return index
+
+    def _build_index(self, user_id):
+        entries = []
+        for entity_type, model in SUGGEST_MODELS:
+            rows = db.session.query(model.id, model.name) \
+                .filter(model.user_id == user_id, model.deleted == False)
+            entries.extend((name, (entity_type, entity_id, name)) for entity_id, name in rows)
+        return PrefixIndex(entries)
+
+    def _cache_size(self):
+        from flask import current_app
+        return current_app.config.get("SEARCH_SUGGEST_CACHE_SIZE", DEFAULT_SUGGEST_CACHE_SIZE)
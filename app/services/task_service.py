@@ -2,21 +2,30 @@ from app import db
 from app.models.task import Task
 from app.models.project import Project
 from datetime import date, datetime
-from app.services.log_service import LogService
-from app.services.stats_service import StatsService
-from app.services.zone_service import ZoneService
-from app.models.user import User
+from app.services.reward_service import RewardService
 from app.services.global_achievement_service import GlobalAchievementService
+from app.services.achievement_counter_service import AchievementCounterService, TASKS_COMPLETED
+from app.services.search_index_service import SearchIndexService
+from app.services.resource_version_service import ResourceVersionService, AGENDA, TASKS
+from app.utils.metrics import COMPLETIONS
+from app.utils.pagination import paginate
 global_ach_svc = GlobalAchievementService()
-log_service = LogService()
-stats_service = StatsService()
-zone_service = ZoneService()
+counter_service = AchievementCounterService()
+reward_service = RewardService()
+search_index = SearchIndexService()
+resource_versions = ResourceVersionService()
 
 class TaskService:
 
     def get_tasks_with_filters(self, user_id, status=None, priority=None, cycle=None,
                                project_id=None, zone_id=None,
-                               start_date=None, end_date=None):
+                               start_date=None, end_date=None,
+                               energy_type=None, cursor=None, limit=None, include_total=False):
+        """
+        Aplica filtros sobre la tabla Task. Todos los parámetros son opcionales.
+        Incluye filtro por energía positiva/negativa.
+        Retorna una Page ordenada por id (ver app/utils/pagination.py).
+        """
         query = Task.query.filter_by(user_id=user_id, deleted=False)
 
         if status:
@@ -47,7 +56,13 @@ class TaskService:
             except:
                 pass
 
-        return query.all()
+        # Filtro por energía positiva/negativa
+        if energy_type == "positive":
+            query = query.filter(Task.energy >= 0)
+        elif energy_type == "negative":
+            query = query.filter(Task.energy < 0)
+
+        return paginate(query, Task.id, cursor=cursor, limit=limit, include_total=include_total)
 
     def get_task_by_id(self, task_id, user_id):
         t = Task.query.filter_by(id=task_id, deleted=False).first()
@@ -77,11 +92,17 @@ class TaskService:
             deleted=False
         )
         db.session.add(new_task)
+        # Una tarea creada ya completada también cuenta (update/delete la descuentan)
+        if new_task.status == "COMPLETED":
+            counter_service.increment(user_id, TASKS_COMPLETED)
+        search_index.index("task", new_task)
+        resource_versions.bump(user_id, AGENDA, TASKS)
         db.session.commit()
         return new_task
 
     def update_task(self, task_id, data, user_id):
         t = self.get_task_by_id(task_id, user_id)
+        was_completed = t.status == "COMPLETED"
         t.name = data.get('name', t.name)
         t.description = data.get('description', t.description)
         t.image = data.get('image', t.image)
@@ -96,86 +117,44 @@ class TaskService:
         t.active = data.get('active', t.active)
         t.project_id = data.get('project_id', t.project_id)
         t.parent_task_id = data.get('parent_task_id', t.parent_task_id)
+        # Mantener el contador de tareas completadas si cambia el status a mano
+        if was_completed != (t.status == "COMPLETED"):
+            counter_service.increment(user_id, TASKS_COMPLETED, 1 if t.status == "COMPLETED" else -1)
+        search_index.index("task", t)
+        resource_versions.bump(user_id, AGENDA, TASKS)
         db.session.commit()
         return t
 
     def delete_task(self, task_id, user_id):
         t = self.get_task_by_id(task_id, user_id)
         t.deleted = True
+        if t.status == "COMPLETED":
+            counter_service.increment(user_id, TASKS_COMPLETED, -1)
+        search_index.remove("task", t.id, user_id)
+        resource_versions.bump(user_id, AGENDA, TASKS)
         db.session.commit()
 
     def complete_task(self, task_id, user_id):
         t = self.get_task_by_id(task_id, user_id)
         if t.status == "COMPLETED":
             return t
-        
-        t.status = "COMPLETED"
-        db.session.commit()
-
-        # Cálculo de energía base
-        base_energy = t.energy or 0
-
-        # Verificar si user tiene double_energy_next_active
-        user = User.query.filter_by(id=user_id, deleted=False).first()
-        final_energy = base_energy
-
-        if user.double_energy_next_active:
-            final_energy *= 2
-            # desactivamos para la siguiente
-            user.double_energy_next_active = False
-
-        # Verificar stackable_energy_active
-        if user.stackable_energy_active:
-            now = datetime.utcnow()
-            if user.stackable_energy_expires and now <= user.stackable_energy_expires:
-                # Aumenta la energía en +stackable_energy_count
-                final_energy += user.stackable_energy_count
-                # incrementamos la cuenta
-                user.stackable_energy_count += 1
-            else:
-                # Se expiró, desactivar
-                user.stackable_energy_active = False
-                user.stackable_energy_count = 0
-
-        # Log
-        log_service.create_log(user_id, "TASK", t.id, final_energy)
-        # Asignar la energía final al user (o sumársela)
-        user.energy += final_energy
-
-        # Cálculo de XP
-        base_xp = t.points or 0
-        xp_gained = base_xp
-
-        # daily_first_completion_bonus => si active y no se ha usado HOY
-        today = datetime.utcnow().date()
-        if user.daily_first_completion_active:
-            if user.daily_first_completion_date == today and not user.daily_first_completion_used:
-                xp_gained *= 2
-                user.daily_first_completion_used = True
-            else:
-                # Si la fecha guardada difiere del día actual, 
-                # se expiró, reset (opcional) o dejas que el effect dure a perpetuidad.
-                pass
 
-        # double_rewards_week => si now <= user.double_rewards_until => xp*2 y coins*2
         now = datetime.utcnow()
-        coins_gained = xp_gained  # en tu caso coins = xp
-        if user.double_rewards_until and now <= user.double_rewards_until:
-            xp_gained *= 2
-            coins_gained *= 2
-
-        # xp_multiplier => si now <= xp_multiplier_expires => multiplicar xp
-        if user.xp_multiplier_expires and now <= user.xp_multiplier_expires:
-            xp_gained = int(xp_gained * user.xp_multiplier)
-        else:
-            # si expiró, reset
-            user.xp_multiplier = 1.0
-
-        # Actualizar XP y coins
-        user.xp += xp_gained
-        user.coins += coins_gained
+        user = reward_service.load_user(user_id)
 
+        # Estado, contador, log, usuario y zona => una sola transacción
+        t.status = "COMPLETED"
+        counter_service.increment(user_id, TASKS_COMPLETED)
+        reward_service.grant(user, "TASK", t.id, t.energy, t.points,
+                             zone_id=t.project.zone_id if t.project else None, now=now)
+        resource_versions.bump(user_id, AGENDA, TASKS)
         db.session.commit()
+        COMPLETIONS.inc("task")
+
+        global_ach_svc.evaluate_achievements(user_id, event="TASK_COMPLETED", extra_data={
+            "task_id": t.id,
+            "completion_time": now
+        })
 
         return t
 
@@ -206,6 +185,7 @@ class TaskService:
         for t in tasks:
             if t.end_date and t.end_date < today and t.status == "PENDING":
                 t.status = "VENCIDA"
+        resource_versions.bump(user_id, AGENDA, TASKS)
         db.session.commit()
 
         # Luego, si quieres disparar la evaluación:
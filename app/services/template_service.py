@@ -4,6 +4,10 @@ from app.models.task import Task
 from app.models.habit import Habit
 from app.models.project import Project
 from datetime import date
+from app.services.search_index_service import SearchIndexService
+from app.services.resource_version_service import ResourceVersionService, SEARCH, AGENDA, TASKS, HABITS
+search_index = SearchIndexService()
+resource_versions = ResourceVersionService()
 
 class TemplateService:
     def get_all_templates(self, user_id, category=None):
@@ -33,6 +37,7 @@ class TemplateService:
             deleted=False
         )
         db.session.add(temp)
+        resource_versions.bump(user_id, SEARCH)
         db.session.commit()
         return temp
 
@@ -45,12 +50,14 @@ class TemplateService:
         t.priority = data.get('priority', t.priority)
         t.cycle = data.get('cycle', t.cycle)
         t.category = data.get('category', t.category)
+        resource_versions.bump(user_id, SEARCH)
         db.session.commit()
         return t
 
     def delete_template(self, template_id, user_id):
         t = self.get_by_id(template_id, user_id)
         t.deleted = True
+        resource_versions.bump(user_id, SEARCH)
         db.session.commit()
 
     def use_template(self, template_id, user_id, overrides):
@@ -93,6 +100,8 @@ class TemplateService:
                 deleted=False
             )
             db.session.add(new_task)
+            search_index.index("task", new_task)
+            resource_versions.bump(user_id, AGENDA, TASKS)
             db.session.commit()
             return TaskSchema().dump(new_task)
 
@@ -108,6 +117,8 @@ class TemplateService:
                 deleted=False
             )
             db.session.add(new_habit)
+            search_index.index("habit", new_habit)
+            resource_versions.bump(user_id, AGENDA, HABITS)
             db.session.commit()
             return HabitSchema().dump(new_habit)
 
@@ -123,6 +134,8 @@ class TemplateService:
                 deleted=False
             )
             db.session.add(new_project)
+            search_index.index("project", new_project)
+            resource_versions.bump(user_id, AGENDA)
             db.session.commit()
             return ProjectSchema().dump(new_project)
 
@@ -5,6 +5,7 @@ from app import db
 from app.models.user import User
 from app.models.personal_data import PersonalData
 from app.models.role import Role
+from app.utils.principal import get_user, forget_user
 
 class UserService:
 
@@ -12,7 +13,7 @@ class UserService:
         return User.query.filter_by(deleted=False).all()
 
     def get_user_by_id(self, user_id):
-        user = User.query.filter_by(id=user_id, deleted=False).first()
+        user = get_user(user_id)
         if not user:
             raise Exception("User no encontrado.")
         return user
@@ -124,6 +125,7 @@ class UserService:
         user = self.get_user_by_id(user_id)
         user.deleted = True
         db.session.commit()
+        forget_user(user_id)
         # También se marca personal_data como borrado si deseas
         if user.personal_data:
             user.personal_data.deleted = True
@@ -3,6 +3,10 @@ from app.models.zone import Zone
 from app.models.project import Project
 from app.models.task import Task
 from app.models.habit import Habit
+from app.utils.counters import increment_columns, raise_level
+from app.utils.progression import get_curve
+from app.services.resource_version_service import ResourceVersionService, SEARCH, AGENDA, TASKS, HABITS, ZONES
+resource_versions = ResourceVersionService()
 
 class ZoneService:
 
@@ -54,6 +58,7 @@ class ZoneService:
             deleted=False
         )
         db.session.add(z)
+        resource_versions.bump(user_id, SEARCH, ZONES)
         db.session.commit()
         return z
 
@@ -66,12 +71,15 @@ class ZoneService:
         z.energy = data.get('energy', z.energy)
         z.xp = data.get('xp', z.xp)
         z.level = data.get('level', z.level)
+        # La agenda muestra el nombre de la zona
+        resource_versions.bump(user_id, SEARCH, ZONES, AGENDA)
         db.session.commit()
         return z
 
     def delete_zone(self, zone_id, user_id):
         z = self.get_zone_by_id(zone_id, user_id)
         z.deleted = True
+        resource_versions.bump(user_id, SEARCH, ZONES, AGENDA)
         db.session.commit()
 
     def get_zone_stats(self, zone_id, user_id):
@@ -101,6 +109,7 @@ class ZoneService:
             if project.user_id != user_id:
                 raise Exception("No tienes acceso a este proyecto")
             project.zone_id = z.id
+            resource_versions.bump(user_id, AGENDA, TASKS)
             db.session.commit()
 
         elif obj_type == 'task':
@@ -122,6 +131,7 @@ class ZoneService:
             if habit.user_id != user_id:
                 raise Exception("No tienes acceso a este hábito")
             habit.zone_id = z.id
+            resource_versions.bump(user_id, AGENDA, HABITS)
             db.session.commit()
 
         else:
@@ -135,15 +145,22 @@ class ZoneService:
         if not z:
             raise Exception("Zona no encontrada")
 
-        z.xp += xp_gained
+        result = self.apply_xp_to_zone(z, xp_gained)
+        db.session.commit()
+        return result
 
-        level_up = False
-        while z.xp >= xp_needed_for_zone_level(z.level + 1):
-            z.level += 1
-            level_up = True
-            z.yellow_gems += 1  # +1 gema amarilla al subir de nivel
+    def apply_xp_to_zone(self, z, xp_gained):
+        """
+        Parte sin commit de add_xp_to_zone, sobre una Zone ya cargada.
+        """
+        increment_columns(z, {"xp": xp_gained})
+        resource_versions.bump(z.user_id, ZONES)
+
+        # Nivel desde la xp resultante con la curva de zona; gemas amarillas por nivel
+        curve = get_curve("zone")
+        target_level, _, _ = curve.level_up(z.level, z.xp)
+        level_up = raise_level(z, target_level, "yellow_gems", curve.gems_per_level) > 0
 
-        db.session.commit()
         return {
             "zone_id": z.id,
             "zone_level": z.level,
@@ -154,6 +171,7 @@ class ZoneService:
 
 def xp_needed_for_zone_level(level):
     """
-    Lógica para la progresión de nivel de zona.
+    XP total para cada nivel de zona según la curva configurada
+    (por defecto lineal: 50 * level).
     """
-    return 50 * level
\ No newline at end of file
+    return get_curve("zone").xp_for_level(level)
\ No newline at end of file
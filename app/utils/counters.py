@@ -0,0 +1,96 @@
+# app/utils/counters.py
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+
+def increment_or_insert(model, keys, increments):
+    """
+    Incrementa contadores de una fila identificada por 'keys' con un
+    UPDATE ... SET col = col + delta (sin leer la fila). Si la fila aún no
+    existe, la inserta con los deltas como valor inicial; si otra petición la
+    insertó a la vez (violación de unique), se repite el UPDATE.
+
+    - model: clase del modelo (debe tener unique sobre las columnas de 'keys')
+    - keys: dict {columna: valor} que identifica la fila
+    - increments: dict {columna: delta}
+
+    No hace commit: se ejecuta dentro de la transacción del llamador.
+    """
+    from app import db
+
+    filters = [getattr(model, col) == val for col, val in keys.items()]
+    values = {getattr(model, col): getattr(model, col) + delta for col, delta in increments.items()}
+
+    if model.query.filter(*filters).update(values, synchronize_session=False):
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(model(**keys, **increments))
+    except IntegrityError:
+        model.query.filter(*filters).update(values, synchronize_session=False)
+
+def increment_columns(obj, increments, conditions=()):
+    """
+    Suma deltas a columnas de una fila ya cargada con un único
+    UPDATE ... SET col = col + delta WHERE id = :id [AND conditions]
+    (con RETURNING si la BD lo soporta; si no, se relee la fila en la misma
+    transacción, que ya tiene el lock de escritura del UPDATE).
+
+    Los valores resultantes se dejan en 'obj' como valores ya persistidos,
+    así que la sesión no los vuelve a escribir al hacer flush.
+
+    - conditions: guardas extra (p.ej. User.coins >= coste) para descontar
+      sin quedar en negativo aunque haya peticiones concurrentes.
+    Retorna False si ninguna fila cumplía las condiciones (no se cambia nada).
+    No hace commit.
+    """
+    from app import db
+
+    model = type(obj)
+    columns = [getattr(model, col) for col in increments]
+    stmt = update(model).where(model.id == obj.id, *conditions) \
+        .values({getattr(model, col): getattr(model, col) + delta for col, delta in increments.items()}) \
+        .execution_options(synchronize_session=False)
+
+    if getattr(db.engine.dialect, "update_returning", False):
+        row = db.session.execute(stmt.returning(*columns)).first()
+        if row is None:
+            return False
+    else:
+        if db.session.execute(stmt).rowcount == 0:
+            return False
+        row = db.session.query(*columns).filter(model.id == obj.id).one()
+
+    for col, value in zip(increments, row):
+        set_committed_value(obj, col, value)
+    return True
+
+def raise_level(obj, new_level, gem_column, gems_per_level=1):
+    """
+    Sube 'level' hasta 'new_level' sumando a 'gem_column' 'gems_per_level'
+    gemas por nivel ganado, en un solo UPDATE condicionado a level < new_level. Si dos
+    peticiones calculan a la vez la misma subida, solo la primera la aplica
+    y las gemas no se duplican. Retorna cuántos niveles ha subido esta llamada.
+    No hace commit.
+    """
+    from app import db
+
+    model = type(obj)
+    level_col = getattr(model, "level")
+    gem_col = getattr(model, gem_column)
+    previous = obj.level or 0
+    if new_level <= previous:
+        return 0
+
+    # En MySQL las asignaciones se evalúan en orden y ven los valores ya
+    # actualizados: las gemas deben calcularse antes de cambiar level.
+    stmt = update(model).where(model.id == obj.id, level_col < new_level) \
+        .ordered_values((gem_col, gem_col + (new_level - level_col) * gems_per_level), (level_col, new_level)) \
+        .execution_options(synchronize_session=False)
+    if db.session.execute(stmt).rowcount == 0:
+        return 0
+
+    level, gems = db.session.query(level_col, gem_col).filter(model.id == obj.id).one()
+    set_committed_value(obj, "level", level)
+    set_committed_value(obj, gem_column, gems)
+    return level - previous
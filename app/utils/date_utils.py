@@ -0,0 +1,19 @@
+# app/utils/date_utils.py
+from datetime import date, datetime
+
+def to_date(value):
+    """
+    Normaliza un valor a date: acepta date, datetime o string "YYYY-MM-DD"
+    (lo que puede llegar desde el JSON de una petición). Retorna None si no se
+    puede interpretar.
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
@@ -8,6 +8,10 @@ def create_database_if_not_exists(app):
     db_uri = app.config["SQLALCHEMY_DATABASE_URI"]
     url = make_url(db_uri)
 
+    # Solo aplica a MySQL (p.ej. con SQLite en benchmarks no hay servidor al que conectar)
+    if not url.drivername.startswith("mysql"):
+        return
+
     # Conexión al servidor MySQL sin seleccionar base de datos
     connection = pymysql.connect(
         host=url.host,
@@ -0,0 +1,38 @@
+# app/utils/http_cache.py
+from datetime import timezone
+from flask import make_response, request
+
+def not_modified(etag, last_modified=None):
+    """
+    Respuesta 304 si la petición ya tiene esta versión (If-None-Match con
+    el ETag débil o, si no lo manda, If-Modified-Since >= last_modified);
+    None si hay que generar la respuesta.
+    """
+    last_modified = _http_time(last_modified)
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        fresh = bool(since and last_modified and last_modified <= since)
+    if not fresh:
+        return None
+    return set_cache_headers(make_response("", 304), etag, last_modified)
+
+def set_cache_headers(response, etag, last_modified=None):
+    """
+    ETag débil (W/"...") y Last-Modified; el cliente debe revalidar siempre.
+    """
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = _http_time(last_modified)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+# ---- PRIVADOS ----
+def _http_time(value):
+    # HTTP solo tiene segundos; los naive se toman como UTC
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
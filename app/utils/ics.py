@@ -0,0 +1,61 @@
+# app/utils/ics.py
+from datetime import timedelta, timezone
+
+CRLF = "\r\n"
+
+def escape_text(value):
+    """
+    Escapa un valor TEXT de iCalendar (RFC 5545, 3.3.11).
+    """
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,") \
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+
+def fold_line(line):
+    """
+    Parte una línea en trozos de como mucho 75 octetos (UTF-8); las
+    continuaciones empiezan con un espacio. Retorna la línea con su CRLF.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + CRLF
+    chunks, current, size, limit = [], [], 0, 75
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            chunks.append("".join(current))
+            current, size, limit = [], 0, 74
+        current.append(char)
+        size += char_size
+    chunks.append("".join(current))
+    return (CRLF + " ").join(chunks) + CRLF
+
+def format_date(value):
+    return value.strftime("%Y%m%d")
+
+def format_utc(value):
+    """
+    datetime => "YYYYMMDDTHHMMSSZ" en UTC (los naive se toman como UTC).
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+def all_day_event(uid, summary, start, end, dtstamp, rrule=None, description=None):
+    """
+    Líneas (ya plegadas) de un VEVENT de día completo de 'start' a 'end'
+    (ambos incluidos; DTEND es exclusivo en iCalendar).
+    """
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_utc(dtstamp)}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"DTSTART;VALUE=DATE:{format_date(start)}",
+        f"DTEND;VALUE=DATE:{format_date(max(end, start) + timedelta(days=1))}",
+    ]
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
@@ -0,0 +1,388 @@
+# app/utils/metrics.py
+import atexit
+import bisect
+import glob
+import json
+import math
+import os
+import threading
+import time
+from flask import g, request
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Al pasar de este nº de hilos registrados se funden los de hilos terminados
+MAX_SHARDS = 256
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        values = self.registry._shard_values()
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+class Histogram(_Metric):
+    """
+    Cada serie es una lista: nº de observaciones por bucket (el último es
+    +Inf) y la suma al final. Se acumula sin cumular; render() la convierte.
+    """
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        values = self.registry._shard_values()
+        key = (self.name, labels)
+        cell = values.get(key)
+        if cell is None:
+            cell = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+class Gauge(_Metric):
+    """
+    Valor leído al generar las métricas con la función de set_function()
+    (sin etiquetas). Si retorna None no se publica.
+    """
+    kind = "gauge"
+
+    def __init__(self, registry, name, documentation):
+        super().__init__(registry, name, documentation)
+        self.function = None
+
+    def set_function(self, function):
+        self.function = function
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso.
+
+    Sin locks en el camino caliente: cada hilo suma en su propio dict (solo
+    lo escribe ese hilo) y al generar las métricas se suman los de todos.
+    El lock solo se toma al registrar un hilo nuevo y al leer.
+
+    Modo multiproceso (workers pre-fork): con configure(multiproc_dir) cada
+    proceso vuelca sus valores a <dir>/metrics_<pid>.json cada
+    'flush_seconds' (y al salir), y collect() suma los ficheros de todos.
+    Los contadores de procesos ya terminados se siguen sumando; los gauges,
+    solo los de procesos vivos.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self.multiproc_dir = None
+        self.flush_seconds = 5.0
+        self._atexit_registered = False
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # El hijo empieza de cero: lo heredado ya lo cuenta el padre
+            os.register_at_fork(after_in_child=self._reset)
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation):
+        return self._register(Gauge(self, name, documentation))
+
+    def configure(self, multiproc_dir=None, flush_seconds=5.0):
+        self.multiproc_dir = multiproc_dir or None
+        self.flush_seconds = flush_seconds
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            if not self._atexit_registered:
+                atexit.register(self.write_process_file)
+                self._atexit_registered = True
+
+    def ensure_flusher(self):
+        """
+        En modo multiproceso arranca (una vez por proceso) el hilo que vuelca
+        los valores a disco.
+        """
+        if self.multiproc_dir is None or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+                self._flusher.start()
+
+    def snapshot(self):
+        """
+        Valores de este proceso: {(nombre, etiquetas): valor}.
+        """
+        with self._lock:
+            self._compact()
+            shards = [values for _, values in self._shards]
+            merged = {}
+            _merge_into(merged, self._retired.items())
+        for values in shards:
+            # list() copia de una vez; el hilo dueño puede seguir escribiendo
+            _merge_into(merged, list(values.items()))
+        return merged
+
+    def read_gauges(self):
+        gauges = {}
+        for metric in self._metrics.values():
+            if metric.kind != "gauge" or metric.function is None:
+                continue
+            try:
+                value = metric.function()
+            except Exception:
+                value = None
+            if value is not None:
+                gauges[(metric.name, ())] = value
+        return gauges
+
+    def collect(self):
+        """
+        (valores, gauges) de este proceso o, en modo multiproceso, de todos.
+        """
+        if not self.multiproc_dir:
+            return self.snapshot(), self.read_gauges()
+
+        self.write_process_file()
+        values, gauges = {}, {}
+        for path in glob.glob(os.path.join(self.multiproc_dir, "metrics_*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            _merge_into(values, (((name, tuple(labels)), value) for name, labels, value in data["values"]))
+            if _pid_alive(data["pid"]):
+                _merge_into(gauges, (((name, ()), value) for name, value in data["gauges"]))
+        return values, gauges
+
+    def write_process_file(self):
+        if not self.multiproc_dir:
+            return
+        pid = os.getpid()
+        data = {
+            "pid": pid,
+            "values": [[name, list(labels), value] for (name, labels), value in self.snapshot().items()],
+            "gauges": [[name, value] for (name, _), value in self.read_gauges().items()],
+        }
+        path = os.path.join(self.multiproc_dir, f"metrics_{pid}.json")
+        # Temporal por hilo: el hilo de volcado y una lectura pueden escribir a la vez
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def render(self, values, gauges):
+        """
+        Formato de texto de Prometheus (version 0.0.4).
+        """
+        by_name = {}
+        for source in (values, gauges):
+            for (name, labels), value in source.items():
+                by_name.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, value in sorted(by_name.get(metric.name, ())):
+                pairs = list(zip(metric.labelnames, labels))
+                if metric.kind != "histogram":
+                    lines.append(f"{metric.name}{_labels(pairs)} {_number(value)}")
+                    continue
+                running = 0
+                for bound, count in zip(metric.buckets + (math.inf,), value[:-1]):
+                    running += count
+                    lines.append(f"{metric.name}_bucket{_labels(pairs + [('le', _number(bound))])} {running}")
+                lines.append(f"{metric.name}_sum{_labels(pairs)} {_number(value[-1])}")
+                lines.append(f"{metric.name}_count{_labels(pairs)} {running}")
+        return "\n".join(lines) + "\n"
+
+    def exposition(self):
+        return self.render(*self.collect())
+
+    # ---- PRIVADOS ----
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise Exception(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._flusher = None
+
+    def _shard_values(self):
+        values = getattr(self._local, "values", None)
+        if values is None:
+            values = self._local.values = {}
+            with self._lock:
+                if len(self._shards) >= MAX_SHARDS:
+                    self._compact()
+                self._shards.append((threading.current_thread(), values))
+        return values
+
+    def _compact(self):
+        # Con el lock tomado: los hilos terminados ya no escriben en su dict
+        alive = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                alive.append((thread, values))
+            else:
+                _merge_into(self._retired, values.items())
+        self._shards = alive
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.write_process_file()
+            except OSError:
+                pass
+
+def _merge_into(target, items):
+    for key, value in items:
+        current = target.get(key)
+        if current is None:
+            target[key] = list(value) if isinstance(value, list) else value
+        elif isinstance(value, list):
+            for i, v in enumerate(value):
+                current[i] += v
+        else:
+            target[key] = current + value
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+registry = MetricsRegistry()
+
+# ---- HTTP (register_metrics) ----
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Peticiones HTTP atendidas.", ("blueprint", "route", "method", "status"))
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Duración de las peticiones HTTP.", ("blueprint", "route", "method"))
+HTTP_ERRORS = registry.counter(
+    "http_request_errors_total", "Peticiones respondidas con 5xx.", ("blueprint", "route", "status"))
+HTTP_EXCEPTIONS = registry.counter(
+    "http_request_exceptions_total", "Excepciones no controladas en peticiones.", ("blueprint", "route", "exception"))
+
+# ---- Pool de conexiones de SQLAlchemy (register_metrics) ----
+DB_POOL_SIZE = registry.gauge("db_pool_size", "Tamaño configurado del pool de conexiones.")
+DB_POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Conexiones del pool en uso.")
+DB_POOL_CHECKED_IN = registry.gauge("db_pool_checked_in", "Conexiones libres en el pool.")
+DB_POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Conexiones abiertas por encima de pool_size.")
+
+# ---- Dominio ----
+COMPLETIONS = registry.counter(
+    "completions_total", "Tareas, hábitos y proyectos completados.", ("kind",))
+ACHIEVEMENT_EVALUATIONS = registry.counter(
+    "achievement_evaluations_total", "Evaluaciones de logros globales por evento.", ("event",))
+ACHIEVEMENTS_GRANTED = registry.counter(
+    "achievements_granted_total", "Logros globales otorgados.")
+STORE_PURCHASES = registry.counter(
+    "store_purchases_total", "Compras en la tienda.", ("kind",))
+
+def _request_labels():
+    rule = request.url_rule
+    return request.blueprint or "", rule.rule if rule is not None else "<unmatched>"
+
+def _observe(status, duration):
+    blueprint, route = _request_labels()
+    HTTP_REQUESTS.inc(blueprint, route, request.method, str(status))
+    HTTP_LATENCY.observe(duration, blueprint, route, request.method)
+    if status >= 500:
+        HTTP_ERRORS.inc(blueprint, route, str(status))
+
+def register_metrics(app, db):
+    """
+    Si METRICS_ENABLED, mide cada petición (nº y latencia por blueprint y
+    plantilla de ruta, 5xx y excepciones) y publica el estado del pool de
+    conexiones. Las métricas se sirven en GET /admin/metrics.
+    """
+    if not app.config.get("METRICS_ENABLED", True):
+        return None
+    registry.configure(app.config.get("METRICS_MULTIPROC_DIR"), app.config.get("METRICS_FLUSH_SECONDS", 5))
+
+    # El engine se resuelve al leer las métricas, no aquí (create_app no abre conexiones)
+    engines = []
+
+    def pool_stat(method_name, floor=None):
+        def read():
+            if not engines:
+                with app.app_context():
+                    engines.append(db.engine)
+            method = getattr(engines[0].pool, method_name, None)
+            if method is None:
+                return None
+            value = method()
+            return value if floor is None else max(floor, value)
+        return read
+
+    DB_POOL_SIZE.set_function(pool_stat("size"))
+    DB_POOL_CHECKED_OUT.set_function(pool_stat("checkedout"))
+    DB_POOL_CHECKED_IN.set_function(pool_stat("checkedin"))
+    # QueuePool.overflow() empieza en -pool_size; se publica desde 0
+    DB_POOL_OVERFLOW.set_function(pool_stat("overflow", floor=0))
+
+    @app.before_request
+    def _start_metrics():
+        registry.ensure_flusher()
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_metrics(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            _observe(response.status_code, time.perf_counter() - start)
+        return response
+
+    @app.teardown_request
+    def _record_exception(exc):
+        start = g.pop("_metrics_start", None)
+        if exc is not None:
+            blueprint, route = _request_labels()
+            HTTP_EXCEPTIONS.inc(blueprint, route, type(exc).__name__)
+        if start is not None:
+            # La excepción se propagó sin pasar por after_request
+            _observe(500, time.perf_counter() - start)
+
+    return registry
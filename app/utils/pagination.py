@@ -0,0 +1,138 @@
+# app/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+class Page:
+    """
+    Una página de un listado: sus elementos, el cursor de la siguiente
+    (None si es la última) y el total del filtro si se pidió.
+    """
+    __slots__ = ("items", "next_cursor", "limit", "total")
+
+    def __init__(self, items, next_cursor, limit, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.limit = limit
+        self.total = total
+
+    def to_dict(self, items):
+        """
+        Respuesta JSON común de los listados; 'items' ya serializados.
+        """
+        data = {
+            "items": items,
+            "next_cursor": self.next_cursor,
+            "has_more": self.next_cursor is not None,
+            "limit": self.limit,
+        }
+        if self.total is not None:
+            data["total"] = self.total
+        return data
+
+def pagination_args(args):
+    """
+    cursor, limit e include_total de los query params, para pasarlos tal
+    cual a los servicios (y de ahí a paginate):
+
+        page = task_service.get_tasks_with_filters(..., **pagination_args(request.args))
+    """
+    return {
+        "cursor": args.get("cursor") or None,
+        "limit": args.get("limit"),
+        "include_total": (args.get("include_total") or "").lower() == "true",
+    }
+
+def paginate(query, id_column, sort_column=None, descending=False,
+             cursor=None, limit=None, include_total=False):
+    """
+    Paginación por clave (keyset): ORDER BY sort_column, id_column y el
+    cursor guarda (sort, id) del último elemento devuelto, así cada página
+    es un rango del índice y la página 100 cuesta lo mismo que la primera
+    (sin OFFSET). El id desempata, el orden es estable aunque se inserten
+    filas entre peticiones.
+
+    Los NULL de sort_column van al principio en orden ascendente y al final
+    en descendente (como los ordenan MySQL y SQLite).
+    El total (un COUNT sobre todo el filtro) solo se calcula si include_total.
+    Lanza Exception si el cursor o el limit no son válidos.
+    """
+    limit = _parse_limit(limit)
+    columns = [sort_column, id_column] if sort_column is not None else [id_column]
+    total = query.order_by(None).count() if include_total else None
+
+    if cursor:
+        query = query.filter(_after(columns, _decode(cursor, columns), descending))
+    order = [column.desc() if descending else column.asc() for column in columns]
+
+    # Se pide uno más para saber si hay otra página
+    items = query.order_by(*order).limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _encode(columns, items[-1])
+    return Page(items, next_cursor, limit, total)
+
+# ---- PRIVADOS ----
+def _parse_limit(limit):
+    if limit in (None, ""):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise Exception(f"limit debe ser un entero entre 1 y {MAX_LIMIT}")
+    if limit < 1:
+        raise Exception(f"limit debe ser un entero entre 1 y {MAX_LIMIT}")
+    return min(limit, MAX_LIMIT)
+
+def _after(columns, values, descending):
+    """
+    Condición "viene después del cursor" en el orden del listado.
+    """
+    if len(columns) == 1:
+        return columns[0] < values[0] if descending else columns[0] > values[0]
+
+    (sort, id_column), (value, last_id) = columns, values
+    if descending:
+        if value is None:
+            return and_(sort.is_(None), id_column < last_id)
+        return or_(sort < value, and_(sort == value, id_column < last_id), sort.is_(None))
+    if value is None:
+        return or_(and_(sort.is_(None), id_column > last_id), sort.isnot(None))
+    return or_(sort > value, and_(sort == value, id_column > last_id))
+
+def _encode(columns, item):
+    values = []
+    for column in columns:
+        value = getattr(item, column.key)
+        values.append(value.isoformat() if isinstance(value, (date, datetime)) else value)
+    # El nombre de la clave evita usar el cursor de un listado en otro ordenado distinto
+    raw = json.dumps([columns[0].key, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode(cursor, columns):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, values = json.loads(raw)
+        if key != columns[0].key or len(values) != len(columns):
+            raise ValueError
+        return [_parse_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, binascii.Error):
+        raise Exception("Cursor no válido")
+
+def _parse_value(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is int and not isinstance(value, int):
+        raise ValueError
+    return value
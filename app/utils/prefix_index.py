@@ -0,0 +1,63 @@
+# app/utils/prefix_index.py
+from bisect import bisect_left
+from app.utils.text_search import tokenize
+
+def normalize_key(text):
+    """
+    "  Hábito: Leer  " => "habito leer" (minúsculas, sin acentos, palabras
+    separadas por un espacio).
+    """
+    return " ".join(tokenize(text))
+
+class PrefixIndex:
+    """
+    Índice de prefijos inmutable sobre nombres: dos arrays ordenados de
+    claves normalizadas en los que se busca con bisect.
+      - heads: el nombre entero ("estudiar programacion")
+      - words: el nombre desde cada palabra interior ("programacion")
+    search("prog") devuelve primero los nombres que empiezan por el prefijo
+    y luego los que lo tienen al inicio de otra palabra, en orden alfabético.
+
+    entries: iterable de (nombre, payload); payload es lo que se retorna.
+    """
+
+    def __init__(self, entries):
+        self.payloads = []
+        heads, words = [], []
+        for name, payload in entries:
+            key = normalize_key(name)
+            if not key:
+                continue
+            i = len(self.payloads)
+            self.payloads.append(payload)
+            heads.append((key, i))
+            pos = key.find(" ")
+            while pos != -1:
+                words.append((key[pos + 1:], i))
+                pos = key.find(" ", pos + 1)
+
+        heads.sort()
+        words.sort()
+        self._heads = ([k for k, _ in heads], [i for _, i in heads])
+        self._words = ([k for k, _ in words], [i for _, i in words])
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def search(self, prefix, limit=10):
+        prefix = normalize_key(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        found, seen = [], set()
+        for keys, idx in (self._heads, self._words):
+            pos = bisect_left(keys, prefix)
+            while pos < len(keys) and keys[pos].startswith(prefix):
+                i = idx[pos]
+                if i not in seen:
+                    seen.add(i)
+                    found.append(self.payloads[i])
+                    if len(found) >= limit:
+                        return found
+                pos += 1
+        return found
@@ -0,0 +1,55 @@
+# app/utils/principal.py
+from flask import g, has_request_context
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.orm import joinedload
+
+def current_user_id():
+    """
+    Id (int) del usuario del JWT de la petición actual.
+    """
+    identity = get_jwt_identity()
+    return int(identity) if identity is not None else None
+
+def get_user(user_id):
+    """
+    Retorna el User (no borrado) con su UserEffects ya cargado. Dentro de una
+    petición se consulta una sola vez por id: controlador, servicios y
+    evaluador de logros comparten la misma instancia. Fuera de una petición
+    (CLI, hilos en segundo plano) siempre se consulta.
+    Retorna None si no existe.
+    """
+    if user_id is None:
+        return None
+    user_id = int(user_id)
+    if not has_request_context():
+        return _query_user(user_id)
+
+    cache = g.setdefault("_principal_users", {})
+    if user_id not in cache:
+        cache[user_id] = _query_user(user_id)
+    return cache[user_id]
+
+def forget_user(user_id):
+    """
+    Saca un usuario de la caché de la petición (p.ej. tras borrarlo).
+    """
+    if has_request_context():
+        g.setdefault("_principal_users", {}).pop(int(user_id), None)
+
+def register_principal_cache(app):
+    """
+    Vacía la caché de get_user() al terminar cada petición (el app context, y
+    por tanto 'g', puede ser compartido por varias peticiones, p.ej. con el
+    test client). No se registra user_lookup_loader: flask_jwt_extended lo
+    ejecutaría en cada @jwt_required, antes de poder responder 304; el
+    usuario se carga solo cuando un servicio llama a get_user().
+    """
+    @app.teardown_request
+    def _forget_principals(exc):
+        g.pop("_principal_users", None)
+
+# ---- PRIVADOS ----
+def _query_user(user_id):
+    from app.models.user import User
+    return User.query.options(joinedload(User.user_effects)) \
+        .filter_by(id=user_id, deleted=False).first()
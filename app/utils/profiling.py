@@ -0,0 +1,197 @@
+# app/utils/profiling.py
+import heapq
+import json
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+_PARAM = re.compile(r"%\(\w+\)s|%s|:\w+|\?")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+MAX_SQL_LENGTH = 300
+
+def normalize_sql(statement, max_length=MAX_SQL_LENGTH):
+    """
+    SQL sin valores para agrupar sentencias iguales: parámetros y literales
+    => "?", listas IN (?, ?, ...) => (?...), espacios colapsados.
+    """
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _LITERAL.sub("?", _PARAM.sub("?", sql))
+    sql = _IN_LIST.sub("(?...)", sql)
+    return sql[:max_length]
+
+class RequestProfile:
+    """
+    Medidas de una petición: nº de sentencias, tiempo total en BD y las
+    'top' sentencias más lentas (montículo acotado; el SQL solo se
+    normaliza al leerlas).
+    """
+    __slots__ = ("start", "statements", "db_time", "top", "slowest", "_pending")
+
+    def __init__(self, top):
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.top = top
+        self.slowest = []
+        self._pending = None
+
+    def record(self, statement, duration):
+        self.statements += 1
+        self.db_time += duration
+        entry = (duration, self.statements, statement)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def slowest_statements(self):
+        return [
+            {"ms": round(duration * 1000, 2), "sql": normalize_sql(statement)}
+            for duration, _, statement in sorted(self.slowest, reverse=True)
+        ]
+
+class AdminLogWriter:
+    """
+    Guarda AdminLog desde un hilo en segundo plano para no alargar la
+    petición: submit() solo encola (si la cola está llena, descarta y cuenta
+    en 'dropped'); el hilo escribe por lotes en su propio app context.
+    """
+
+    def __init__(self, app, maxsize=1000, batch_size=50):
+        self.app = app
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, level, message, details=None):
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((level, message[:255], details, datetime.utcnow()))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """
+        Espera a que se escriba todo lo encolado (tests / benchmarks).
+        """
+        self.queue.join()
+
+    # ---- PRIVADOS ----
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="admin-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        from app import db
+        from app.models.admin_log import AdminLog
+
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self.app.app_context():
+                    db.session.add_all([
+                        AdminLog(level=level, message=message, details=details, created_at=created_at, deleted=False)
+                        for level, message, details, created_at in batch
+                    ])
+                    db.session.commit()
+            except Exception:
+                self.app.logger.exception("No se pudieron guardar %d registros de admin_log", len(batch))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+def register_profiling(app, db):
+    """
+    Si PROFILING_ENABLED, mide cada petición con eventos del engine
+    (before/after_cursor_execute) y hooks de Flask:
+      - cabecera Server-Timing: db (tiempo y nº de sentencias), app y total
+      - peticiones >= PROFILING_SLOW_REQUEST_MS => AdminLog WARN con las
+        sentencias más lentas en 'details' (JSON), vía AdminLogWriter
+    Fuera de una petición (CLI, hilos) los eventos no hacen nada.
+    """
+    if not app.config.get("PROFILING_ENABLED"):
+        return None
+
+    top = app.config.get("PROFILING_TOP_STATEMENTS", 3)
+    slow_ms = app.config.get("PROFILING_SLOW_REQUEST_MS", 500)
+    server_timing = app.config.get("PROFILING_SERVER_TIMING", True)
+    writer = AdminLogWriter(app)
+    app.extensions["profiling_writer"] = writer
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            profile = g.get("_profile")
+            if profile is not None:
+                profile._pending = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            profile = g.get("_profile")
+            if profile is not None and profile._pending is not None:
+                profile.record(statement, time.perf_counter() - profile._pending)
+                profile._pending = None
+
+    @app.before_request
+    def _start_profile():
+        g._profile = RequestProfile(top)
+
+    @app.after_request
+    def _finish_profile(response):
+        profile = g.pop("_profile", None)
+        if profile is None:
+            return response
+        total_ms = (time.perf_counter() - profile.start) * 1000
+        db_ms = profile.db_time * 1000
+
+        if server_timing:
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={db_ms:.1f};desc="{profile.statements} sql", '
+                f'app;dur={total_ms - db_ms:.1f}, total;dur={total_ms:.1f}'
+            )
+
+        if total_ms >= slow_ms:
+            writer.submit(
+                "WARN",
+                f"Petición lenta: {request.method} {request.path} {total_ms:.0f} ms "
+                f"({profile.statements} SQL, {db_ms:.0f} ms en BD) => {response.status_code}",
+                json.dumps({
+                    "method": request.method,
+                    "path": request.full_path.rstrip("?"),
+                    "endpoint": request.endpoint,
+                    "status": response.status_code,
+                    "total_ms": round(total_ms, 1),
+                    "db_ms": round(db_ms, 1),
+                    "statements": profile.statements,
+                    "slowest": profile.slowest_statements(),
+                }, ensure_ascii=False)
+            )
+        return response
+
+    @app.teardown_request
+    def _drop_profile(exc):
+        g.pop("_profile", None)
+
+    return writer
@@ -0,0 +1,141 @@
+# app/utils/progression.py
+from bisect import bisect_right
+import threading
+
+# Curvas por defecto: las mismas que había fijas en código
+# (usuario: 100 * nivel, zona: 50 * nivel). Se pueden cambiar en Config con
+# USER_LEVEL_CURVE / ZONE_LEVEL_CURVE.
+DEFAULT_CURVES = {
+    "user": {"type": "linear", "base": 100, "gems_per_level": 1},
+    "zone": {"type": "linear", "base": 50, "gems_per_level": 1},
+}
+
+# Niveles que se precalculan de entrada; la tabla crece sola si hace falta
+# hasta MAX_LEVEL (o el "max_level" de la curva)
+INITIAL_LEVELS = 200
+MAX_LEVEL = 10000
+
+class ProgressionCurve:
+    """
+    Curva de niveles con la XP acumulada mínima de cada nivel precalculada:
+    thresholds[i] es la XP total necesaria para el nivel i + 1 (nivel 1 = 0 XP).
+    level_for_xp() es un bisect sobre la tabla (O(log n)), así que una subida
+    de muchos niveles de golpe no itera nivel a nivel.
+
+    - threshold_fn(level): XP total necesaria para 'level' (level >= 2)
+    - max_level: tope de la curva (en las de tabla, el último nivel de la tabla)
+    - strict: si la curva no es creciente se lanza excepción (tablas); si no,
+      cada nivel cuesta al menos 1 XP más que el anterior (redondeos)
+    """
+
+    def __init__(self, threshold_fn, gems_per_level=1, max_level=MAX_LEVEL, strict=False):
+        self.threshold_fn = threshold_fn
+        self.gems_per_level = gems_per_level
+        self.max_level = max_level
+        self.strict = strict
+        self.thresholds = [0]
+        self._lock = threading.Lock()
+        self._extend(INITIAL_LEVELS)
+
+    def level_for_xp(self, xp):
+        xp = xp or 0
+        while self._can_grow() and xp >= self.thresholds[-1]:
+            self._extend(len(self.thresholds) * 2)
+        return max(1, bisect_right(self.thresholds, xp))
+
+    def xp_for_level(self, level):
+        """
+        XP total necesaria para llegar a 'level'.
+        """
+        if level <= 1:
+            return 0
+        while self._can_grow() and level > len(self.thresholds):
+            self._extend(len(self.thresholds) * 2)
+        if level > len(self.thresholds):
+            raise Exception(f"La curva de niveles no llega al nivel {level}.")
+        return self.thresholds[level - 1]
+
+    def level_up(self, current_level, xp):
+        """
+        Retorna (nuevo_nivel, niveles_ganados, gemas) para un total de XP.
+        Nunca baja de nivel: si la XP se corrige a la baja, se conserva el actual.
+        """
+        new_level = max(current_level or 1, self.level_for_xp(xp))
+        gained = new_level - (current_level or 1)
+        return new_level, gained, gained * self.gems_per_level
+
+    # ---- MÉTODOS PRIVADOS ----
+    def _can_grow(self):
+        return len(self.thresholds) < self.max_level
+
+    def _extend(self, levels):
+        levels = min(levels, self.max_level)
+        with self._lock:
+            # Se construye aparte y se publica de golpe: los lectores sin lock
+            # ven siempre una tabla completa
+            thresholds = list(self.thresholds)
+            for level in range(len(thresholds) + 1, levels + 1):
+                try:
+                    value = int(self.threshold_fn(level))
+                except OverflowError:
+                    # Curva exponencial fuera de rango: se acaba aquí
+                    self.max_level = len(thresholds)
+                    break
+                if value <= thresholds[-1]:
+                    if self.strict:
+                        raise Exception(f"La curva de niveles no es creciente en el nivel {level}.")
+                    value = thresholds[-1] + 1
+                thresholds.append(value)
+            self.thresholds = thresholds
+
+def curve_from_config(spec):
+    """
+    Construye una curva desde un dict de configuración:
+      {"type": "linear",      "base": 100}               => base * nivel
+      {"type": "quadratic",   "base": 50}                => base * nivel^2
+      {"type": "exponential", "base": 100, "growth": 1.15}
+                                                          => base * growth^(nivel - 1)
+      {"type": "table", "thresholds": [100, 250, 500]}   => XP para niveles 2, 3, 4...
+    Todas admiten "gems_per_level" (por defecto 1); las de fórmula también
+    "max_level" (por defecto MAX_LEVEL).
+    """
+    curve_type = spec.get("type", "linear")
+    gems = spec.get("gems_per_level", 1)
+    base = spec.get("base", 100)
+    max_level = spec.get("max_level", MAX_LEVEL)
+
+    if curve_type == "linear":
+        return ProgressionCurve(lambda level: base * level, gems, max_level)
+    if curve_type == "quadratic":
+        return ProgressionCurve(lambda level: base * level * level, gems, max_level)
+    if curve_type == "exponential":
+        growth = spec.get("growth", 1.15)
+        if growth <= 1:
+            raise Exception("La curva exponencial necesita growth > 1.")
+        return ProgressionCurve(lambda level: round(base * growth ** (level - 1)), gems, max_level)
+    if curve_type == "table":
+        table = list(spec.get("thresholds") or [])
+        if not table:
+            raise Exception("La curva de tabla necesita 'thresholds'.")
+        return ProgressionCurve(lambda level: table[level - 2], gems, max_level=len(table) + 1, strict=True)
+    raise Exception(f"Tipo de curva de niveles no soportado: {curve_type}")
+
+_curves = {}
+
+def get_curve(kind):
+    """
+    Curva de 'user' o 'zone' según la configuración de la app (USER_LEVEL_CURVE /
+    ZONE_LEVEL_CURVE). Se construye una vez por configuración distinta.
+    """
+    spec = DEFAULT_CURVES[kind]
+    try:
+        from flask import current_app
+        spec = current_app.config.get(f"{kind.upper()}_LEVEL_CURVE") or spec
+    except RuntimeError:
+        pass  # fuera de un app context: curva por defecto
+
+    key = (kind, repr(sorted(spec.items())))
+    curve = _curves.get(key)
+    if curve is None:
+        curve = _curves[key] = curve_from_config(spec)
+    return curve
@@ -0,0 +1,49 @@
+# app/utils/query_counter.py
+import re
+from sqlalchemy import event
+
+_FROM_TABLE = re.compile(r'\bFROM\s+[`"]?(\w+)[`"]?', re.IGNORECASE)
+
+class QueryCounter:
+    """
+    Cuenta las sentencias SQL que se ejecutan en un engine mientras está
+    activo (context manager). Sirve para medir cuántas consultas hace una
+    petición o un servicio:
+
+        with QueryCounter(db.engine) as qc:
+            client.post("/tasks/1/complete", headers=...)
+        qc.count, qc.selects_from("user")
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+        return False
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def selects_from(self, table):
+        """
+        Nº de SELECT cuya tabla principal (primer FROM) es 'table'.
+        """
+        total = 0
+        for statement in self.statements:
+            if not statement.lstrip().upper().startswith("SELECT"):
+                continue
+            match = _FROM_TABLE.search(statement)
+            if match and match.group(1) == table:
+                total += 1
+        return total
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
@@ -0,0 +1,136 @@
+# app/utils/query_guard.py
+import os
+import traceback
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+# Frames de la pila que se muestran por cada N+1 (los más cercanos a la carga)
+STACK_FRAMES = 8
+
+class QueryGuardError(Exception):
+    """
+    N+1 detectado o presupuesto de consultas excedido (QUERY_GUARD_MODE=raise).
+    """
+
+def query_budget(max_statements):
+    """
+    Decorador de vista: nº máximo de sentencias SQL que puede ejecutar una
+    petición a esa ruta. Solo se comprueba con QUERY_GUARD_MODE activo.
+
+        @task_bp.route('', methods=['GET'])
+        @jwt_required()
+        @query_budget(3)
+        def get_tasks(): ...
+    """
+    def decorator(view):
+        view._query_budget = max_statements
+        return view
+    return decorator
+
+class RequestQueryGuard:
+    """
+    Sentencias y cargas perezosas de una petición. Una relación cargada de
+    forma perezosa en 'threshold' instancias distintas del mismo modelo es un
+    N+1; se guarda la pila del momento en que se detectó.
+    """
+    __slots__ = ("threshold", "statements", "lazy_loads", "stacks")
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.statements = 0
+        self.lazy_loads = {}
+        self.stacks = {}
+
+    def record_lazy_load(self, state, attribute):
+        fingerprint = f"{state.class_.__name__}.{attribute}"
+        instances = self.lazy_loads.setdefault(fingerprint, set())
+        instances.add(state.key or id(state))
+        if len(instances) == self.threshold:
+            self.stacks[fingerprint] = _app_stack()
+
+    def violations(self, budget):
+        found = [
+            f"N+1: {fingerprint} cargado de forma perezosa en {len(self.lazy_loads[fingerprint])} "
+            f"instancias en {request.method} {request.path}\n{stack}"
+            for fingerprint, stack in self.stacks.items()
+        ]
+        if budget is not None and self.statements > budget:
+            found.append(
+                f"Presupuesto de consultas excedido: {request.method} {request.path} ejecutó "
+                f"{self.statements} sentencias SQL (máximo {budget})"
+            )
+        return found
+
+def register_query_guard(app, db):
+    """
+    Detector de N+1 y presupuestos de consultas para desarrollo y pruebas
+    (QUERY_GUARD_MODE):
+      - "off": no se registra nada (por defecto)
+      - "log": cada problema se escribe en el log como WARNING con la pila
+      - "raise": además la petición termina con QueryGuardError (500, o se
+        propaga al cliente de pruebas con app.testing)
+    Se comprueba al terminar la petición, así el error no queda oculto en
+    los try/except de los controladores.
+    """
+    mode = app.config.get("QUERY_GUARD_MODE", "off")
+    if mode == "off":
+        return None
+    if mode not in ("log", "raise"):
+        raise Exception(f"QUERY_GUARD_MODE no válido: {mode} (off|log|raise)")
+    threshold = app.config.get("QUERY_GUARD_NPLUSONE_THRESHOLD", 2)
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            guard = g.get("_query_guard")
+            if guard is not None:
+                guard.statements += 1
+
+    # Eventos de sesión: comunes a todas las apps del proceso, se registran una vez
+    if not event.contains(db.session, "do_orm_execute", _on_orm_execute):
+        event.listen(db.session, "do_orm_execute", _on_orm_execute)
+
+    @app.before_request
+    def _start_query_guard():
+        g._query_guard = RequestQueryGuard(threshold)
+
+    @app.after_request
+    def _check_query_guard(response):
+        guard = g.pop("_query_guard", None)
+        if guard is None:
+            return response
+        view = current_app.view_functions.get(request.endpoint)
+        problems = guard.violations(getattr(view, "_query_budget", None))
+        for problem in problems:
+            current_app.logger.warning(problem)
+        if problems and mode == "raise":
+            raise QueryGuardError("\n\n".join(problems))
+        return response
+
+    @app.teardown_request
+    def _drop_query_guard(exc):
+        g.pop("_query_guard", None)
+
+    return mode
+
+def _on_orm_execute(orm_execute_state):
+    # Solo cargas perezosas (lazy="select"); joined/selectin no pasan por aquí
+    if not has_request_context() or not orm_execute_state.is_select:
+        return
+    if orm_execute_state.lazy_loaded_from is None:
+        return
+    guard = g.get("_query_guard")
+    if guard is not None:
+        guard.record_lazy_load(orm_execute_state.lazy_loaded_from, orm_execute_state.loader_strategy_path[-1].key)
+
+def _app_stack():
+    # Solo frames del proyecto (sin librerías ni este módulo)
+    root = os.path.dirname(current_app.root_path)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(root) and frame.filename != __file__ and "site-packages" not in frame.filename
+    ]
+    return "".join(traceback.format_list(frames[-STACK_FRAMES:]))
@@ -0,0 +1,87 @@
+# app/utils/recurrence.py
+from calendar import monthrange
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Frecuencias de Habit.frequency / Task.cycle que se repiten
+RECURRING = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+# Los hábitos no tienen fecha de inicio: los semanales caen en lunes y los
+# mensuales/anuales el día 1 (de enero), contando desde este lunes.
+DEFAULT_ANCHOR = date(2000, 1, 3)
+
+def is_recurring(frequency):
+    return (frequency or "").upper() in RECURRING
+
+def occurrences(frequency, anchor, window_start, window_end, until=None):
+    """
+    Generador de las fechas en que se repite una regla dentro de
+    [window_start, window_end] (ambos incluidos):
+      - frequency: "DAILY", "WEEKLY", "MONTHLY" o "YEARLY" (otra => nada)
+      - anchor: primera ocurrencia (define el día de la semana/del mes)
+      - until: última fecha posible (opcional)
+    No recorre desde 'anchor': salta directamente a la primera ocurrencia
+    de la ventana. En meses sin ese día (31, 30, 29 de febrero) cae en el
+    último día del mes.
+    """
+    frequency = (frequency or "").upper()
+    start = max(window_start, anchor)
+    end = min(window_end, until) if until else window_end
+    if start > end:
+        return
+
+    if frequency == "DAILY":
+        current = start
+        while current <= end:
+            yield current
+            current += timedelta(days=1)
+
+    elif frequency == "WEEKLY":
+        current = start + timedelta(days=(anchor.weekday() - start.weekday()) % 7)
+        while current <= end:
+            yield current
+            current += timedelta(days=7)
+
+    elif frequency in ("MONTHLY", "YEARLY"):
+        step = 1 if frequency == "MONTHLY" else 12
+        months = (start.year - anchor.year) * 12 + start.month - anchor.month
+        months -= months % step
+        while True:
+            year, month = divmod(anchor.month - 1 + months, 12)
+            year += anchor.year
+            current = date(year, month + 1, min(anchor.day, monthrange(year, month + 1)[1]))
+            if current > end:
+                return
+            if current >= start:
+                yield current
+            months += step
+
+@lru_cache(maxsize=4096)
+def cached_occurrences(entity_type, entity_id, version, frequency, anchor, window_start, window_end, until=None):
+    """
+    occurrences() memorizado por (entidad, versión, ventana). 'version' es
+    la versión AGENDA del usuario: cualquier cambio en sus tareas, hábitos
+    o proyectos genera claves nuevas y las viejas salen solas del LRU.
+    Retorna una tupla (inmutable, se comparte entre peticiones).
+    """
+    return tuple(occurrences(frequency, anchor, window_start, window_end, until))
+
+def rrule(frequency, anchor, until=None):
+    """
+    Regla RRULE (RFC 5545) equivalente a occurrences(), para exportar a
+    calendarios sin expandir copias. Los días 29-31 usan BYSETPOS=-1 para
+    caer en el último día de los meses que no los tienen, igual que aquí.
+    Retorna None si la frecuencia no se repite.
+    """
+    frequency = (frequency or "").upper()
+    if frequency not in RECURRING:
+        return None
+    parts = [f"FREQ={frequency}"]
+    if frequency in ("MONTHLY", "YEARLY") and anchor.day > 28:
+        if frequency == "YEARLY":
+            parts.append(f"BYMONTH={anchor.month}")
+        parts.append("BYMONTHDAY=" + ",".join(str(d) for d in range(28, anchor.day + 1)))
+        parts.append("BYSETPOS=-1")
+    if until:
+        parts.append("UNTIL=" + until.strftime("%Y%m%d"))
+    return ";".join(parts)
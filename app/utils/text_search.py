@@ -0,0 +1,96 @@
+# app/utils/text_search.py
+import re
+import unicodedata
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Palabras vacías frecuentes en español e inglés (ya sin acentos)
+STOPWORDS = frozenset("""
+a al algo como con de del el ella ellos en entre era es esta este esto ha hay la las le les lo los
+mas me mi muy no nos o para pero por que se si sin sobre su sus te tu un una uno unos y ya
+an and are as at be but by for from has have in into is it its of on or that the their this to was
+were will with
+""".split())
+
+# Sufijos derivativos que se recortan (de más largo a más corto). Es un
+# stemmer ligero para agrupar plurales y derivadas habituales en ES/EN,
+# no un Snowball completo.
+_SUFFIXES = (
+    # español
+    "amiento", "imiento", "acion", "ucion", "idad", "mente", "adora", "ador",
+    "ancia", "encia", "ando", "iendo", "able", "ible", "ista",
+    "oso", "osa", "ivo", "iva", "ado", "ada", "ido", "ida",
+    "ar", "er", "ir",
+    # inglés
+    "ation", "ating", "ated", "ment", "ness", "ing", "edly", "ed", "ly",
+)
+_VOWELS = "aeiou"
+MIN_STEM = 3
+
+def fold(text):
+    """
+    Minúsculas y sin acentos ("Hábito" => "habito").
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+def tokenize(text):
+    return _TOKEN.findall(fold(text))
+
+def stem(token):
+    """
+    Plural => sufijo derivativo => vocal final, dejando al menos MIN_STEM letras.
+    "programación", "programar", "programas", "programming" => "program"
+    """
+    if token.isdigit():
+        return token
+
+    def cut(word, suffix):
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            return word[:-len(suffix)]
+        return None
+
+    # 1) plural: "tareas" => "tarea", "activities" => "activiti"
+    if token.endswith("s") and not token.endswith("ss"):
+        token = cut(token, "s") or token
+
+    # 2) un sufijo derivativo; "programm" / "runn" => consonante doble simple
+    for suffix in _SUFFIXES:
+        base = cut(token, suffix)
+        if base:
+            token = base
+            if len(token) > MIN_STEM and token[-1] == token[-2] and token[-1] not in _VOWELS:
+                token = token[:-1]
+            break
+
+    # 3) vocal final: "tarea" => "tare", "habito" => "habit"
+    if token[-1] in _VOWELS:
+        token = cut(token, token[-1]) or token
+    return token
+
+def analyze(text):
+    """
+    Texto => lista de raíces (sin palabras vacías), en el orden del texto.
+    Es lo que se guarda en el índice y lo que se busca.
+    """
+    return [stem(t) for t in tokenize(text) if t not in STOPWORDS]
+
+def index_terms(text):
+    return " ".join(analyze(text))
+
+def trigrams(text):
+    """
+    Conjunto de trigramas de las palabras de 'text' (sin acentos ni palabras
+    vacías), con el relleno de pg_trgm: "  w" al inicio y "w " al final
+    ("habito" => "  h", " ha", "hab", "abi", "bit", "ito", "to ").
+    Sirve para la búsqueda difusa: "hbito" comparte 4 de sus 6 trigramas.
+    """
+    grams = set()
+    for token in tokenize(text):
+        if token in STOPWORDS:
+            continue
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
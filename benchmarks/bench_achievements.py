@@ -0,0 +1,91 @@
+"""
+Benchmark del evaluador de logros globales (GlobalAchievementService.evaluate_achievements).
+
+Mide tiempo medio y nº de sentencias SQL por evaluación para catálogos de
+distinto tamaño. El catálogo se rellena con reglas HABIT_STREAK (que solo
+reaccionan a HABIT_COMPLETED) más unas pocas reglas de cada tipo, así que para
+HABIT_DELETED, USER_LOGIN y TASK_COMPLETED el coste debe mantenerse plano
+aunque el catálogo crezca.
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.bench_achievements --sizes 10,100,1000,5000 --runs 200
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import event as sa_event
+
+from app import create_app, db
+
+EVENTS = ("HABIT_DELETED", "USER_LOGIN", "TASK_COMPLETED")
+FIXED_RULES = ("TASKS_COMPLETED", "LOGIN_STREAK", "SURPRISE")
+
+
+def _seed_catalog(size):
+    from app.models.global_achievement import GlobalAchievement
+    from app.models.user_global_achievement import UserGlobalAchievement
+
+    UserGlobalAchievement.query.delete()
+    GlobalAchievement.query.delete()
+    rows = []
+    for cond in FIXED_RULES:
+        for i in range(3):
+            rows.append({"name": f"{cond} {i}", "condition_type": cond,
+                         "threshold": 10 ** 9, "deleted": False})
+    for i in range(max(size - len(rows), 0)):
+        rows.append({"name": f"Relleno {i}", "condition_type": "HABIT_STREAK",
+                     "threshold": 10 ** 9, "deleted": False})
+    db.session.bulk_insert_mappings(GlobalAchievement, rows)
+    db.session.commit()
+
+
+def run(sizes, runs):
+    from app.models.user import User
+    from app.services.global_achievement_service import GlobalAchievementService, achievement_index
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user = User(username="bench", email="bench@example.com", password_hash="x", login_streak=1)
+        db.session.add(user)
+        db.session.commit()
+
+        statements = [0]
+
+        def count_statement(*args):
+            statements[0] += 1
+
+        sa_event.listen(db.engine, "before_cursor_execute", count_statement)
+        svc = GlobalAchievementService()
+
+        print(f"{'catálogo':>9} {'evento':>15} {'ms/eval':>9} {'SQL/eval':>9}")
+        for size in sizes:
+            _seed_catalog(size)
+            achievement_index.invalidate()
+            svc.evaluate_achievements(user.id, "USER_LOGIN")  # carga el índice
+
+            for ev in EVENTS:
+                extra = {"completion_time": None}
+                statements[0] = 0
+                start = time.perf_counter()
+                for _ in range(runs):
+                    svc.evaluate_achievements(user.id, ev, extra_data=extra)
+                elapsed = time.perf_counter() - start
+                print(f"{size:>9} {ev:>15} {elapsed * 1000 / runs:>9.3f} {statements[0] / runs:>9.1f}")
+
+        sa_event.remove(db.engine, "before_cursor_execute", count_statement)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,100,1000,5000")
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.runs)
+
+
+if __name__ == "__main__":
+    main()
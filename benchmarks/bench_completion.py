@@ -0,0 +1,133 @@
+"""
+Benchmark de compleción de tareas, hábitos y proyectos (pipeline de recompensa).
+
+Para cada tipo mide la latencia por compleción (p50/p95/p99), el nº medio de
+sentencias SQL y el nº de commits. Con el pipeline de recompensa único debe
+haber un commit para la compleción (más el de la evaluación de logros en
+tareas y hábitos), frente a los 3-4 del cálculo anterior.
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.bench_completion --runs 500
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import event as sa_event
+
+from app import create_app, db
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _seed(runs):
+    from app.models.user import User
+    from app.models.user_effects import UserEffects
+    from app.models.zone import Zone
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.habit import Habit
+
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    now = datetime.utcnow()
+    db.session.add(UserEffects(
+        user_id=user.id,
+        stackable_energy_active=True,
+        stackable_energy_expires=now + timedelta(days=1),
+        double_rewards_until=now + timedelta(days=1),
+        xp_multiplier=1.5,
+        xp_multiplier_expires=now + timedelta(days=1)
+    ))
+    zone = Zone(name="Zona", user_id=user.id, energy=0, xp=0, level=1)
+    db.session.add(zone)
+    db.session.commit()
+
+    holder = Project(name="Contenedor", zone_id=zone.id, user_id=user.id, points=0)
+    db.session.add(holder)
+    db.session.commit()
+
+    db.session.bulk_insert_mappings(Task, [
+        {"name": f"Tarea {i}", "energy": 5, "points": 10, "status": "PENDING",
+         "user_id": user.id, "project_id": holder.id, "deleted": False}
+        for i in range(runs)
+    ])
+    db.session.bulk_insert_mappings(Project, [
+        {"name": f"Proyecto {i}", "points": 20, "zone_id": zone.id,
+         "user_id": user.id, "deleted": False}
+        for i in range(runs)
+    ])
+    habit = Habit(name="Hábito", energy=3, points=5, zone_id=zone.id,
+                  user_id=user.id, streak=0, total_check=0)
+    db.session.add(habit)
+    db.session.commit()
+    return user.id, holder.id, habit.id
+
+
+def run(runs):
+    from app.models.task import Task
+    from app.models.project import Project
+    from app.services.task_service import TaskService
+    from app.services.habit_service import HabitService
+    from app.services.project_service import ProjectService
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_id, holder_id, habit_id = _seed(runs)
+        task_ids = [row[0] for row in db.session.query(Task.id).filter_by(user_id=user_id)]
+        project_ids = [row[0] for row in db.session.query(Project.id)
+                       .filter(Project.user_id == user_id, Project.id != holder_id)]
+
+        counts = {"sql": 0, "commit": 0}
+
+        def count_statement(*args):
+            counts["sql"] += 1
+
+        def count_commit(*args):
+            counts["commit"] += 1
+
+        sa_event.listen(db.engine, "before_cursor_execute", count_statement)
+        sa_event.listen(db.engine, "commit", count_commit)
+
+        cases = (
+            ("task", lambda i: TaskService().complete_task(task_ids[i], user_id)),
+            ("habit", lambda i: HabitService().complete_habit(habit_id, user_id)),
+            ("project", lambda i: ProjectService().complete_project(project_ids[i], user_id)),
+        )
+
+        print(f"{'tipo':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'SQL':>6} {'commits':>8}")
+        for name, complete in cases:
+            samples = []
+            counts["sql"] = counts["commit"] = 0
+            for i in range(runs):
+                db.session.expire_all()
+                start = time.perf_counter()
+                complete(i)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(f"{name:>8} {percentile(samples, 50):>8.3f} {percentile(samples, 95):>8.3f} "
+                  f"{percentile(samples, 99):>8.3f} {counts['sql'] / runs:>6.1f} "
+                  f"{counts['commit'] / runs:>8.1f}")
+
+        sa_event.remove(db.engine, "before_cursor_execute", count_statement)
+        sa_event.remove(db.engine, "commit", count_commit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+    run(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark de la búsqueda difusa por trigramas (SearchIndexService.fuzzy_search).
+
+Va cargando entidades sintéticas (tareas, hábitos, proyectos y materiales
+repartidos entre --users usuarios) hasta --total, y en cada escalón mide la
+latencia de consultas con erratas de un usuario:
+  - trigramas: fuzzy_search (índice search_trigram por (user_id, trigram))
+  - recorrido: leer todos los nombres del usuario y comparar trigramas en
+    Python (lo que haría falta sin índice)
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.bench_fuzzy_search --total 100000 --users 100
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app import create_app, db
+
+SYLLABLES = ("pro", "gra", "ma", "cion", "es", "tu", "di", "ar", "ha", "bi", "to", "lec", "tu", "ra",
+             "al", "ge", "bra", "fi", "si", "ca", "co", "rrer", "me", "dit", "gim", "na", "sio",
+             "in", "gles", "mu", "web", "py", "thon", "pan", "lis", "ta", "sa", "lud")
+TYPES = ("task", "habit", "project", "material")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _word(rnd):
+    return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+
+
+def _typo(rnd, word):
+    i = rnd.randrange(len(word))
+    return word[:i] + word[i + 1:] if len(word) > 4 else word + "s"
+
+
+def _seed_users(users):
+    from app.models.user import User
+    db.session.bulk_insert_mappings(User, [
+        {"username": f"u{i}", "email": f"u{i}@example.com", "password_hash": "x"} for i in range(users)
+    ])
+    db.session.commit()
+    return [row[0] for row in db.session.query(User.id).order_by(User.id)]
+
+
+def _seed_entities(rnd, user_ids, count):
+    from app.models.task import Task
+    from app.models.habit import Habit
+    from app.models.project import Project
+    from app.models.material import Material
+
+    models = (Task, Habit, Project, Material)
+    for i, model in enumerate(models):
+        n = count // len(models) + (1 if i < count % len(models) else 0)
+        db.session.bulk_insert_mappings(model, [
+            {"name": f"{_word(rnd)} {_word(rnd)}", "user_id": rnd.choice(user_ids), "deleted": False}
+            for _ in range(n)
+        ])
+    db.session.commit()
+
+
+def _scan(user_id, query):
+    from app.models.task import Task
+    from app.models.habit import Habit
+    from app.models.project import Project
+    from app.models.material import Material
+    from app.utils.text_search import trigrams
+
+    grams = trigrams(query)
+    hits = []
+    for entity_type, model in zip(TYPES, (Task, Habit, Project, Material)):
+        for entity_id, name in db.session.query(model.id, model.name).filter_by(user_id=user_id, deleted=False):
+            shared = len(grams & trigrams(name))
+            if shared >= 0.5 * len(grams):
+                hits.append((entity_type, entity_id, shared))
+    return hits
+
+
+def run(total, users, queries, steps):
+    from app.services.search_index_service import SearchIndexService
+    from app.models.search_document import SearchDocument
+    from app.models.task import Task
+
+    rnd = random.Random(7)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        service = SearchIndexService()
+        user_ids = _seed_users(users)
+        target = user_ids[0]
+
+        print(f"{'entidades':>10} {'del usuario':>12} {'trigramas p50':>14} {'p95':>9} {'recorrido p50':>14} {'p95':>9}")
+        loaded = 0
+        for step in steps:
+            _seed_entities(rnd, user_ids, step - loaded)
+            loaded = step
+            service.rebuild(chunk_size=2000)
+
+            names = [row[0] for row in db.session.query(Task.name).filter_by(user_id=target).limit(200)]
+            probes = [_typo(rnd, rnd.choice(names).split()[rnd.randint(0, 1)]) for _ in range(queries)]
+            own = SearchDocument.query.filter_by(user_id=target).count()
+
+            indexed, scanned = [], []
+            for probe in probes:
+                start = time.perf_counter()
+                service.fuzzy_search(target, probe, limit=20)
+                indexed.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                _scan(target, probe)
+                scanned.append(time.perf_counter() - start)
+            print(f"{step:>10} {own:>12} {percentile(indexed, 50) * 1e3:>11.2f} ms {percentile(indexed, 95) * 1e3:>6.2f} ms "
+                  f"{percentile(scanned, 50) * 1e3:>11.2f} ms {percentile(scanned, 95) * 1e3:>6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+    steps = sorted({max(1, args.total // 10), args.total // 4, args.total // 2, args.total})
+    run(args.total, args.users, args.queries, steps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Registro de métricas (app/utils/metrics.py) bajo concurrencia.
+
+Varios hilos registran peticiones (contador + histograma) mientras otro
+genera la exposición en bucle, como haría Prometheus. Comprueba que al final
+los totales cuadran exactamente (no se pierden incrementos ni se cuentan dos
+veces al fundir hilos terminados) y muestra el coste por operación.
+Sale con código 1 si los totales no cuadran.
+
+Uso:
+    python -m benchmarks.bench_metrics --threads 8 --ops 50000
+"""
+import argparse
+import random
+import threading
+import time
+
+from app.utils.metrics import MetricsRegistry
+
+
+def run(threads, ops, waves):
+    registry = MetricsRegistry()
+    requests = registry.counter("bench_requests_total", "Peticiones.", ("route", "status"))
+    latency = registry.histogram("bench_request_duration_seconds", "Duración.", ("route",))
+    routes = ("/tasks", "/habits", "/stats/user", "/agenda/view")
+
+    def worker(seed):
+        rnd = random.Random(seed)
+        for _ in range(ops):
+            route = rnd.choice(routes)
+            requests.inc(route, "200")
+            latency.observe(rnd.expovariate(1 / 0.02), route)
+
+    stop = threading.Event()
+    scrapes = []
+
+    def scraper():
+        while not stop.is_set():
+            start = time.perf_counter()
+            registry.exposition()
+            scrapes.append(time.perf_counter() - start)
+
+    scraping = threading.Thread(target=scraper)
+    scraping.start()
+    start = time.perf_counter()
+    # Varias tandas de hilos de vida corta: se registran hilos nuevos y se
+    # funden los terminados mientras se sigue leyendo
+    for wave in range(waves):
+        pool = [threading.Thread(target=worker, args=(wave * threads + i,)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    scraping.join()
+
+    values = registry.snapshot()
+    expected = threads * ops * waves
+    counted = sum(v for (name, _), v in values.items() if name == "bench_requests_total")
+    observed = sum(sum(v[:-1]) for (name, _), v in values.items() if name == "bench_request_duration_seconds")
+
+    # Cada operación incluye generar la ruta y la latencia aleatorias
+    print(f"{threads} hilos x {ops} ops x {waves} tandas: {expected / elapsed / 1e3:.0f} k ops/s, "
+          f"{elapsed / expected * 1e9:.0f} ns/op")
+    print(f"exposiciones durante la carga: {len(scrapes)}, "
+          f"mediana {sorted(scrapes)[len(scrapes) // 2] * 1000 if scrapes else 0:.2f} ms")
+    print(f"contador: {counted} / {expected}; histograma: {observed} / {expected}")
+    if counted != expected or observed != expected:
+        print("MAL: los totales no cuadran")
+        return 1
+    print("OK")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50000)
+    parser.add_argument("--waves", type=int, default=3)
+    args = parser.parse_args()
+    raise SystemExit(run(args.threads, args.ops, args.waves))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Consultas SQL por petición en endpoints que cargan el usuario del JWT.
+
+Para cada endpoint cuenta las sentencias SQL totales y cuántos SELECT van a
+la tabla "user". Con la caché por petición de get_user() (app/utils/principal.py) el
+usuario se consulta una vez por petición aunque lo usen controlador,
+servicios y evaluador de logros; con --no-cache se desactiva la caché para
+comparar con el comportamiento anterior (una consulta por cada servicio).
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.bench_request_queries
+    python -m benchmarks.bench_request_queries --no-cache
+"""
+import argparse
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.utils.query_counter import QueryCounter
+
+ROUNDS = 5
+
+
+def _seed():
+    from app.models.user import User
+    from app.models.user_effects import UserEffects
+    from app.models.zone import Zone
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.habit import Habit
+    from app.models.gear import Gear
+    from app.models.effect import Effect
+    from app.models.global_achievement import GlobalAchievement
+
+    user = User(username="bench", email="bench@example.com", password_hash="x", coins=10 ** 6)
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(UserEffects(user_id=user.id))
+    zone = Zone(name="Zona", user_id=user.id)
+    effect = Effect(name="Nada", logic_key="placebo")
+    db.session.add_all([zone, effect])
+    db.session.commit()
+    project = Project(name="Proyecto", zone_id=zone.id, user_id=user.id, points=0)
+    habit = Habit(name="Hábito", energy=1, points=1, zone_id=zone.id, user_id=user.id,
+                  streak=0, total_check=0)
+    gear = Gear(name="Objeto", cost=1, max_uses=1, effect_id=effect.id)
+    db.session.add_all([project, habit, gear])
+    db.session.commit()
+    tasks = [Task(name=f"Tarea {i}", energy=1, points=1, status="PENDING",
+                  user_id=user.id, project_id=project.id) for i in range(ROUNDS)]
+    db.session.add_all(tasks)
+    for cond in ("TASKS_COMPLETED", "HABIT_CHECKS", "SURPRISE"):
+        db.session.add(GlobalAchievement(name=cond, condition_type=cond, threshold=10 ** 9))
+    db.session.commit()
+    return user.id, zone.id, habit.id, gear.id, [t.id for t in tasks]
+
+
+def run(use_cache):
+    import app.utils.principal as principal
+    if not use_cache:
+        principal.has_request_context = lambda: False
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_id, zone_id, habit_id, gear_id, task_ids = _seed()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+        engine = db.engine
+
+    client = app.test_client()
+    task_iter = iter(task_ids)
+    requests = (
+        ("POST /tasks/<id>/complete", lambda: client.post(f"/tasks/{next(task_iter)}/complete", headers=headers)),
+        ("POST /habits/<id>/complete", lambda: client.post(f"/habits/{habit_id}/complete", headers=headers)),
+        ("POST /store/items/purchase", lambda: client.post("/store/items/purchase", json={"gear_id": gear_id}, headers=headers)),
+        ("GET /stats/user", lambda: client.get("/stats/user", headers=headers)),
+        ("GET /users/me", lambda: client.get("/users/me", headers=headers)),
+    )
+
+    print(f"caché de usuario por petición: {'sí' if use_cache else 'no'}")
+    print(f"{'petición':<28} {'status':>6} {'SQL':>6} {'SELECT user':>12}")
+    for name, send in requests:
+        total = user_selects = 0
+        for _ in range(ROUNDS):
+            with QueryCounter(engine) as qc:
+                response = send()
+            total += qc.count
+            user_selects += qc.selects_from("user")
+        print(f"{name:<28} {response.status_code:>6} {total / ROUNDS:>6.1f} {user_selects / ROUNDS:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-cache", action="store_true", help="Desactiva la caché del usuario por petición.")
+    args = parser.parse_args()
+    run(not args.no_cache)
+
+
+if __name__ == "__main__":
+    main()
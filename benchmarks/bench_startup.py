@@ -0,0 +1,123 @@
+"""
+Mide el arranque de la aplicación en procesos nuevos (como un worker de
+gunicorn o un test que crea su app):
+
+  - import: `import app`
+  - create_app: la factoría completa (config, extensiones, modelos, blueprints)
+  - 1ª petición: GET /zones con JWT, que abre la primera conexión
+
+y comprueba que create_app() no abre conexiones ni ejecuta SQL (el esquema
+se prepara aparte con `flask init-db`). Sale con código 1 si create_app()
+toca la base de datos o si la mediana supera los límites.
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un proceso nuevo en cada pasada; imprime una línea JSON
+_PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+stats = {"connections": 0, "statements": 0}
+def _connect(*args):
+    stats["connections"] += 1
+def _execute(*args):
+    stats["statements"] += 1
+event.listen(Pool, "connect", _connect)
+event.listen(Engine, "before_cursor_execute", _execute)
+
+t2 = time.perf_counter()
+application = app.create_app()
+t3 = time.perf_counter()
+during_create = dict(stats)
+
+from flask_jwt_extended import create_access_token
+from app.models.user import User
+with application.app_context():
+    app.db.create_all()
+    user = User(username="startup", email="startup@example.com", password_hash="x")
+    app.db.session.add(user)
+    app.db.session.commit()
+    headers = {"Authorization": "Bearer " + create_access_token(identity=str(user.id))}
+    app.db.session.remove()
+
+client = application.test_client()
+t4 = time.perf_counter()
+status = client.get("/zones", headers=headers).status_code
+t5 = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t5 - t4) * 1000,
+    "status": status,
+    "connections": during_create["connections"],
+    "statements": during_create["statements"],
+}))
+"""
+
+
+def _probe():
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    out = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(runs, max_import_ms, max_create_ms, max_first_request_ms):
+    results = [_probe() for _ in range(runs)]
+
+    failed = False
+    print(f"{'fase':>15} {'mediana':>9} {'máx':>9} {'límite':>9}")
+    for key, limit in (("import_ms", max_import_ms),
+                       ("create_app_ms", max_create_ms),
+                       ("first_request_ms", max_first_request_ms)):
+        values = [r[key] for r in results]
+        median = statistics.median(values)
+        print(f"{key[:-3]:>15} {median:>7.1f}ms {max(values):>7.1f}ms {limit:>7.0f}ms")
+        if median > limit:
+            print(f"MAL: {key[:-3]} supera el límite")
+            failed = True
+
+    connections = max(r["connections"] for r in results)
+    statements = max(r["statements"] for r in results)
+    print(f"create_app(): {connections} conexiones, {statements} sentencias SQL")
+    if connections or statements:
+        print("MAL: create_app() no debe tocar la base de datos (usar `flask init-db`)")
+        failed = True
+    if any(r["status"] != 200 for r in results):
+        print(f"MAL: la primera petición respondió {sorted({r['status'] for r in results})}")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=1500)
+    parser.add_argument("--max-create-ms", type=float, default=1000)
+    parser.add_argument("--max-first-request-ms", type=float, default=250)
+    args = parser.parse_args()
+    raise SystemExit(run(args.runs, args.max_import_ms, args.max_create_ms, args.max_first_request_ms))
+
+
+if __name__ == "__main__":
+    main()
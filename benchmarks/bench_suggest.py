@@ -0,0 +1,102 @@
+"""
+Benchmark de /search/suggest (SuggestService).
+
+Crea un usuario con N entidades por tipo (tareas, hábitos, proyectos,
+materiales, zonas y plantillas) y mide:
+  - la construcción del índice de prefijos (primera petición o tras una escritura),
+  - la búsqueda en el índice ya en caché (p50/p95/p99),
+  - la sugerencia completa con caché caliente (incluye la consulta de versión).
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.bench_suggest --per-type 5000 --runs 2000
+"""
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app import create_app, db
+
+WORDS = ("estudiar", "programación", "leer", "correr", "hábito", "proyecto", "guía", "python",
+         "meditar", "comprar", "álgebra", "inglés", "gimnasio", "diario", "música", "web")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _seed(per_type):
+    from app.models.user import User
+    from app.models.task import Task
+    from app.models.habit import Habit
+    from app.models.project import Project
+    from app.models.material import Material
+    from app.models.zone import Zone
+    from app.models.template import Template
+
+    user = User(username="bench", email="bench@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    rnd = random.Random(42)
+    for model in (Task, Habit, Project, Material, Zone, Template):
+        db.session.bulk_insert_mappings(model, [
+            {"name": f"{rnd.choice(WORDS).capitalize()} {rnd.choice(WORDS)} {i}",
+             "user_id": user.id, "deleted": False}
+            for i in range(per_type)
+        ])
+    db.session.commit()
+    return user.id
+
+
+def _report(name, samples):
+    print(f"{name:<34} p50={percentile(samples, 50) * 1e3:8.3f} ms  "
+          f"p95={percentile(samples, 95) * 1e3:8.3f} ms  p99={percentile(samples, 99) * 1e3:8.3f} ms")
+
+
+def run(per_type, runs):
+    from app.services.suggest_service import SuggestService
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_id = _seed(per_type)
+        service = SuggestService()
+        prefixes = [w[:n] for w in WORDS for n in (1, 2, 3, 5)]
+
+        start = time.perf_counter()
+        index = service._get_index(user_id)
+        build = time.perf_counter() - start
+        print(f"{len(index)} nombres; construcción del índice: {build * 1e3:.1f} ms")
+
+        lookups = []
+        for i in range(runs):
+            prefix = prefixes[i % len(prefixes)]
+            start = time.perf_counter()
+            index.search(prefix, 8)
+            lookups.append(time.perf_counter() - start)
+        _report("búsqueda en índice (en memoria)", lookups)
+
+        full = []
+        for i in range(runs):
+            prefix = prefixes[i % len(prefixes)]
+            start = time.perf_counter()
+            service.suggest(user_id, prefix, 8)
+            full.append(time.perf_counter() - start)
+        _report("suggest() con caché caliente", full)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-type", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.per_type, args.runs)
+
+
+if __name__ == "__main__":
+    main()
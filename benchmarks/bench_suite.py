@@ -0,0 +1,184 @@
+"""
+Suite de rendimiento de los endpoints más usados sobre datos sintéticos
+(benchmarks/datagen.py), con el cliente de pruebas de Flask.
+
+Para cada endpoint y perfil de usuario (el más activo y uno mediano) hace
+una petición de calentamiento y --rounds medidas, y muestra latencia
+p50/p95/p99 y sentencias SQL por petición. Los endpoints con ETag se miden
+también revalidando (If-None-Match con el ETag del calentamiento => 304).
+Después compara con la línea
+base guardada (benchmarks/baseline.json):
+  - regresión si hay más sentencias SQL que en la línea base, o
+  - si el p95 supera el de la línea base en más de --tolerance (y de 1 ms).
+Sale con código 1 si hay regresiones. La línea base solo se compara si se
+generó con los mismos parámetros de datos y el mismo motor de BD.
+
+Uso (SQLite en memoria por defecto; DATABASE_URL para MySQL local):
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --only /search /agenda
+    python -m benchmarks.bench_suite --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.utils.query_counter import QueryCounter
+from benchmarks.datagen import generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+MIN_REGRESSION_MS = 1.0
+
+# (nombre, método, URL); el nombre es la clave en la línea base
+ENDPOINTS = (
+    ("GET /tasks", "GET", "/tasks"),
+    ("GET /tasks?status=PENDING", "GET", "/tasks?status=PENDING"),
+    ("GET /tasks?limit=20", "GET", "/tasks?limit=20"),
+    ("GET /tasks/overdue", "GET", "/tasks/overdue"),
+    ("GET /habits", "GET", "/habits"),
+    ("GET /habits?limit=20", "GET", "/habits?limit=20"),
+    ("GET /zones", "GET", "/zones"),
+    ("GET /stats/user", "GET", "/stats/user"),
+    ("GET /stats/history?type=energy", "GET", "/stats/history?type=energy&days_back=30"),
+    ("GET /stats/history?type=xp", "GET", "/stats/history?type=xp&days_back=30"),
+    ("GET /search?q=leer", "GET", "/search?q=leer"),
+    ("GET /search?q=progamacion&fuzzy", "GET", "/search?q=progamacion&fuzzy=true"),
+    ("GET /search/suggest?q=gui", "GET", "/search/suggest?q=gui"),
+    ("GET /agenda/view?period=weekly", "GET", "/agenda/view?period=weekly"),
+    ("GET /agenda/view?period=monthly", "GET", "/agenda/view?period=monthly"),
+    ("GET /store/items", "GET", "/store/items"),
+    ("GET /store/skills", "GET", "/store/skills"),
+    ("GET /achievements/user", "GET", "/achievements/user"),
+    ("GET /achievements/progress", "GET", "/achievements/progress"),
+    ("GET /achievements/global", "GET", "/achievements/global"),
+)
+
+# Endpoints con ETag por versión de recurso: se miden además con If-None-Match
+CONDITIONAL_ENDPOINTS = (
+    ("GET /stats/user", "/stats/user"),
+    ("GET /tasks", "/tasks"),
+    ("GET /habits", "/habits"),
+    ("GET /zones", "/zones"),
+    ("GET /agenda/view?period=weekly", "/agenda/view?period=weekly"),
+)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _measure(client, method, url, headers, rounds, conditional=False):
+    warmup = client.open(url, method=method, headers=headers)  # calentamiento
+    if conditional:
+        headers = {**headers, "If-None-Match": warmup.headers["ETag"]}
+    latencies, statements, status = [], [], None
+    for _ in range(rounds):
+        with QueryCounter(db.engine) as qc:
+            start = time.perf_counter()
+            response = client.open(url, method=method, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+        statements.append(qc.count)
+        status = response.status_code
+    return {
+        "status": status,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "sql": max(statements),
+    }
+
+
+def _compare(results, baseline, tolerance):
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        if current["sql"] > previous["sql"]:
+            regressions.append(f"{key}: SQL {previous['sql']} -> {current['sql']}")
+        limit = max(previous["p95_ms"] * (1 + tolerance), previous["p95_ms"] + MIN_REGRESSION_MS)
+        if current["p95_ms"] > limit:
+            regressions.append(f"{key}: p95 {previous['p95_ms']:.2f} ms -> {current['p95_ms']:.2f} ms")
+    return regressions
+
+
+def run(users, scale, seed, rounds, only, tolerance, save_baseline):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        summary = generate(users, scale, seed)
+        dialect = db.engine.dialect.name
+        user_ids = summary["user_ids"]
+        profiles = {"activo": user_ids[0], "mediano": user_ids[len(user_ids) // 2]}
+        tokens = {name: create_access_token(identity=str(uid)) for name, uid in profiles.items()}
+
+    params = {"users": users, "scale": scale, "seed": seed, "dialect": dialect}
+    endpoints = [(name, method, url, False) for name, method, url in ENDPOINTS] + \
+        [(f"{name} (304)", "GET", url, True) for name, url in CONDITIONAL_ENDPOINTS]
+    endpoints = [e for e in endpoints if not only or any(e[2].startswith(prefix) for prefix in only)]
+    client = app.test_client()
+    results = {}
+
+    print(f"datos: {users} usuarios, escala {scale}, semilla {seed}, {dialect}; {rounds} rondas")
+    print(f"{'endpoint':<36} {'usuario':<8} {'st':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'SQL':>5}")
+    with app.app_context():
+        for name, method, url, conditional in endpoints:
+            for profile, token in tokens.items():
+                r = _measure(client, method, url, {"Authorization": f"Bearer {token}"}, rounds, conditional)
+                results[f"{name} [{profile}]"] = r
+                print(f"{name:<36} {profile:<8} {r['status']:>4} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                      f"{r['p99_ms']:>8.2f} {r['sql']:>5}")
+
+    failed = any(r["status"] >= 500 for r in results.values())
+    if failed:
+        print("MAL: hay endpoints que responden 5xx")
+
+    if save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "python": platform.python_version(), "results": results},
+                      f, indent=2, sort_keys=True, ensure_ascii=False)
+            f.write("\n")
+        print(f"Línea base guardada en {BASELINE_PATH}")
+        return 1 if failed else 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("Sin línea base (--save-baseline para crearla)")
+        return 1 if failed else 0
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("params") != params:
+        print(f"La línea base es de otros parámetros ({baseline.get('params')}); no se compara")
+        return 1 if failed else 0
+
+    regressions = _compare(results, baseline["results"], tolerance)
+    for line in regressions:
+        print(f"REGRESIÓN {line}")
+    if not regressions:
+        print("OK: sin regresiones respecto a la línea base")
+    return 1 if failed or regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=200, help="Tareas del usuario más activo.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--only", nargs="+", default=None, help="Prefijos de URL a medir (p.ej. /search /agenda).")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Aumento relativo de p95 admitido.")
+    parser.add_argument("--save-baseline", action="store_true", help="Guardar los resultados como línea base.")
+    args = parser.parse_args()
+    raise SystemExit(run(args.users, args.scale, args.seed, args.rounds, args.only,
+                         args.tolerance, args.save_baseline))
+
+
+if __name__ == "__main__":
+    main()
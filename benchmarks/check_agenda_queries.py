@@ -0,0 +1,107 @@
+"""
+Comprueba que /agenda/view hace un número constante de sentencias SQL sea
+cual sea el número de tareas, hábitos y proyectos del usuario (sin N+1).
+
+Para cada tamaño crea un usuario con N tareas (con proyecto y zona, algunas
+cíclicas), N hábitos y N proyectos, pide la vista mensual y semanal y
+cuenta las sentencias. Sale con código 1 si el número cambia con N o
+supera MAX_STATEMENTS.
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.check_agenda_queries --sizes 1 10 100 500
+"""
+import argparse
+import os
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.utils.query_counter import QueryCounter
+
+# versión de agenda + consulta UNION
+MAX_STATEMENTS = 2
+REF_DATE = date(2024, 2, 14)
+
+
+def _seed(size, suffix):
+    from app.models.user import User
+    from app.models.zone import Zone
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.habit import Habit
+
+    user = User(username=f"agenda{suffix}", email=f"agenda{suffix}@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    zone = Zone(name="Zona", user_id=user.id)
+    db.session.add(zone)
+    db.session.commit()
+
+    start = REF_DATE.replace(day=1)
+    db.session.bulk_insert_mappings(Project, [
+        {"name": f"Proyecto {i}", "zone_id": zone.id, "user_id": user.id, "deleted": False,
+         "start_date": start, "end_date": start + timedelta(days=40)}
+        for i in range(size)
+    ])
+    db.session.commit()
+    project_ids = [row[0] for row in db.session.query(Project.id).filter_by(user_id=user.id)]
+
+    db.session.bulk_insert_mappings(Task, [
+        {"name": f"Tarea {i}", "status": "PENDING", "user_id": user.id, "deleted": False,
+         "project_id": project_ids[i % len(project_ids)], "cycle": ("NONE", "DAILY", "WEEKLY")[i % 3],
+         "start_date": start + timedelta(days=i % 20), "end_date": start + timedelta(days=i % 20 + 3)}
+        for i in range(size)
+    ])
+    db.session.bulk_insert_mappings(Habit, [
+        {"name": f"Hábito {i}", "frequency": ("DAILY", "WEEKLY", "MONTHLY")[i % 3], "active": True,
+         "zone_id": zone.id, "user_id": user.id, "deleted": False}
+        for i in range(size)
+    ])
+    db.session.commit()
+    return user.id
+
+
+def run(sizes):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        users = {size: _seed(size, size) for size in sizes}
+        tokens = {size: create_access_token(identity=str(uid)) for size, uid in users.items()}
+        engine = db.engine
+
+    client = app.test_client()
+    counts = set()
+    failed = False
+    print(f"{'N':>6} {'periodo':>8} {'items':>7} {'SQL':>5}")
+    for size in sizes:
+        headers = {"Authorization": f"Bearer {tokens[size]}"}
+        for period in ("monthly", "weekly"):
+            with QueryCounter(engine) as qc:
+                response = client.get(f"/agenda/view?period={period}&date={REF_DATE}", headers=headers)
+            if response.status_code != 200:
+                print(f"  error {response.status_code}: {response.get_json()}")
+                failed = True
+                continue
+            counts.add(qc.count)
+            print(f"{size:>6} {period:>8} {len(response.get_json()['items']):>7} {qc.count:>5}")
+
+    if len(counts) != 1 or max(counts) > MAX_STATEMENTS:
+        print(f"MAL: sentencias por petición {sorted(counts)} (esperado constante <= {MAX_STATEMENTS})")
+        failed = True
+    else:
+        print(f"OK: {counts.pop()} sentencias por petición para cualquier N")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 500])
+    args = parser.parse_args()
+    raise SystemExit(run(args.sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Recorre las rutas GET principales con QUERY_GUARD_MODE=raise sobre datos
+sintéticos (benchmarks/datagen.py) y falla si alguna tiene un N+1 o supera
+su @query_budget (app/utils/query_guard.py). Es el equivalente a una batería
+de pruebas de presupuestos de consultas: sale con código 1 si hay problemas,
+con la pila de cada N+1.
+
+También avisa de las rutas con @query_budget que no se han recorrido y
+comprueba que las rutas con ETag (CONDITIONAL_ROUTES) responden 304 a un
+If-None-Match con el ETag recibido usando una sola sentencia (la versión).
+
+Uso (SQLite en memoria por defecto):
+    python -m benchmarks.check_query_guard
+"""
+import argparse
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app, db
+from app.utils.query_counter import QueryCounter
+from app.utils.query_guard import QueryGuardError
+from benchmarks.datagen import generate
+from config import Config
+
+# {project_id}, {journal_id}, ... se sustituyen por ids del usuario más activo
+ROUTES = (
+    "/tasks", "/tasks?status=PENDING", "/tasks?limit=20", "/tasks/overdue",
+    "/habits", "/habits?limit=20", "/habits/{habit_id}", "/habits/{habit_id}/streak",
+    "/projects", "/projects/{project_id}", "/projects/{project_id}/progress",
+    "/zones", "/zones/{zone_id}", "/zones/{zone_id}/stats",
+    "/journals", "/journals/{journal_id}", "/journals/{journal_id}/stats", "/journals/{journal_id}/entries",
+    "/notifications", "/inventory", "/log-entries", "/log-entries/summary",
+    "/stats/user", "/stats/zone/{zone_id}", "/stats/history?type=energy&days_back=30",
+    "/stats/history?type=xp&days_back=30",
+    "/search?q=leer", "/search?q=progamacion&fuzzy=true", "/search/suggest?q=gui",
+    "/agenda/view?period=weekly", "/agenda/view?period=monthly",
+    "/store/items", "/store/skills",
+    "/achievements/user", "/achievements/progress", "/achievements/global",
+    "/users/me",
+)
+
+# GET condicionales: el 304 solo debe leer user_resource_version
+CONDITIONAL_ROUTES = (
+    "/tasks", "/tasks?limit=20", "/habits", "/zones", "/stats/user",
+    "/agenda/view?period=weekly", "/agenda/view?period=monthly",
+)
+MAX_304_STATEMENTS = 1
+
+
+def _ids(user_id):
+    from app.models.habit import Habit
+    from app.models.project import Project
+    from app.models.zone import Zone
+    from app.models.journal import Journal
+
+    def first(model):
+        return db.session.query(model.id).filter_by(user_id=user_id, deleted=False).order_by(model.id).limit(1).scalar()
+
+    return {"habit_id": first(Habit), "project_id": first(Project), "zone_id": first(Zone), "journal_id": first(Journal)}
+
+
+def run(users, scale, seed):
+    Config.QUERY_GUARD_MODE = "raise"
+    app = create_app()
+    app.testing = True
+    app.logger.setLevel("ERROR")  # cada problema ya se muestra abajo con su pila
+    with app.app_context():
+        db.create_all()
+        user_id = generate(users, scale, seed)["user_ids"][0]
+        ids = _ids(user_id)
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+        db.session.remove()
+
+    client = app.test_client()
+    failures, visited = 0, set()
+    print(f"{'ruta':<45} {'st':>4} {'SQL':>4} {'máx':>4}  resultado")
+    for route in ROUTES:
+        url = route.format(**ids)
+        endpoint = app.url_map.bind("localhost").match(url.split("?")[0], method="GET")[0]
+        visited.add(endpoint)
+        budget = getattr(app.view_functions[endpoint], "_query_budget", None)
+        with app.app_context(), QueryCounter(db.engine) as qc:
+            try:
+                status, result = client.get(url, headers=headers).status_code, "OK"
+                if status >= 500:
+                    failures += 1
+                    result = "MAL: error 5xx"
+            except QueryGuardError as e:
+                status, result = 500, f"MAL:\n{e}"
+                failures += 1
+        print(f"{url:<45} {status:>4} {qc.count:>4} {budget if budget is not None else '-':>4}  {result}")
+
+    unvisited = sorted(
+        endpoint for endpoint, view in app.view_functions.items()
+        if getattr(view, "_query_budget", None) is not None and endpoint not in visited
+    )
+    for endpoint in unvisited:
+        print(f"AVISO: {endpoint} tiene @query_budget pero no se ha recorrido")
+
+    print(f"\n{'ruta (If-None-Match)':<45} {'st':>4} {'SQL':>4} {'máx':>4}  resultado")
+    for url in CONDITIONAL_ROUTES:
+        etag = client.get(url, headers=headers).headers.get("ETag")
+        with app.app_context(), QueryCounter(db.engine) as qc:
+            status = client.get(url, headers={**headers, "If-None-Match": etag or ""}).status_code
+        result = "OK"
+        if status != 304 or qc.count > MAX_304_STATEMENTS:
+            failures += 1
+            result = "MAL: se esperaba 304" if status != 304 else "MAL: demasiadas sentencias"
+        print(f"{url:<45} {status:>4} {qc.count:>4} {MAX_304_STATEMENTS:>4}  {result}")
+
+    print("OK" if not failures else f"MAL: {failures} rutas con problemas")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    raise SystemExit(run(args.users, args.scale, args.seed))
+
+
+if __name__ == "__main__":
+    main()
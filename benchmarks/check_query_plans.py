@@ -0,0 +1,239 @@
+"""
+Comprueba con EXPLAIN que las consultas más frecuentes de los servicios
+usan los índices compuestos (user_id, deleted, ...) de los modelos
+(migraciones 0002 y 0004).
+
+Crea varios usuarios con tareas, proyectos, hábitos, logs, notificaciones,
+etc., actualiza las estadísticas (ANALYZE) y para cada consulta pide el
+plan a la base de datos:
+  - SQLite: EXPLAIN QUERY PLAN => "SEARCH task USING INDEX ix_..."
+  - MySQL: EXPLAIN => columna "key"
+Sale con código 1 si alguna no usa el índice esperado.
+
+Uso (SQLite en memoria por defecto; DATABASE_URL para MySQL):
+    python -m benchmarks.check_query_plans --users 20 --rows 200
+"""
+import argparse
+import os
+import re
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app import create_app, db
+
+REF_DATE = date(2024, 2, 14)
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+def _seed(users, rows):
+    from app.models.user import User
+    from app.models.zone import Zone
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.habit import Habit
+    from app.models.log_entry import LogEntry
+    from app.models.notification import Notification
+    from app.models.material import Material
+    from app.models.template import Template
+    from app.models.journal import Journal
+
+    db.session.bulk_insert_mappings(User, [
+        {"username": f"plan{u}", "email": f"plan{u}@example.com", "password_hash": "x", "deleted": False,
+         "reset_token": f"token{u}" if u % 2 else None}
+        for u in range(users)
+    ])
+    db.session.commit()
+    user_ids = [row[0] for row in db.session.query(User.id).order_by(User.id)]
+
+    db.session.bulk_insert_mappings(Zone, [
+        {"name": f"Zona {z}", "user_id": uid, "deleted": False} for uid in user_ids for z in range(5)
+    ])
+    db.session.commit()
+    zones = {}
+    for zone_id, uid in db.session.query(Zone.id, Zone.user_id):
+        zones.setdefault(uid, []).append(zone_id)
+
+    start = REF_DATE - timedelta(days=365)
+    for uid in user_ids:
+        zone_ids = zones[uid]
+        db.session.bulk_insert_mappings(Project, [
+            {"name": f"Proyecto {i}", "user_id": uid, "deleted": i % 10 == 0, "zone_id": zone_ids[i % 5],
+             "status": ("ACTIVE", "COMPLETED")[i % 2],
+             "start_date": start + timedelta(days=i), "end_date": start + timedelta(days=i + 30)}
+            for i in range(rows // 4)
+        ])
+        db.session.commit()
+        project_ids = [row[0] for row in db.session.query(Project.id).filter_by(user_id=uid)]
+        db.session.bulk_insert_mappings(Task, [
+            {"name": f"Tarea {i}", "user_id": uid, "deleted": i % 10 == 0,
+             "project_id": project_ids[i % len(project_ids)] if i % 3 else None,
+             "status": ("PENDING", "COMPLETED", "COMPLETED", "COMPLETED")[i % 4],
+             "cycle": ("NONE", "NONE", "DAILY", "WEEKLY")[i % 4],
+             "start_date": start + timedelta(days=i), "end_date": start + timedelta(days=i + 3)}
+            for i in range(rows)
+        ])
+        db.session.bulk_insert_mappings(Habit, [
+            {"name": f"Hábito {i}", "user_id": uid, "deleted": False, "active": True,
+             "frequency": "DAILY", "zone_id": zone_ids[i % 5]}
+            for i in range(rows // 10)
+        ])
+        db.session.bulk_insert_mappings(LogEntry, [
+            {"type": "TASK", "item_id": i, "user_id": uid, "deleted": False, "energy": 1,
+             "zone_id": zone_ids[i % 5], "end_timestamp": start + timedelta(days=i % 365)}
+            for i in range(rows * 2)
+        ])
+        db.session.bulk_insert_mappings(Notification, [
+            {"message": f"Aviso {i}", "type": "reminder", "user_id": uid, "deleted": False,
+             "is_read": i % 5 != 0, "created_at": datetime(2024, 1, 1) + timedelta(hours=i)}
+            for i in range(rows)
+        ])
+        db.session.bulk_insert_mappings(Material, [
+            {"name": f"Material {i}", "user_id": uid, "deleted": False} for i in range(rows // 10)
+        ])
+        db.session.bulk_insert_mappings(Template, [
+            {"name": f"Plantilla {i}", "user_id": uid, "deleted": False} for i in range(rows // 10)
+        ])
+        db.session.bulk_insert_mappings(Journal, [
+            {"name": f"Diario {i}", "user_id": uid, "deleted": False,
+             "created_at": datetime(2024, 1, 1) + timedelta(days=i)}
+            for i in range(rows // 10)
+        ])
+    db.session.commit()
+    return user_ids[len(user_ids) // 2], zones[user_ids[len(user_ids) // 2]][0]
+
+
+def _hot_queries(user_id, zone_id):
+    """
+    [(nombre, sentencia, índices esperados)]. Cada elemento de 'índices
+    esperados' es un nombre o una tupla de alternativas; todos deben salir
+    en el plan. Los filtros son los de los servicios correspondientes.
+    """
+    from app.models.task import Task
+    from app.models.project import Project
+    from app.models.habit import Habit
+    from app.models.log_entry import LogEntry
+    from app.models.notification import Notification
+    from app.models.material import Material
+    from app.models.template import Template
+    from app.models.zone import Zone
+    from app.models.journal import Journal
+    from app.models.user import User
+    from app.services.agenda_service import AgendaService
+
+    week_start = REF_DATE - timedelta(days=REF_DATE.weekday())
+    agenda = AgendaService()._agenda_query(user_id, week_start, week_start + timedelta(days=6),
+                                           None, ("task", "habit", "project"))
+    return [
+        ("tareas por estado (/tasks?status=)",
+         Task.query.filter_by(user_id=user_id, deleted=False, status="PENDING").statement,
+         ("ix_task_user_status",)),
+        ("tareas vencidas",
+         Task.query.filter(Task.user_id == user_id, Task.deleted == False, Task.status != "COMPLETED",
+                           Task.end_date != None, Task.end_date < REF_DATE).statement,
+         (("ix_task_user_end_date", "ix_task_user_status"),)),
+        ("tareas de un proyecto",
+         Task.query.filter_by(project_id=1, deleted=False).statement,
+         ("ix_task_project",)),
+        ("agenda semanal (UNION)",
+         agenda,
+         (("ix_task_user_end_date", "ix_task_user_status"), ("ix_habit_user_zone", "ix_habit_user_id"),
+          ("ix_project_user_end_date", "ix_project_user_zone"))),
+        ("proyectos de una zona",
+         Project.query.filter_by(user_id=user_id, deleted=False, zone_id=zone_id).statement,
+         ("ix_project_user_zone",)),
+        # Los dos índices empiezan por (user_id, deleted): cualquiera vale
+        ("hábitos del usuario",
+         Habit.query.filter_by(user_id=user_id, deleted=False).statement,
+         (("ix_habit_user_zone", "ix_habit_user_id"),)),
+        ("hábitos paginados (/habits)",
+         Habit.query.filter_by(user_id=user_id, deleted=False).filter(Habit.id > 0)
+         .order_by(Habit.id).limit(51).statement,
+         ("ix_habit_user_id",)),
+        ("logs por rango (/log-entries?from=&to=)",
+         LogEntry.query.filter_by(user_id=user_id, deleted=False)
+         .filter(LogEntry.end_timestamp >= REF_DATE - timedelta(days=30), LogEntry.end_timestamp <= REF_DATE)
+         .statement,
+         ("ix_log_entry_user_end",)),
+        ("notificaciones no leídas",
+         Notification.query.filter_by(user_id=user_id, deleted=False, is_read=False).statement,
+         ("ix_notification_user_read",)),
+        ("materiales del usuario",
+         Material.query.filter_by(user_id=user_id, deleted=False).statement,
+         ("ix_material_user",)),
+        ("plantillas del usuario",
+         Template.query.filter_by(user_id=user_id, deleted=False).statement,
+         ("ix_template_user",)),
+        ("zonas del usuario",
+         Zone.query.filter_by(user_id=user_id, deleted=False).statement,
+         ("ix_zone_user",)),
+        ("último diario",
+         Journal.query.filter_by(user_id=user_id, deleted=False).order_by(Journal.created_at.desc()).limit(1)
+         .statement,
+         ("ix_journal_user_created",)),
+        ("usuario por token de recuperación",
+         User.query.filter_by(reset_token="abc", deleted=False).statement,
+         ("ix_user_reset_token",)),
+    ]
+
+
+def _analyze():
+    if db.engine.dialect.name == "sqlite":
+        db.session.execute(db.text("ANALYZE"))
+    elif db.engine.dialect.name == "mysql":
+        tables = ", ".join(f"`{name}`" for name in db.metadata.tables)
+        db.session.execute(db.text(f"ANALYZE TABLE {tables}")).all()
+    db.session.commit()
+
+
+def _used_indexes(statement):
+    """
+    Nombres de índice que aparecen en el plan de la sentencia, y el plan en texto.
+    """
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        details = [row[-1] for row in rows]
+        return {name for detail in details for name in _SQLITE_INDEX.findall(detail)}, details
+    rows = db.session.execute(db.text(f"EXPLAIN {sql}")).mappings().all()
+    return {row["key"] for row in rows if row["key"]}, \
+        [f"{row['table']}: key={row['key']} type={row['type']}" for row in rows]
+
+
+def run(users, rows, verbose):
+    app = create_app()
+    failed = False
+    with app.app_context():
+        db.create_all()
+        user_id, zone_id = _seed(users, rows)
+        _analyze()
+        for name, statement, expected in _hot_queries(user_id, zone_id):
+            used, plan = _used_indexes(statement)
+            missing = [
+                alternatives for alternatives in expected
+                if not used.intersection((alternatives,) if isinstance(alternatives, str) else alternatives)
+            ]
+            print(f"{'MAL' if missing else 'ok ':>3}  {name}: {', '.join(sorted(used)) or '(ninguno)'}")
+            if missing or verbose:
+                for line in plan:
+                    print(f"       {line}")
+            if missing:
+                print(f"       esperado: {missing}")
+                failed = True
+
+    print("MAL: hay consultas que no usan su índice" if failed else "OK: todas las consultas usan su índice")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=200, help="Tareas por usuario (el resto, proporcional).")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar el plan de todas las consultas.")
+    args = parser.parse_args()
+    raise SystemExit(run(args.users, args.rows, args.verbose))
+
+
+if __name__ == "__main__":
+    main()
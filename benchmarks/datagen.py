@@ -0,0 +1,243 @@
+"""
+Generador determinista de datos sintéticos para benchmarks.
+
+Con la misma semilla (y el mismo 'today') genera exactamente los mismos
+datos: N usuarios con zonas, proyectos, tareas, hábitos, logs, diarios,
+entradas de diario, notificaciones e historial de progreso, más un
+catálogo común de efectos, objetos, skills y logros globales.
+
+El volumen por usuario sigue una ley de Zipf (pocos usuarios muy activos y
+una cola larga de usuarios con poca actividad); dentro de cada usuario la
+mayoría de tareas están completadas, los logs se concentran en los
+últimos días y la mayoría de notificaciones están leídas. Al final se
+reconstruyen las tablas derivadas (libro de energía, rollups de logs,
+contadores de logros e índice de búsqueda) con sus propios servicios.
+
+Uso como script (llena la BD de DATABASE_URL; SQLite en memoria por defecto):
+    python -m benchmarks.datagen --users 50 --scale 200 --seed 42
+"""
+import argparse
+import math
+import os
+import random
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app import create_app, db
+
+WORDS = ("estudiar", "programación", "leer", "correr", "hábito", "proyecto", "guía", "python",
+         "meditar", "comprar", "álgebra", "inglés", "gimnasio", "diario", "música", "web",
+         "cocinar", "ahorro", "viaje", "jardín", "pintura", "yoga", "examen", "informe",
+         "limpieza", "familia", "lectura", "nutrición", "guitarra", "escribir", "fotografía", "curso")
+ZONES = ("Salud", "Trabajo", "Estudios", "Hogar", "Finanzas", "Ocio", "Relaciones", "Creatividad")
+CYCLES = ("NONE",) * 7 + ("DAILY", "WEEKLY", "MONTHLY")
+FREQUENCIES = ("DAILY",) * 5 + ("WEEKLY",) * 3 + ("MONTHLY", "YEARLY")
+PRIORITIES = ("HIGH", "MEDIUM", "MEDIUM", "LOW")
+ZIPF_EXPONENT = 0.8
+HISTORY_DAYS = 365
+
+
+def zipf_counts(users, top, exponent=ZIPF_EXPONENT):
+    """
+    Cantidad para el usuario de rango r (0 = el más activo): top / (r+1)^s, mínimo 1.
+    """
+    return [max(1, int(top / math.pow(rank + 1, exponent))) for rank in range(users)]
+
+
+def _name(rnd, words=2):
+    return " ".join(rnd.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _recent_day(rnd, today, mean_days=30):
+    # Actividad concentrada en los últimos días (exponencial), hasta HISTORY_DAYS atrás
+    return today - timedelta(days=min(HISTORY_DAYS - 1, int(rnd.expovariate(1 / mean_days))))
+
+
+def _seed_catalog(rnd):
+    from app.models.effect import Effect
+    from app.models.gear import Gear
+    from app.models.skill import Skill
+    from app.models.global_achievement import GlobalAchievement
+
+    db.session.bulk_insert_mappings(Effect, [
+        {"name": f"Efecto {i}", "logic_key": f"synthetic_{i}", "type": rnd.choice(("mental", "physical")),
+         "deleted": False}
+        for i in range(10)
+    ])
+    db.session.commit()
+    effect_ids = [row[0] for row in db.session.query(Effect.id).order_by(Effect.id)]
+    db.session.bulk_insert_mappings(Gear, [
+        {"name": f"Objeto {_name(rnd, 1)} {i}", "type": rnd.choice(("mental", "physical", "all")),
+         "max_uses": rnd.randint(1, 5), "cost": rnd.randint(10, 500), "level_required": rnd.randint(1, 10),
+         "consumable": True, "rarity": rnd.choice(("COMMON", "RARE", "EPIC")),
+         "effect_id": rnd.choice(effect_ids), "deleted": False}
+        for i in range(40)
+    ])
+    db.session.bulk_insert_mappings(Skill, [
+        {"name": f"Skill {_name(rnd, 1)} {i}", "type": rnd.choice(("mental", "physical")),
+         "level_required": rnd.randint(1, 10), "cost": rnd.randint(1, 5), "mana": rnd.randint(0, 20),
+         "is_zone_skill": i % 3 == 0, "effect_id": rnd.choice(effect_ids), "deleted": False}
+        for i in range(20)
+    ])
+    db.session.bulk_insert_mappings(GlobalAchievement, [
+        {"name": f"{condition} {threshold}", "condition_type": condition, "threshold": threshold,
+         "deleted": False}
+        for condition in ("TASKS_COMPLETED", "JOURNAL_ENTRIES", "HABIT_CHECKS")
+        for threshold in (1, 10, 50, 100, 500)
+    ])
+    db.session.commit()
+
+
+def _seed_user(rnd, user_id, tasks, today):
+    from app.models.zone import Zone
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.habit import Habit
+    from app.models.log_entry import LogEntry
+    from app.models.journal import Journal
+    from app.models.journal_entry import JournalEntry
+    from app.models.notification import Notification
+    from app.models.user_effects import UserEffects
+    from app.models.user_progress_history import UserProgressHistory
+
+    db.session.add(UserEffects(user_id=user_id))
+    db.session.bulk_insert_mappings(Zone, [
+        {"name": zone, "user_id": user_id, "deleted": False}
+        for zone in rnd.sample(ZONES, rnd.randint(3, 6))
+    ])
+    db.session.commit()
+    zone_ids = [row[0] for row in db.session.query(Zone.id).filter_by(user_id=user_id).order_by(Zone.id)]
+
+    db.session.bulk_insert_mappings(Project, [
+        {"name": _name(rnd, 3), "user_id": user_id, "zone_id": rnd.choice(zone_ids), "deleted": False,
+         "status": rnd.choice(("ACTIVE", "ACTIVE", "COMPLETED", "ARCHIVED")), "priority": rnd.choice(PRIORITIES),
+         "start_date": start, "end_date": start + timedelta(days=rnd.randint(14, 120)), "points": 0}
+        for start in (today - timedelta(days=rnd.randint(0, HISTORY_DAYS)) for _ in range(max(1, tasks // 8)))
+    ])
+    db.session.commit()
+    project_ids = [row[0] for row in db.session.query(Project.id).filter_by(user_id=user_id).order_by(Project.id)]
+
+    task_rows = []
+    for _ in range(tasks):
+        start = today - timedelta(days=rnd.randint(-30, HISTORY_DAYS))
+        task_rows.append({
+            "name": _name(rnd, rnd.randint(2, 4)), "user_id": user_id, "deleted": rnd.random() < 0.05,
+            "project_id": rnd.choice(project_ids) if rnd.random() < 0.6 else None,
+            "status": "COMPLETED" if rnd.random() < 0.6 else rnd.choice(("PENDING", "IN_PROGRESS")),
+            "priority": rnd.choice(PRIORITIES), "cycle": rnd.choice(CYCLES),
+            "energy": rnd.randint(-5, 10), "points": rnd.randint(1, 20),
+            "start_date": start, "end_date": start + timedelta(days=rnd.randint(0, 14)), "active": True,
+        })
+    db.session.bulk_insert_mappings(Task, task_rows)
+
+    habits = max(2, tasks // 10)
+    db.session.bulk_insert_mappings(Habit, [
+        {"name": _name(rnd, 2), "user_id": user_id, "zone_id": rnd.choice(zone_ids), "deleted": False,
+         "active": rnd.random() < 0.85, "frequency": rnd.choice(FREQUENCIES),
+         "energy": rnd.randint(-3, 8), "points": rnd.randint(1, 10),
+         "streak": rnd.randint(0, 60), "total_check": rnd.randint(0, 300)}
+        for _ in range(habits)
+    ])
+
+    db.session.bulk_insert_mappings(LogEntry, [
+        {"type": rnd.choice(("TASK", "TASK", "HABIT", "HABIT", "JOURNAL_ENTRY")), "item_id": rnd.randint(1, tasks),
+         "user_id": user_id, "zone_id": rnd.choice(zone_ids) if rnd.random() < 0.8 else None, "deleted": False,
+         "energy": rnd.randint(-5, 10), "end_timestamp": _recent_day(rnd, today)}
+        for _ in range(tasks * 3)
+    ])
+
+    db.session.bulk_insert_mappings(Journal, [
+        {"name": f"Diario {_name(rnd, 1)}", "user_id": user_id, "deleted": False, "type": "PERSONAL",
+         "created_at": datetime.combine(today - timedelta(days=rnd.randint(0, HISTORY_DAYS)), datetime.min.time())}
+        for _ in range(rnd.randint(1, 3))
+    ])
+    db.session.commit()
+    journal_ids = [row[0] for row in db.session.query(Journal.id).filter_by(user_id=user_id)]
+    db.session.bulk_insert_mappings(JournalEntry, [
+        {"journal_id": rnd.choice(journal_ids), "user_id": user_id, "deleted": False,
+         "content": " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(10, 60))),
+         "edited_at": _recent_day(rnd, today), "points": 1, "energy": 1}
+        for _ in range(max(1, tasks // 2))
+    ])
+
+    db.session.bulk_insert_mappings(Notification, [
+        {"message": f"Recordatorio: {_name(rnd, 2)}", "type": rnd.choice(("reminder", "achievement", "alert")),
+         "is_read": rnd.random() < 0.7, "user_id": user_id, "deleted": False,
+         "created_at": datetime.combine(_recent_day(rnd, today, 15), datetime.min.time())}
+        for _ in range(tasks)
+    ])
+
+    # Historial de progreso: un punto diario de los últimos 90 días
+    xp = level = 0
+    history = []
+    for offset in range(90, 0, -1):
+        gained = rnd.randint(0, 40)
+        xp += gained
+        level = xp // 100 + 1
+        history.append({"user_id": user_id, "day": today - timedelta(days=offset), "granularity": "DAY",
+                        "source": "TASK", "xp": xp, "level": level, "xp_delta": gained})
+    db.session.bulk_insert_mappings(UserProgressHistory, history)
+    db.session.commit()
+    return xp, level
+
+
+def generate(users=50, scale=200, seed=42, today=None):
+    """
+    Llena la base de datos (ya con esquema) y retorna un resumen:
+    {"user_ids": [... del más activo al menos activo], "tasks": [...], "rows": {tabla: nº}}.
+    'scale' es el nº de tareas del usuario más activo; el resto de
+    entidades son proporcionales a las tareas de cada usuario.
+    """
+    from app.models.user import User
+    from app.services.energy_ledger_service import EnergyLedgerService
+    from app.services.log_rollup_service import LogRollupService
+    from app.services.achievement_counter_service import AchievementCounterService
+    from app.services.search_index_service import SearchIndexService
+
+    rnd = random.Random(seed)
+    today = today or date.today()
+    _seed_catalog(rnd)
+
+    task_counts = zipf_counts(users, scale)
+    user_ids = []
+    for rank, tasks in enumerate(task_counts):
+        user = User(username=f"synthetic{seed}_{rank}", email=f"synthetic{seed}_{rank}@example.com",
+                    password_hash="x", coins=rnd.randint(0, 5000), blue_gems=rnd.randint(0, 20),
+                    login_streak=rnd.randint(0, 30), deleted=False)
+        db.session.add(user)
+        db.session.commit()
+        user.xp, user.level = _seed_user(rnd, user.id, tasks, today)
+        db.session.commit()
+        user_ids.append(user.id)
+
+    EnergyLedgerService().rebuild()
+    LogRollupService().backfill()
+    AchievementCounterService().recompute()
+    SearchIndexService().rebuild()
+
+    rows = {
+        table.name: db.session.execute(db.select(db.func.count()).select_from(table)).scalar()
+        for table in db.metadata.sorted_tables
+    }
+    return {"user_ids": user_ids, "tasks": task_counts, "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=200, help="Tareas del usuario más activo.")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        summary = generate(args.users, args.scale, args.seed)
+    for table, count in sorted(summary["rows"].items()):
+        if count:
+            print(f"{table:<28} {count:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Prueba de estrés de compleciones concurrentes del mismo usuario.
+
+Lanza varios hilos que completan a la vez tareas distintas y el mismo hábito
+del mismo usuario (como varias pestañas o web + móvil) y al final comprueba
+que no se ha perdido ningún incremento: energía, xp, monedas, nivel y gemas
+del usuario, xp/nivel/gemas de la zona, racha del hábito, logs y contadores.
+Sale con código 1 si algún total no cuadra.
+
+Por defecto usa una BD SQLite en un fichero temporal (SQLite serializa las
+escrituras y algunas transacciones fallan con "database is locked": se
+reintentan enteras y se informa de cuántas). Para probar bloqueo por fila
+real, apuntar DATABASE_URL a una BD MySQL vacía.
+
+Uso:
+    python -m benchmarks.stress_concurrent_completions --workers 8 --per-worker 25
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+if "DATABASE_URL" not in os.environ:
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "stress.db")
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app, db
+
+TASK_ENERGY = 3
+TASK_POINTS = 7
+HABIT_ENERGY = 2
+HABIT_POINTS = 5
+MAX_RETRIES = 50
+
+
+def _seed(workers, per_worker):
+    from app.models.user import User
+    from app.models.zone import Zone
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.habit import Habit
+
+    user = User(username="stress", email="stress@example.com", password_hash="x",
+                xp=0, coins=0, energy=0, level=1, blue_gems=0)
+    db.session.add(user)
+    db.session.commit()
+    zone = Zone(name="Zona", user_id=user.id, energy=0, xp=0, level=1, yellow_gems=0)
+    db.session.add(zone)
+    db.session.commit()
+    project = Project(name="Proyecto", zone_id=zone.id, user_id=user.id, points=0)
+    habit = Habit(name="Hábito", energy=HABIT_ENERGY, points=HABIT_POINTS, zone_id=zone.id,
+                  user_id=user.id, streak=0, total_check=0)
+    db.session.add_all([project, habit])
+    db.session.commit()
+
+    db.session.bulk_insert_mappings(Task, [
+        {"name": f"Tarea {i}", "energy": TASK_ENERGY, "points": TASK_POINTS, "status": "PENDING",
+         "user_id": user.id, "project_id": project.id, "deleted": False}
+        for i in range(workers * per_worker)
+    ])
+    db.session.commit()
+    task_ids = [row[0] for row in db.session.query(Task.id).filter_by(user_id=user.id).order_by(Task.id)]
+    return user.id, zone.id, habit.id, task_ids
+
+
+def _with_retry(fn, retries):
+    for _ in range(MAX_RETRIES):
+        try:
+            return fn()
+        except OperationalError:
+            db.session.rollback()
+            retries[0] += 1
+            time.sleep(0.001)
+    raise Exception("Demasiados reintentos por BD bloqueada.")
+
+
+def _worker(app, user_id, habit_id, task_ids, retries, errors, barrier):
+    from app.services.task_service import TaskService
+    from app.services.habit_service import HabitService
+
+    with app.app_context():
+        try:
+            barrier.wait()
+            for task_id in task_ids:
+                _with_retry(lambda: TaskService().complete_task(task_id, user_id), retries)
+                _with_retry(lambda: HabitService().complete_habit(habit_id, user_id), retries)
+        except Exception as e:
+            errors.append(repr(e))
+        finally:
+            db.session.remove()
+
+
+def _check(user_id, zone_id, habit_id, completions):
+    from app.models.user import User
+    from app.models.zone import Zone
+    from app.models.habit import Habit
+    from app.models.log_entry import LogEntry
+    from app.utils.progression import get_curve
+    from app.services.achievement_counter_service import AchievementCounterService
+
+    db.session.expire_all()
+    user = User.query.filter_by(id=user_id).one()
+    zone = Zone.query.filter_by(id=zone_id).one()
+    habit = Habit.query.filter_by(id=habit_id).one()
+    counters = AchievementCounterService().get_counters(user_id)
+
+    xp = completions * (TASK_POINTS + HABIT_POINTS)
+    user_curve, zone_curve = get_curve("user"), get_curve("zone")
+    expected_level = user_curve.level_for_xp(xp)
+    expected_zone_level = zone_curve.level_for_xp(xp)
+
+    checks = [
+        ("user.energy", user.energy, completions * (TASK_ENERGY + HABIT_ENERGY)),
+        ("user.xp", user.xp, xp),
+        ("user.coins", user.coins, xp),
+        ("user.level", user.level, expected_level),
+        ("user.blue_gems", user.blue_gems, (expected_level - 1) * user_curve.gems_per_level),
+        ("zone.xp", zone.xp, xp),
+        ("zone.level", zone.level, expected_zone_level),
+        ("zone.yellow_gems", zone.yellow_gems, (expected_zone_level - 1) * zone_curve.gems_per_level),
+        ("habit.total_check", habit.total_check, completions),
+        ("habit.streak", habit.streak, completions),
+        ("log_entry", LogEntry.query.filter_by(user_id=user_id).count(), 2 * completions),
+        ("TASKS_COMPLETED", counters.get("TASKS_COMPLETED"), completions),
+        ("HABIT_CHECKS", counters.get("HABIT_CHECKS"), completions),
+    ]
+    failed = 0
+    for name, actual, expected in checks:
+        ok = actual == expected
+        failed += 0 if ok else 1
+        print(f"  {'OK ' if ok else 'MAL'} {name:<18} {actual!s:>8} (esperado {expected})")
+    return failed
+
+
+def run(workers, per_worker):
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_id, zone_id, habit_id, task_ids = _seed(workers, per_worker)
+
+    retries = [0]
+    errors = []
+    barrier = threading.Barrier(workers)
+    threads = [
+        threading.Thread(target=_worker, args=(
+            app, user_id, habit_id, task_ids[i * per_worker:(i + 1) * per_worker],
+            retries, errors, barrier
+        ))
+        for i in range(workers)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    completions = workers * per_worker
+    print(f"{workers} hilos x {per_worker} tareas + hábito: {elapsed:.2f} s, "
+          f"{retries[0]} reintentos, {len(errors)} errores")
+    for e in errors[:5]:
+        print("  error:", e)
+
+    with app.app_context():
+        failed = _check(user_id, zone_id, habit_id, completions)
+    return 1 if failed or errors else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-worker", type=int, default=25)
+    args = parser.parse_args()
+    raise SystemExit(run(args.workers, args.per_worker))
+
+
+if __name__ == "__main__":
+    main()
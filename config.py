@@ -21,6 +21,42 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Curvas de nivel (XP total por nivel) de usuarios y zonas. Tipos:
+    # "linear" (base * nivel), "quadratic" (base * nivel^2),
+    # "exponential" (base * growth^(nivel-1)) o "table" (lista "thresholds"
+    # con la XP de los niveles 2, 3, ...). Ver app/utils/progression.py
+    USER_LEVEL_CURVE = {"type": "linear", "base": 100, "gems_per_level": 1}
+    ZONE_LEVEL_CURVE = {"type": "linear", "base": 50, "gems_per_level": 1}
+
+    # Sugerencias de /search/suggest: nº de usuarios cuyo índice de prefijos
+    # se mantiene en memoria (LRU, por proceso)
+    SEARCH_SUGGEST_CACHE_SIZE = int(os.environ.get("SEARCH_SUGGEST_CACHE_SIZE", 512))
+
+    # Perfilado por petición (app/utils/profiling.py): nº de sentencias SQL,
+    # tiempo en BD y de la petición en la cabecera Server-Timing; las
+    # peticiones que superan PROFILING_SLOW_REQUEST_MS se guardan en admin_log
+    # (nivel WARN) desde un hilo aparte, con sus sentencias más lentas.
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SERVER_TIMING = os.environ.get("PROFILING_SERVER_TIMING", "true").lower() == "true"
+    PROFILING_SLOW_REQUEST_MS = int(os.environ.get("PROFILING_SLOW_REQUEST_MS", 500))
+    PROFILING_TOP_STATEMENTS = int(os.environ.get("PROFILING_TOP_STATEMENTS", 3))
+
+    # Métricas Prometheus en /admin/metrics (app/utils/metrics.py): peticiones y
+    # latencia por blueprint/ruta, errores, pool de conexiones y contadores de
+    # dominio. Con varios workers (gunicorn) hay que indicar METRICS_MULTIPROC_DIR:
+    # cada proceso vuelca allí sus valores cada METRICS_FLUSH_SECONDS y la
+    # respuesta suma los de todos. El directorio se vacía al desplegar.
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", 5))
+
+    # Solo desarrollo y pruebas (app/utils/query_guard.py): detecta N+1 (una
+    # relación cargada de forma perezosa en QUERY_GUARD_NPLUSONE_THRESHOLD
+    # instancias del mismo modelo en una petición) y rutas que superan su
+    # @query_budget. "off" | "log" (WARNING con la pila) | "raise" (500)
+    QUERY_GUARD_MODE = os.environ.get("QUERY_GUARD_MODE", "off").lower()
+    QUERY_GUARD_NPLUSONE_THRESHOLD = int(os.environ.get("QUERY_GUARD_NPLUSONE_THRESHOLD", 2))
+
     # JWT
     # spring.security.jwt.secret -> Este se traduce al JWT_SECRET_KEY en Flask
     # spring.security.jwt.expiration -> lo ajustamos en segundos
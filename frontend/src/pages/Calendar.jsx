@@ -39,6 +39,7 @@ import {
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { fetchAllPages } from '../utils/pagination';
 
 // Componente para mostrar un día del calendario
 const CalendarDay = ({ day, month, year, events, isToday, onClick }) => {
@@ -135,8 +136,7 @@ const Calendar = () => {
         const eventsResponse = await axios.get(`http://localhost:5000/calendar/events?year=${year}&month=${month}`);
         
         // Obtener proyectos para el formulario de nuevo evento
-        const projectsResponse = await axios.get('http://localhost:5000/projects');
-        setProjects(projectsResponse.data.items || []);
+        setProjects(await fetchAllPages('http://localhost:5000/projects'));
         
         // Procesar datos del calendario
         processCalendarData(year, month, eventsResponse.data.events || []);
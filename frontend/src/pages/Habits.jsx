@@ -47,6 +47,7 @@ import {
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { fetchAllPages } from '../utils/pagination';
 
 // Componente para mostrar un hábito
 const HabitCard = ({ habit, onComplete, onEdit, onDelete }) => {
@@ -163,16 +164,14 @@ const Habits = () => {
         setLoading(true);
         
         // Obtener hábitos
-        const habitsResponse = await axios.get('http://localhost:5000/habits');
-        setHabits(habitsResponse.data.items || []);
+        setHabits(await fetchAllPages('http://localhost:5000/habits'));
         
         // Obtener estadísticas de hábitos
         const statsResponse = await axios.get('http://localhost:5000/habits/stats');
         setStats(statsResponse.data);
         
         // Obtener proyectos para el formulario
-        const projectsResponse = await axios.get('http://localhost:5000/projects');
-        setProjects(projectsResponse.data.items || []);
+        setProjects(await fetchAllPages('http://localhost:5000/projects'));
         
       } catch (err) {
         console.error('Error al obtener datos:', err);
@@ -30,7 +30,7 @@ import {
   LocalMall as InventoryIcon,
   FlashOn as UseIcon
 } from '@mui/icons-material';
-import axios from 'axios';
+import { fetchAllPages } from '../utils/pagination';
 
 // Componente principal para el inventario
 const Inventory = () => {
@@ -46,8 +46,7 @@ const Inventory = () => {
     const fetchInventoryItems = async () => {
       try {
         setLoading(true);
-        const response = await axios.get('http://localhost:5000/inventory');
-        setItems(response.data);
+        setItems(await fetchAllPages('http://localhost:5000/inventory'));
         setError(null);
       } catch (err) {
         console.error('Error al cargar el inventario:', err);
@@ -21,7 +21,7 @@ import {
   Book as BookIcon
 } from '@mui/icons-material';
 import { Link } from 'react-router-dom';
-import axios from 'axios';
+import { fetchAllPages } from '../utils/pagination';
 
 // Componente principal para la página de diarios
 const Journals = () => {
@@ -36,8 +36,7 @@ const Journals = () => {
     const fetchJournals = async () => {
       try {
         setLoading(true);
-        const response = await axios.get('http://localhost:5000/journals');
-        setJournals(response.data);
+        setJournals(await fetchAllPages('http://localhost:5000/journals'));
         setError(null);
       } catch (err) {
         console.error('Error al cargar los diarios:', err);
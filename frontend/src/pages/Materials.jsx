@@ -40,6 +40,7 @@ import {
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { fetchAllPages } from '../utils/pagination';
 
 // Componente para mostrar un material
 const MaterialCard = ({ material, onEdit, onDelete }) => {
@@ -136,8 +137,7 @@ const Materials = () => {
         setMaterials(materialsResponse.data.items || []);
         
         // Obtener proyectos para el formulario
-        const projectsResponse = await axios.get('http://localhost:5000/projects');
-        setProjects(projectsResponse.data.items || []);
+        setProjects(await fetchAllPages('http://localhost:5000/projects'));
         
       } catch (err) {
         console.error('Error al obtener datos:', err);
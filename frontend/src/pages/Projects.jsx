@@ -38,6 +38,7 @@ import {
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../contexts/AuthContext';
 import axios from 'axios';
+import { fetchAllPages } from '../utils/pagination';
 
 const Projects = () => {
   const { currentUser } = useAuth();
@@ -61,8 +62,7 @@ const Projects = () => {
     const fetchProjects = async () => {
       try {
         setLoading(true);
-        const response = await axios.get('http://localhost:5000/projects');
-        setProjects(response.data.items || []);
+        setProjects(await fetchAllPages('http://localhost:5000/projects'));
       } catch (err) {
         console.error('Error al obtener proyectos:', err);
         setError('No se pudieron cargar los proyectos');
@@ -154,8 +154,7 @@ const Projects = () => {
       handleCloseNewProjectDialog();
       
       // Recargar proyectos
-      const response = await axios.get('http://localhost:5000/projects');
-      setProjects(response.data.items || []);
+      setProjects(await fetchAllPages('http://localhost:5000/projects'));
       
     } catch (err) {
       console.error('Error al crear proyecto:', err);
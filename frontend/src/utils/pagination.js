@@ -0,0 +1,22 @@
+import axios from 'axios';
+
+// Máximo que admite el backend por página (MAX_LIMIT en app/utils/pagination.py)
+export const PAGE_LIMIT = 200;
+
+/**
+ * Descarga todas las páginas de un listado paginado por cursor
+ * ({ items, next_cursor, has_more }) siguiendo next_cursor hasta el final.
+ * Retorna la lista completa de items.
+ */
+export const fetchAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await axios.get(url, {
+      params: { ...params, limit: PAGE_LIMIT, ...(cursor ? { cursor } : {}) }
+    });
+    items.push(...(response.data.items || []));
+    cursor = response.data.has_more ? response.data.next_cursor : null;
+  } while (cursor);
+  return items;
+};
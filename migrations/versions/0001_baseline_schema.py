@@ -0,0 +1,386 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18
+
+Esquema de la aplicación antes de las migraciones, tal y como lo creaba
+db.create_all() en la versión inicial. En una base de datos creada así:
+`flask init-db` (comprueba el esquema, la marca como 0001 y sube el resto).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('admin_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('level', sa.String(length=50), nullable=True),
+    sa.Column('message', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('effect',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('logic_key', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('target_entities', sa.String(length=255), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('logic_key')
+    )
+    op.create_table('global_achievement',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('condition_type', sa.String(length=50), nullable=False),
+    sa.Column('threshold', sa.Integer(), nullable=True),
+    sa.Column('honorific_title', sa.String(length=100), nullable=True),
+    sa.Column('is_surprise', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('incident',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('reported_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('USER', 'ADMIN', name='role'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('xp', sa.Integer(), nullable=True),
+    sa.Column('skill_points', sa.Integer(), nullable=True),
+    sa.Column('level', sa.Integer(), nullable=True),
+    sa.Column('mana', sa.Integer(), nullable=True),
+    sa.Column('last_mana_reset_date', sa.Date(), nullable=True),
+    sa.Column('login_streak', sa.Integer(), nullable=True),
+    sa.Column('last_login_date', sa.DateTime(), nullable=True),
+    sa.Column('theme_color', sa.String(length=50), nullable=True),
+    sa.Column('avatar_image', sa.String(length=255), nullable=True),
+    sa.Column('background_image', sa.String(length=255), nullable=True),
+    sa.Column('coins', sa.Integer(), nullable=True),
+    sa.Column('blue_gems', sa.Integer(), nullable=True),
+    sa.Column('reset_token', sa.String(length=255), nullable=True),
+    sa.Column('reset_token_expires', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('gear',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('image', sa.String(length=255), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('max_uses', sa.Integer(), nullable=True),
+    sa.Column('cost', sa.Integer(), nullable=True),
+    sa.Column('level_required', sa.Integer(), nullable=True),
+    sa.Column('consumable', sa.Boolean(), nullable=True),
+    sa.Column('rarity', sa.String(length=50), nullable=True),
+    sa.Column('effect_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['effect_id'], ['effect.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('notification',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('message', sa.String(length=255), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('is_read', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('personal_data',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('birth_date', sa.Date(), nullable=True),
+    sa.Column('city', sa.String(length=100), nullable=True),
+    sa.Column('country', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('occupation', sa.String(length=100), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('skill',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('is_zone_skill', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('level_required', sa.Integer(), nullable=True),
+    sa.Column('cost', sa.Integer(), nullable=True),
+    sa.Column('mana', sa.Integer(), nullable=True),
+    sa.Column('icon', sa.String(length=100), nullable=True),
+    sa.Column('effect_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['effect_id'], ['effect.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('template',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('cycle', sa.String(length=20), nullable=True),
+    sa.Column('category', sa.String(length=20), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_effects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('double_energy_next_active', sa.Boolean(), nullable=True),
+    sa.Column('xp_multiplier', sa.Float(), nullable=True),
+    sa.Column('xp_multiplier_expires', sa.DateTime(), nullable=True),
+    sa.Column('store_discount_active', sa.Boolean(), nullable=True),
+    sa.Column('store_discount_value', sa.Float(), nullable=True),
+    sa.Column('skip_penalty_active', sa.Boolean(), nullable=True),
+    sa.Column('skip_penalty_expires', sa.DateTime(), nullable=True),
+    sa.Column('shield_energy_loss_until', sa.DateTime(), nullable=True),
+    sa.Column('double_rewards_until', sa.DateTime(), nullable=True),
+    sa.Column('no_habit_loss_weekend_expires', sa.DateTime(), nullable=True),
+    sa.Column('stackable_energy_active', sa.Boolean(), nullable=True),
+    sa.Column('stackable_energy_expires', sa.DateTime(), nullable=True),
+    sa.Column('stackable_energy_count', sa.Integer(), nullable=True),
+    sa.Column('daily_first_completion_active', sa.Boolean(), nullable=True),
+    sa.Column('daily_first_completion_date', sa.Date(), nullable=True),
+    sa.Column('daily_first_completion_used', sa.Boolean(), nullable=True),
+    sa.Column('zone_effects_json', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('user_global_achievement',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('global_achievement_id', sa.Integer(), nullable=False),
+    sa.Column('achieved_at', sa.DateTime(), nullable=True),
+    sa.Column('current_progress', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['global_achievement_id'], ['global_achievement.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('zone',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('image', sa.String(length=255), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('xp', sa.Integer(), nullable=True),
+    sa.Column('level', sa.Integer(), nullable=True),
+    sa.Column('yellow_gems', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('habit',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('image', sa.String(length=255), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('frequency', sa.String(length=20), nullable=True),
+    sa.Column('streak', sa.Integer(), nullable=True),
+    sa.Column('total_check', sa.Integer(), nullable=True),
+    sa.Column('challenge_level', sa.Enum('MUY_FACIL', 'FACIL', 'NORMAL', 'DIFICIL', 'MUY_DIFICIL', name='challengelevel'), nullable=True),
+    sa.Column('zone_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['zone_id'], ['zone.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('inventory_item',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('remaining_uses', sa.Integer(), nullable=True),
+    sa.Column('acquired_at', sa.DateTime(), nullable=True),
+    sa.Column('gear_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['gear_id'], ['gear.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('log_entry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('challenge_level', sa.Enum('MUY_FACIL', 'FACIL', 'NORMAL', 'DIFICIL', 'MUY_DIFICIL', name='challengelevel'), nullable=True),
+    sa.Column('type', sa.String(length=20), nullable=True),
+    sa.Column('item_id', sa.Integer(), nullable=True),
+    sa.Column('end_timestamp', sa.Date(), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('zone_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['zone_id'], ['zone.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('material',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('url', sa.String(length=255), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('zone_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['zone_id'], ['zone.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('project',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('challenge_level', sa.String(length=50), nullable=True),
+    sa.Column('image', sa.String(length=255), nullable=True),
+    sa.Column('icon', sa.String(length=100), nullable=True),
+    sa.Column('color', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('priority', sa.String(length=50), nullable=True),
+    sa.Column('zone_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.ForeignKeyConstraint(['zone_id'], ['zone.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user_skills',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'skill_id')
+    )
+    op.create_table('journal',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('image', sa.String(length=255), nullable=True),
+    sa.Column('type', sa.String(length=50), nullable=True),
+    sa.Column('last_entry_date', sa.Date(), nullable=True),
+    sa.Column('streak', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id')
+    )
+    op.create_table('project_materials',
+    sa.Column('id_project', sa.Integer(), nullable=False),
+    sa.Column('id_material', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['id_material'], ['material.id'], ),
+    sa.ForeignKeyConstraint(['id_project'], ['project.id'], ),
+    sa.PrimaryKeyConstraint('id_project', 'id_material')
+    )
+    op.create_table('task',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('name', sa.String(length=100), nullable=True),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('image', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('challenge_level', sa.Enum('MUY_FACIL', 'FACIL', 'NORMAL', 'DIFICIL', 'MUY_DIFICIL', name='challengelevel'), nullable=True),
+    sa.Column('priority', sa.String(length=20), nullable=True),
+    sa.Column('cycle', sa.String(length=20), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('parent_task_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_task_id'], ['task.id'], ),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('journal_entry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=True),
+    sa.Column('edited_at', sa.Date(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=True),
+    sa.Column('points', sa.Integer(), nullable=True),
+    sa.Column('energy', sa.Integer(), nullable=True),
+    sa.Column('journal_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['journal_id'], ['journal.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('journal_entry')
+    op.drop_table('task')
+    op.drop_table('project_materials')
+    op.drop_table('journal')
+    op.drop_table('user_skills')
+    op.drop_table('project')
+    op.drop_table('material')
+    op.drop_table('log_entry')
+    op.drop_table('inventory_item')
+    op.drop_table('habit')
+    op.drop_table('zone')
+    op.drop_table('user_global_achievement')
+    op.drop_table('user_effects')
+    op.drop_table('template')
+    op.drop_table('skill')
+    op.drop_table('personal_data')
+    op.drop_table('notification')
+    op.drop_table('gear')
+    op.drop_table('user')
+    op.drop_table('incident')
+    op.drop_table('global_achievement')
+    op.drop_table('effect')
+    op.drop_table('admin_log')
@@ -0,0 +1,218 @@
+"""series schema
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18
+
+Tablas añadidas sobre el esquema inicial antes de introducir las
+migraciones (libros de energía, rollups, historial de progresión,
+contadores de logros, backfill, búsqueda, versiones de recursos y feed de
+agenda), la tabla FTS5 de SQLite / índices FULLTEXT de MySQL de
+search_document, y log_entry.zone_id pasa a admitir NULL (registros sin
+zona, p.ej. al completar una tarea sin proyecto).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Búsqueda de texto completo en SQLite (ver app/models/search_document.py):
+# tabla FTS5 de contenido externo sincronizada con triggers.
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_document_fts USING fts5("
+    "title_terms, body_terms, content='search_document', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS search_document_ai AFTER INSERT ON search_document BEGIN "
+    "INSERT INTO search_document_fts(rowid, title_terms, body_terms) "
+    "VALUES (new.id, new.title_terms, new.body_terms); END",
+    "CREATE TRIGGER IF NOT EXISTS search_document_ad AFTER DELETE ON search_document BEGIN "
+    "INSERT INTO search_document_fts(search_document_fts, rowid, title_terms, body_terms) "
+    "VALUES ('delete', old.id, old.title_terms, old.body_terms); END",
+    "CREATE TRIGGER IF NOT EXISTS search_document_au AFTER UPDATE ON search_document BEGIN "
+    "INSERT INTO search_document_fts(search_document_fts, rowid, title_terms, body_terms) "
+    "VALUES ('delete', old.id, old.title_terms, old.body_terms); "
+    "INSERT INTO search_document_fts(rowid, title_terms, body_terms) "
+    "VALUES (new.id, new.title_terms, new.body_terms); END",
+)
+
+
+
+# revision identifiers, used by Alembic.
+revision = '0001a'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_context().dialect.name
+    op.create_table('achievement_backfill_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('chunk_size', sa.Integer(), nullable=True),
+    sa.Column('last_user_id', sa.Integer(), nullable=True),
+    sa.Column('processed_users', sa.Integer(), nullable=True),
+    sa.Column('granted_count', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('global_achievement_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['global_achievement_id'], ['global_achievement.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('agenda_feed_token',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_table('log_entry_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('zone_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('energy', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'zone_id', 'type', 'day', name='uq_log_entry_rollup_key')
+    )
+    with op.batch_alter_table('log_entry_rollup', schema=None) as batch_op:
+        batch_op.create_index('ix_log_entry_rollup_user_day', ['user_id', 'day'], unique=False)
+
+    op.create_table('search_document',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title_terms', sa.Text(), nullable=True),
+    sa.Column('body_terms', sa.Text(), nullable=True),
+    sa.Column('trigram_count', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entity_type', 'entity_id', name='uq_search_document_entity')
+    )
+    with op.batch_alter_table('search_document', schema=None) as batch_op:
+        if dialect == 'mysql':
+            batch_op.create_index('ft_search_document_all', ['title_terms', 'body_terms'], unique=False, mysql_prefix='FULLTEXT')
+            batch_op.create_index('ft_search_document_title', ['title_terms'], unique=False, mysql_prefix='FULLTEXT')
+        batch_op.create_index('ix_search_document_user_type', ['user_id', 'entity_type'], unique=False)
+    if dialect == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+    op.create_table('user_achievement_counter',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('counter_type', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'counter_type', name='uq_user_achievement_counter')
+    )
+    op.create_table('user_energy_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('energy', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', name='uq_user_energy_ledger_user_day')
+    )
+    op.create_table('user_progress_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=True),
+    sa.Column('granularity', sa.String(length=10), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=True),
+    sa.Column('xp', sa.Integer(), nullable=True),
+    sa.Column('level', sa.Integer(), nullable=True),
+    sa.Column('coins', sa.Integer(), nullable=True),
+    sa.Column('blue_gems', sa.Integer(), nullable=True),
+    sa.Column('xp_delta', sa.Integer(), nullable=True),
+    sa.Column('level_delta', sa.Integer(), nullable=True),
+    sa.Column('coins_delta', sa.Integer(), nullable=True),
+    sa.Column('blue_gems_delta', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('user_progress_history', schema=None) as batch_op:
+        batch_op.create_index('ix_user_progress_history_user_day', ['user_id', 'day'], unique=False)
+
+    op.create_table('user_resource_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resource', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'resource', name='uq_user_resource_version')
+    )
+    op.create_table('search_trigram',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('trigram', sa.String(length=3), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['search_document.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('search_trigram', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_search_trigram_document_id'), ['document_id'], unique=False)
+        batch_op.create_index('ix_search_trigram_lookup', ['user_id', 'trigram', 'document_id'], unique=False)
+
+    op.create_table('zone_energy_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('energy', sa.Integer(), nullable=False),
+    sa.Column('zone_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['zone_id'], ['zone.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('zone_id', 'day', name='uq_zone_energy_ledger_zone_day')
+    )
+
+    with op.batch_alter_table('log_entry', schema=None) as batch_op:
+        batch_op.alter_column('zone_id', existing_type=sa.Integer(), nullable=True)
+
+
+def downgrade():
+    dialect = op.get_context().dialect.name
+    # Falla si ya hay registros sin zona: asignarles una antes de bajar
+    with op.batch_alter_table('log_entry', schema=None) as batch_op:
+        batch_op.alter_column('zone_id', existing_type=sa.Integer(), nullable=False)
+
+    op.drop_table('zone_energy_ledger')
+    with op.batch_alter_table('search_trigram', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_trigram_lookup')
+        batch_op.drop_index(batch_op.f('ix_search_trigram_document_id'))
+
+    op.drop_table('search_trigram')
+    op.drop_table('user_resource_version')
+    with op.batch_alter_table('user_progress_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_progress_history_user_day')
+
+    op.drop_table('user_progress_history')
+    op.drop_table('user_energy_ledger')
+    op.drop_table('user_achievement_counter')
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS search_document_fts")
+    with op.batch_alter_table('search_document', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_document_user_type')
+        if dialect == 'mysql':
+            batch_op.drop_index('ft_search_document_title', mysql_prefix='FULLTEXT')
+            batch_op.drop_index('ft_search_document_all', mysql_prefix='FULLTEXT')
+
+    op.drop_table('search_document')
+    with op.batch_alter_table('log_entry_rollup', schema=None) as batch_op:
+        batch_op.drop_index('ix_log_entry_rollup_user_day')
+
+    op.drop_table('log_entry_rollup')
+    op.drop_table('agenda_feed_token')
+    op.drop_table('achievement_backfill_job')
@@ -0,0 +1,109 @@
+"""composite indexes for user access paths
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-18
+
+Índices compuestos para las consultas por usuario: casi todas filtran
+user_id + deleted=False y después una fecha, estado, zona o tipo. Los
+nombres y columnas son los de __table_args__ en app/models/.
+benchmarks/check_query_plans.py comprueba con EXPLAIN que se usan.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('habit', schema=None) as batch_op:
+        batch_op.create_index('ix_habit_user_zone', ['user_id', 'deleted', 'zone_id'], unique=False)
+
+    with op.batch_alter_table('inventory_item', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_item_user_gear', ['user_id', 'deleted', 'gear_id'], unique=False)
+
+    with op.batch_alter_table('journal', schema=None) as batch_op:
+        batch_op.create_index('ix_journal_user_created', ['user_id', 'deleted', 'created_at'], unique=False)
+
+    with op.batch_alter_table('journal_entry', schema=None) as batch_op:
+        batch_op.create_index('ix_journal_entry_journal', ['journal_id', 'deleted'], unique=False)
+
+    with op.batch_alter_table('log_entry', schema=None) as batch_op:
+        batch_op.create_index('ix_log_entry_user_end', ['user_id', 'deleted', 'end_timestamp'], unique=False)
+
+    with op.batch_alter_table('material', schema=None) as batch_op:
+        batch_op.create_index('ix_material_user', ['user_id', 'deleted'], unique=False)
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_user_read', ['user_id', 'deleted', 'is_read'], unique=False)
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index('ix_project_user_end_date', ['user_id', 'deleted', 'end_date'], unique=False)
+        batch_op.create_index('ix_project_user_zone', ['user_id', 'deleted', 'zone_id'], unique=False)
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_project', ['project_id'], unique=False)
+        batch_op.create_index('ix_task_user_end_date', ['user_id', 'deleted', 'end_date'], unique=False)
+        batch_op.create_index('ix_task_user_status', ['user_id', 'deleted', 'status'], unique=False)
+
+    with op.batch_alter_table('template', schema=None) as batch_op:
+        batch_op.create_index('ix_template_user', ['user_id', 'deleted'], unique=False)
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.create_index('ix_user_reset_token', ['reset_token'], unique=False)
+
+    with op.batch_alter_table('user_global_achievement', schema=None) as batch_op:
+        batch_op.create_index('ix_user_global_achievement_user', ['user_id', 'deleted'], unique=False)
+
+    with op.batch_alter_table('zone', schema=None) as batch_op:
+        batch_op.create_index('ix_zone_user', ['user_id', 'deleted'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('zone', schema=None) as batch_op:
+        batch_op.drop_index('ix_zone_user')
+
+    with op.batch_alter_table('user_global_achievement', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_global_achievement_user')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_reset_token')
+
+    with op.batch_alter_table('template', schema=None) as batch_op:
+        batch_op.drop_index('ix_template_user')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_status')
+        batch_op.drop_index('ix_task_user_end_date')
+        batch_op.drop_index('ix_task_project')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_user_zone')
+        batch_op.drop_index('ix_project_user_end_date')
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_user_read')
+
+    with op.batch_alter_table('material', schema=None) as batch_op:
+        batch_op.drop_index('ix_material_user')
+
+    with op.batch_alter_table('log_entry', schema=None) as batch_op:
+        batch_op.drop_index('ix_log_entry_user_end')
+
+    with op.batch_alter_table('journal_entry', schema=None) as batch_op:
+        batch_op.drop_index('ix_journal_entry_journal')
+
+    with op.batch_alter_table('journal', schema=None) as batch_op:
+        batch_op.drop_index('ix_journal_user_created')
+
+    with op.batch_alter_table('inventory_item', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_item_user_gear')
+
+    with op.batch_alter_table('habit', schema=None) as batch_op:
+        batch_op.drop_index('ix_habit_user_zone')
@@ -0,0 +1,28 @@
+"""admin log details
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+admin_log.details: JSON con el detalle de peticiones lentas (app/utils/profiling.py).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('details', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.drop_column('details')
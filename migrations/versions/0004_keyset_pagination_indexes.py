@@ -0,0 +1,60 @@
+"""keyset pagination indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Índices (user_id, deleted, clave de orden) para la paginación por cursor
+(app/utils/pagination.py) de /tasks, /habits, /projects, /inventory,
+/notifications y /admin/logs.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.create_index('ix_admin_log_created', ['deleted', 'created_at'], unique=False)
+
+    with op.batch_alter_table('habit', schema=None) as batch_op:
+        batch_op.create_index('ix_habit_user_id', ['user_id', 'deleted', 'id'], unique=False)
+
+    with op.batch_alter_table('inventory_item', schema=None) as batch_op:
+        batch_op.create_index('ix_inventory_item_user_id', ['user_id', 'deleted', 'id'], unique=False)
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_user_created', ['user_id', 'deleted', 'created_at'], unique=False)
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index('ix_project_user_id', ['user_id', 'deleted', 'id'], unique=False)
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_id', ['user_id', 'deleted', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_id')
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_user_id')
+
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_user_created')
+
+    with op.batch_alter_table('inventory_item', schema=None) as batch_op:
+        batch_op.drop_index('ix_inventory_item_user_id')
+
+    with op.batch_alter_table('habit', schema=None) as batch_op:
+        batch_op.drop_index('ix_habit_user_id')
+
+    with op.batch_alter_table('admin_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_admin_log_created')
@@ -0,0 +1,40 @@
+"""unique user global achievement
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Un usuario solo puede tener cada logro global una vez. Antes de crear el
+índice único se eliminan los duplicados que hayan podido quedar (se conserva
+la fila más antigua de cada par user_id/global_achievement_id).
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # La subconsulta derivada (keep) es necesaria en MySQL, que no permite
+    # leer en un DELETE la misma tabla que se borra
+    op.execute(
+        "DELETE FROM user_global_achievement WHERE id NOT IN ("
+        "SELECT keep.id FROM ("
+        "SELECT MIN(id) AS id FROM user_global_achievement "
+        "GROUP BY user_id, global_achievement_id"
+        ") AS keep)"
+    )
+
+    with op.batch_alter_table('user_global_achievement', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_user_global_achievement', ['user_id', 'global_achievement_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('user_global_achievement', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_user_global_achievement', type_='unique')
@@ -1,5 +1,8 @@
 from app import create_app
 
+# El esquema no se crea al arrancar: antes de la primera ejecución (y tras
+# cada actualización) `flask --app run init-db`
+
 app = create_app()
 
 if __name__ == "__main__":